@@ -33,8 +33,48 @@ Variables:
 \b
 {config.describe('OCRD_METS_CACHING')}
 \b
+{config.describe('OCRD_METS_INDEX')}
+\b
+{config.describe('OCRD_METS_LAZY')}
+\b
+{config.describe('OCRD_METS_JOURNAL')}
+\b
+{config.describe('OCRD_METS_JOURNAL_MAX')}
+\b
 {config.describe('OCRD_MAX_PROCESSOR_CACHE')}
 \b
+{config.describe('OCRD_MAX_EXIF_CACHE')}
+\b
+{config.describe('OCRD_EXIF_SIDECAR')}
+\b
+{config.describe('OCRD_MAX_IMAGE_CACHE')}
+\b
+{config.describe('OCRD_MAX_SEGMENT_WORKERS')}
+\b
+{config.describe('OCRD_MAX_PARALLEL_PAGES')}
+\b
+{config.describe('OCRD_PARALLEL_PAGES_POOL', wrap_text=False)}
+\b
+{config.describe('OCRD_MISSING_OUTPUT', wrap_text=False)}
+\b
+{config.describe('OCRD_METS_SERVER_POOL_SIZE')}
+\b
+{config.describe('OCRD_METS_SERVER_RETRIES')}
+\b
+{config.describe('OCRD_METS_SERVER_TIMEOUT')}
+\b
+{config.describe('OCRD_METS_SERVER_MSGPACK')}
+\b
+{config.describe('OCRD_METS_SERVER_CACHE_SIZE')}
+\b
+{config.describe('OCRD_METS_SERVER_CACHE_TTL')}
+\b
+{config.describe('OCRD_METS_SERVER_FLUSH_CHANGES')}
+\b
+{config.describe('OCRD_METS_SERVER_FLUSH_INTERVAL')}
+\b
+{config.describe('OCRD_METS_SERVER_FLUSH_IDLE')}
+\b
 {config.describe('OCRD_NETWORK_SERVER_ADDR_PROCESSING')}
 \b
 {config.describe('OCRD_NETWORK_SERVER_ADDR_WORKFLOW')}
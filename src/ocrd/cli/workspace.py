@@ -23,6 +23,7 @@ from ocrd.mets_server import OcrdMetsServer
 from ocrd_utils import getLogger, initLogging, pushd_popd, EXT_TO_MIME, safe_filename, parse_json_string_or_file, partition_list, DEFAULT_METS_BASENAME
 from ocrd.decorators import mets_find_options
 from . import command_with_replaced_help
+from ocrd_models import FileSelector
 from ocrd_models.constants import METS_PAGE_DIV_ATTRIBUTE
 
 
@@ -458,10 +459,7 @@ def workspace_find(ctx, file_grp, mimetype, page_id, file_id, output_field, incl
         mets_server_url=ctx.mets_server_url,
     )
     for f in workspace.find_files(
-            file_id=file_id,
-            file_grp=file_grp,
-            mimetype=mimetype,
-            page_id=page_id,
+            selector=FileSelector.compile(ID=file_id, fileGrp=file_grp, mimetype=mimetype, pageId=page_id),
             include_fileGrp=include_fileGrp,
             exclude_fileGrp=exclude_fileGrp,
         ):
@@ -35,6 +35,7 @@ def ocrd_cli_options(f):
         option('-I', '--input-file-grp', default='INPUT'),
         option('-O', '--output-file-grp', default='OUTPUT'),
         option('-g', '--page-id'),
+        option('--jobs', type=click.IntRange(min=1), help="Number of pages to process in parallel"),
         option('--overwrite', is_flag=True, default=False),
         option('--profile', is_flag=True, default=False),
         option('--profile-file', type=Path(dir_okay=False, writable=True)),
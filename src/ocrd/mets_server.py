@@ -2,24 +2,38 @@
 # METS server functionality
 """
 import re
-from os import _exit, chmod
+import asyncio
+from contextlib import asynccontextmanager
+from functools import partial
+from itertools import islice
+import json
+from collections import OrderedDict
+from os import _exit, chmod, getpid
 from typing import Dict, Optional, Union, List, Tuple
 from pathlib import Path
+from threading import Lock
+from time import monotonic
 from urllib.parse import urlparse
 import socket
 import atexit
 
 from fastapi import FastAPI, Request, Form, Response, requests
-from fastapi.responses import JSONResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
+import msgpack
 from requests import Session as requests_session
+from requests.adapters import HTTPAdapter
 from requests.exceptions import ConnectionError
 from requests_unixsocket import Session as requests_unixsocket_session
+from requests_unixsocket.adapters import UnixAdapter, UnixHTTPConnectionPool
+from urllib3.connectionpool import HTTPConnectionPool
+from urllib3.util.retry import Retry
 from pydantic import BaseModel, Field, ValidationError
 
 import uvicorn
 
 from ocrd_models import OcrdFile, ClientSideOcrdFile, OcrdAgent, ClientSideOcrdAgent
-from ocrd_utils import getLogger, deprecated_alias
+from ocrd_utils import config, getLogger, deprecated_alias
 
 #
 # Models
@@ -35,7 +49,18 @@ class OcrdFileModel(BaseModel):
 
     @staticmethod
     def create(file_grp : str, file_id : str, page_id : Optional[str], url : Optional[str], local_filename : Optional[Union[str, Path]], mimetype : str):
-        return OcrdFileModel(file_grp=file_grp, file_id=file_id, page_id=page_id, mimetype=mimetype, url=url, local_filename=str(local_filename))
+        return OcrdFileModel(file_grp=file_grp, file_id=file_id, page_id=page_id, mimetype=mimetype, url=url,
+                             local_filename=str(local_filename) if local_filename is not None else None)
+
+    @staticmethod
+    def from_file(f : OcrdFile):
+        return OcrdFileModel.create(
+            file_grp=f.fileGrp,
+            file_id=f.ID,
+            mimetype=f.mimetype,
+            page_id=f.pageId,
+            url=f.url,
+            local_filename=f.local_filename)
 
 class OcrdAgentModel(BaseModel):
     name : str = Field()
@@ -55,16 +80,14 @@ class OcrdFileListModel(BaseModel):
 
     @staticmethod
     def create(files : List[OcrdFile]):
-        ret = OcrdFileListModel(
-            files=[OcrdFileModel.create(
-                file_grp=f.fileGrp,
-                file_id=f.ID,
-                mimetype=f.mimetype,
-                page_id=f.pageId,
-                url=f.url,
-                local_filename=f.local_filename
-            ) for f in files])
-        return ret
+        return OcrdFileListModel(files=[OcrdFileModel.from_file(f) for f in files])
+
+class OcrdFileIdListModel(BaseModel):
+    file_ids : List[str] = Field()
+
+    @staticmethod
+    def create(file_ids : List[str]):
+        return OcrdFileIdListModel(file_ids=file_ids)
 
 class OcrdFileGroupListModel(BaseModel):
     file_groups : List[str] = Field()
@@ -82,10 +105,74 @@ class OcrdAgentListModel(BaseModel):
             agents=[OcrdAgentModel.create(name=a.name, _type=a.type, role=a.role, otherrole=a.otherrole, othertype=a.othertype, notes=a.notes) for a in agents]
         )
 
+#
+# Binary (msgpack) protocol
+#
+# Files are exchanged as plain arrays of the fields below (in this order),
+# bypassing the JSON encoding and pydantic validation of the models above.
+#
+
+MIMETYPE_MSGPACK = 'application/x-msgpack'
+
+# Response header with the generation of the METS (incremented by every change) the response was read from
+HEADER_GENERATION = 'X-OCRD-METS-Generation'
+
+FILE_ROW_FIELDS = ('file_grp', 'file_id', 'page_id', 'mimetype', 'url', 'local_filename')
+
+def file_to_row(f : OcrdFile) -> list:
+    local_filename = f.local_filename
+    return [f.fileGrp, f.ID, f.pageId, f.mimetype, f.url,
+            str(local_filename) if local_filename is not None else None]
+
+def file_from_row(row : list) -> dict:
+    """
+    Validate an array of :py:data:`FILE_ROW_FIELDS` and convert it to
+    keyword arguments of :py:meth:`ocrd.workspace.Workspace.add_file`.
+    """
+    if not isinstance(row, (list, tuple)) or len(row) != len(FILE_ROW_FIELDS):
+        raise ValueError(f"expected file as array of {FILE_ROW_FIELDS}, got {row!r}")
+    for field, value in zip(FILE_ROW_FIELDS, row):
+        if not isinstance(value, str) and (value is not None or field in ('file_grp', 'file_id', 'mimetype')):
+            raise ValueError(f"invalid value for {field}: {value!r}")
+    return dict(zip(FILE_ROW_FIELDS, row))
+
 #
 # Client
 #
 
+class _UnixHTTPConnectionPool(UnixHTTPConnectionPool):
+    """
+    :py:class:`requests_unixsocket.adapters.UnixHTTPConnectionPool` with more than one connection
+    """
+
+    def __init__(self, socket_path, timeout=60, maxsize=1):
+        # pylint: disable=non-parent-init-called,super-init-not-called
+        HTTPConnectionPool.__init__(self, 'localhost', timeout=timeout, maxsize=maxsize)
+        self.socket_path = socket_path
+        self.timeout = timeout
+
+class _PooledUnixAdapter(UnixAdapter):
+    """
+    :py:class:`requests_unixsocket.adapters.UnixAdapter` sharing one connection pool
+    for all requests to the same socket (instead of one pool per request URL)
+    """
+
+    def __init__(self, pool_maxsize=1, **kwargs):
+        super().__init__(**kwargs)
+        self._pool_maxsize = pool_maxsize
+
+    def get_connection(self, url, proxies=None):
+        if proxies and proxies.get('http+unix'):
+            raise ValueError('%s does not support specifying proxies' % self.__class__.__name__)
+        socket_url = 'http+unix://%s' % urlparse(url).netloc
+        with self.pools.lock:
+            pool = self.pools.get(socket_url)
+            if pool:
+                return pool
+            pool = _UnixHTTPConnectionPool(socket_url, self.timeout, maxsize=self._pool_maxsize)
+            self.pools[socket_url] = pool
+        return pool
+
 
 class ClientSideOcrdMets():
     """
@@ -94,7 +181,9 @@ class ClientSideOcrdMets():
     :py:meth:`ocrd_models.ocrd_mets.OcrdMets.find_all_files`, and
     :py:meth:`ocrd_models.ocrd_mets.OcrdMets.add_agent`,
     :py:meth:`ocrd_models.ocrd_mets.OcrdMets.agents`,
-    :py:meth:`ocrd_models.ocrd_mets.OcrdMets.add_file` to query via HTTP a
+    :py:meth:`ocrd_models.ocrd_mets.OcrdMets.add_file`,
+    :py:meth:`ocrd_models.ocrd_mets.OcrdMets.add_files`,
+    :py:meth:`ocrd_models.ocrd_mets.OcrdMets.remove_files` to query via HTTP a
     :py:class:`ocrd.mets_server.OcrdMetsServer`.
     """
 
@@ -102,10 +191,50 @@ class ClientSideOcrdMets():
         self.protocol = 'tcp' if url.startswith('http://') else 'uds'
         self.log = getLogger(f'ocrd.mets_client[{url}]')
         self.url = url if self.protocol == 'tcp' else f'http+unix://{url.replace("/", "%2F")}'
+        self._session = None
+        self._session_pid = None
+        self._session_lock = Lock()
+        # whether to use the msgpack protocol (until the server turns out not to support it)
+        self._msgpack = config.OCRD_METS_SERVER_MSGPACK
+        # query results with the generation of the METS they were read from, least recently used first
+        self._cache : OrderedDict = OrderedDict()
+        self._cache_lock = Lock()
+        # last known generation of the METS and when it was asked for
+        self._generation : Optional[int] = None
+        self._generation_time = 0.
+        # whether the server reports generations (until it turns out not to)
+        self._generations = True
 
     @property
     def session(self) -> Union[requests_session, requests_unixsocket_session]:
-        return requests_session() if self.protocol == 'tcp' else requests_unixsocket_session()
+        """
+        Persistent session with a pool of keep-alive connections to the METS server,
+        shared by all threads (but not across forked processes).
+        """
+        if self._session is None or self._session_pid != getpid():
+            with self._session_lock:
+                if self._session is None or self._session_pid != getpid():
+                    self._session = self._create_session()
+                    self._session_pid = getpid()
+        return self._session
+
+    def _create_session(self) -> Union[requests_session, requests_unixsocket_session]:
+        # connection errors are always safe to retry, read errors only for queries
+        retries = Retry(total=config.OCRD_METS_SERVER_RETRIES, read=config.OCRD_METS_SERVER_RETRIES,
+                        status=0, backoff_factor=0.1, allowed_methods=frozenset(['GET']), raise_on_status=False)
+        if self.protocol == 'tcp':
+            session = requests_session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=config.OCRD_METS_SERVER_POOL_SIZE,
+                                  max_retries=retries)
+            session.mount('http://', adapter)
+        else:
+            session = requests_unixsocket_session()
+            adapter = _PooledUnixAdapter(pool_maxsize=config.OCRD_METS_SERVER_POOL_SIZE, max_retries=retries)
+            session.mount('http+unix://', adapter)
+        if config.is_set('OCRD_METS_SERVER_TIMEOUT'):
+            # requests has no per-session default timeout
+            session.request = partial(session.request, timeout=config.OCRD_METS_SERVER_TIMEOUT)
+        return session
 
     def __getattr__(self, name):
         raise NotImplementedError(f"ClientSideOcrdMets has no access to '{name}' - try without METS server")
@@ -118,6 +247,7 @@ class ClientSideOcrdMets():
         return self.session.request('GET', f'{self.url}/workspace_path').text
 
     def reload(self):
+        self._cache_clear()
         return self.session.request('POST', f'{self.url}/reload').text
 
     @deprecated_alias(ID="file_id")
@@ -125,40 +255,176 @@ class ClientSideOcrdMets():
     @deprecated_alias(fileGrp="file_grp")
     def find_files(self, **kwargs):
         self.log.debug('find_files(%s)', kwargs)
+        selector = kwargs.pop('selector', None)
+        if selector is not None:
+            # the server compiles (and caches) the criteria itself
+            kwargs.update({k: v for k, v in selector.expressions.items() if v is not None})
         if 'pageId' in kwargs:
             kwargs['page_id'] = kwargs.pop('pageId')
         if 'ID' in kwargs:
             kwargs['file_id'] = kwargs.pop('ID')
         if 'fileGrp' in kwargs:
             kwargs['file_grp'] = kwargs.pop('fileGrp')
-        r = self.session.request('GET', f'{self.url}/file', params={**kwargs})
-        for f in r.json()['files']:
-            yield ClientSideOcrdFile(None, ID=f['file_id'], pageId=f['page_id'], fileGrp=f['file_grp'], url=f['url'], local_filename=f['local_filename'], mimetype=f['mimetype'])
+        key = ('find_files', json.dumps(kwargs, sort_keys=True, default=str))
+        rows = self._cache_get(key)
+        if rows is None:
+            # the generation is only known once the request is made
+            response = {}
+            rows = []
+            for row in self._find_rows(kwargs, response):
+                rows.append(row)
+                yield self._file_from_row(row)
+            self._cache_put(key, response.get('generation'), rows)
+            return
+        for row in rows:
+            yield self._file_from_row(row)
+
+    def _find_rows(self, kwargs, response):
+        """
+        Search files on the server, yielding them as rows of :py:data:`FILE_ROW_FIELDS`
+        as they arrive (and storing the METS generation of the result in :py:attr:`response`).
+        """
+        if self._msgpack:
+            r = self.session.request('GET', f'{self.url}/msgpack/file', params={**kwargs}, stream=True)
+            if r.status_code == 404:
+                # METS server without msgpack support
+                r.close()
+                self._msgpack = False
+            else:
+                try:
+                    r.raise_for_status()
+                    response['generation'] = self._generation_from_response(r)
+                    # results are a sequence of msgpack arrays, yield them as they arrive
+                    unpacker = msgpack.Unpacker()
+                    for data in r.iter_content(chunk_size=None):
+                        unpacker.feed(data)
+                        yield from unpacker
+                finally:
+                    r.close()
+                return
+        r = self.session.request('GET', f'{self.url}/file/stream', params={**kwargs}, stream=True)
+        try:
+            if r.status_code == 404:
+                # METS server without streaming support
+                r.close()
+                r = self.session.request('GET', f'{self.url}/file', params={**kwargs})
+                r.raise_for_status()
+                response['generation'] = self._generation_from_response(r)
+                for f in r.json()['files']:
+                    yield [f[field] for field in FILE_ROW_FIELDS]
+                return
+            r.raise_for_status()
+            response['generation'] = self._generation_from_response(r)
+            # results are newline-delimited JSON, yield them as they arrive
+            for line in r.iter_lines():
+                if line:
+                    f = json.loads(line)
+                    yield [f[field] for field in FILE_ROW_FIELDS]
+        finally:
+            r.close()
 
     def find_all_files(self, *args, **kwargs):
         return list(self.find_files(*args, **kwargs))
 
     def add_agent(self, *args, **kwargs):
+        self._cache_clear()
         return self.session.request('POST', f'{self.url}/agent', json=OcrdAgentModel.create(**kwargs).dict())
 
     @property
     def agents(self):
-        agent_dicts = self.session.request('GET', f'{self.url}/agent').json()['agents']
-        for agent_dict in agent_dicts:
-            agent_dict['_type'] = agent_dict.pop('type')
-        return [ClientSideOcrdAgent(None, **agent_dict) for agent_dict in agent_dicts]
+        agent_dicts = self._cached_query('agent', lambda r: r.json()['agents'])
+        return [ClientSideOcrdAgent(None, **{'_type' if k == 'type' else k: v for k, v in agent_dict.items()})
+                for agent_dict in agent_dicts]
 
     @property
     def unique_identifier(self):
-        return self.session.request('GET', f'{self.url}/unique_identifier').text
+        return self._cached_query('unique_identifier', lambda r: r.text)
 
     @property
     def file_groups(self):
-        return self.session.request('GET', f'{self.url}/file_groups').json()['file_groups']
+        return list(self._cached_query('file_groups', lambda r: r.json()['file_groups']))
+
+    def _cached_query(self, path, decode):
+        """
+        Result of ``GET`` :py:attr:`path` decoded by :py:attr:`decode`, cached until the METS changes
+        (results must not be modified)
+        """
+        result = self._cache_get(path)
+        if result is None:
+            r = self.session.request('GET', f'{self.url}/{path}')
+            result = decode(r)
+            self._cache_put(path, self._generation_from_response(r), result)
+        return result
+
+    @staticmethod
+    def _generation_from_response(r) -> Optional[int]:
+        generation = r.headers.get(HEADER_GENERATION)
+        return int(generation) if generation is not None else None
+
+    def _current_generation(self) -> Optional[int]:
+        """
+        Generation of the METS on the server (asked for unless the last answer is
+        more recent than ``OCRD_METS_SERVER_CACHE_TTL`` seconds)
+        """
+        if not self._generations:
+            return None
+        if self._generation is None or monotonic() - self._generation_time >= config.OCRD_METS_SERVER_CACHE_TTL:
+            r = self.session.request('GET', f'{self.url}/generation')
+            if r.status_code == 404:
+                # METS server without generations
+                self._generations = False
+                return None
+            self._generation = int(r.text)
+            self._generation_time = monotonic()
+        return self._generation
+
+    def _cache_get(self, key):
+        if not config.OCRD_METS_SERVER_CACHE_SIZE:
+            return None
+        with self._cache_lock:
+            if key not in self._cache:
+                return None
+            generation, result = self._cache[key]
+        if generation != self._current_generation():
+            return None
+        with self._cache_lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+        return result
+
+    def _cache_put(self, key, generation, result):
+        if not config.OCRD_METS_SERVER_CACHE_SIZE or generation is None:
+            return
+        with self._cache_lock:
+            self._cache[key] = (generation, result)
+            self._cache.move_to_end(key)
+            while len(self._cache) > config.OCRD_METS_SERVER_CACHE_SIZE:
+                self._cache.popitem(last=False)
+
+    def _cache_clear(self):
+        """
+        Forget all results after changing the METS
+        """
+        with self._cache_lock:
+            self._cache.clear()
+            self._generation = None
 
     @deprecated_alias(pageId="page_id")
     @deprecated_alias(ID="file_id")
     def add_file(self, file_grp, content=None, file_id=None, url=None, local_filename=None, mimetype=None, page_id=None, **kwargs):
+        self._cache_clear()
+        if self._msgpack:
+            row = [file_grp, file_id, page_id, mimetype, url, str(local_filename) if local_filename is not None else None]
+            file_from_row(row)
+            r = self.session.request('POST', f'{self.url}/msgpack/files', data=msgpack.packb([row]),
+                                     headers={'Content-Type': MIMETYPE_MSGPACK})
+            if r.status_code != 404:
+                r.raise_for_status()
+                return self._file_from_row(row)
+            # METS server without msgpack support
+            self._msgpack = False
+            return self.add_file(file_grp, content=content, file_id=file_id, url=url,
+                                 local_filename=local_filename, mimetype=mimetype, page_id=page_id)
         data = OcrdFileModel.create(
             file_id=file_id,
             file_grp=file_grp,
@@ -177,6 +443,61 @@ class ClientSideOcrdMets():
                 local_filename=local_filename)
 
 
+    def add_files(self, files, force=False, ignore=False):
+        """
+        Add many files with a single request. Each entry of :py:attr:`files` has the
+        keyword arguments of :py:meth:`ocrd_models.ocrd_mets.OcrdMets.add_file`.
+        """
+        files = list(files)
+        self._cache_clear()
+        if self._msgpack:
+            rows = [[f['fileGrp'], f['ID'], f.get('pageId'), f.get('mimetype'), f.get('url'),
+                     str(f['local_filename']) if f.get('local_filename') is not None else None] for f in files]
+            for row in rows:
+                file_from_row(row)
+            r = self.session.request('POST', f'{self.url}/msgpack/files', data=msgpack.packb(rows),
+                                     params={'force': force, 'ignore': ignore},
+                                     headers={'Content-Type': MIMETYPE_MSGPACK})
+            if r.status_code != 404:
+                r.raise_for_status()
+                return [self._file_from_row(row) for row in msgpack.unpackb(r.content)]
+            # METS server without msgpack support
+            self._msgpack = False
+        data = OcrdFileListModel(files=[OcrdFileModel.create(
+            file_grp=f['fileGrp'],
+            file_id=f['ID'],
+            page_id=f.get('pageId'),
+            mimetype=f.get('mimetype'),
+            url=f.get('url'),
+            local_filename=f.get('local_filename')) for f in files])
+        r = self.session.request('POST', f'{self.url}/files', json=data.dict(),
+                                 params={'force': force, 'ignore': ignore})
+        r.raise_for_status()
+        return self._files_from_response(r)
+
+    def remove_files(self, files, force=False):
+        """
+        Remove many files (by ``@ID`` or :py:class:`ocrd_models.ocrd_file.OcrdFile`) with a single request.
+        """
+        data = OcrdFileIdListModel.create([f if isinstance(f, str) else f.ID for f in files])
+        self._cache_clear()
+        r = self.session.request('DELETE', f'{self.url}/files', json=data.dict(), params={'force': force})
+        r.raise_for_status()
+        return self._files_from_response(r)
+
+    @staticmethod
+    def _file_from_dict(f):
+        return ClientSideOcrdFile(None, ID=f['file_id'], pageId=f['page_id'], fileGrp=f['file_grp'], url=f['url'],
+                                  local_filename=f['local_filename'], mimetype=f['mimetype'])
+
+    @classmethod
+    def _file_from_row(cls, row):
+        return cls._file_from_dict(dict(zip(FILE_ROW_FIELDS, row)))
+
+    @classmethod
+    def _files_from_response(cls, r):
+        return [cls._file_from_dict(f) for f in r.json()['files']]
+
     def save(self):
         self.session.request('PUT', self.url)
 
@@ -191,6 +512,59 @@ class ClientSideOcrdMets():
 # Server
 #
 
+class _ReadWriteLock():
+    """
+    Readers-writer lock for coroutines: shared by any number of readers or held
+    by a single writer. Waiting writers take precedence over new readers, so
+    changes are not starved by a steady stream of queries.
+    """
+
+    def __init__(self):
+        self._cond = asyncio.Condition()
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+
+    async def acquire_read(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: not self._writer and not self._writers_waiting)
+            self._readers += 1
+
+    async def release_read(self):
+        async with self._cond:
+            self._readers -= 1
+            self._cond.notify_all()
+
+    async def acquire_write(self):
+        async with self._cond:
+            self._writers_waiting += 1
+            try:
+                await self._cond.wait_for(lambda: not self._writer and not self._readers)
+            finally:
+                self._writers_waiting -= 1
+            self._writer = True
+
+    async def release_write(self):
+        async with self._cond:
+            self._writer = False
+            self._cond.notify_all()
+
+    @asynccontextmanager
+    async def reading(self):
+        await self.acquire_read()
+        try:
+            yield
+        finally:
+            await self.release_read()
+
+    @asynccontextmanager
+    async def writing(self):
+        await self.acquire_write()
+        try:
+            yield
+        finally:
+            await self.release_write()
+
 class OcrdMetsServer():
 
     def __init__(self, workspace, url):
@@ -198,6 +572,107 @@ class OcrdMetsServer():
         self.url = url
         self.is_uds = not (url.startswith('http://') or url.startswith('https://'))
         self.log = getLogger(f'ocrd.mets_server[{self.url}]')
+        # number of unsaved changes and time of the first and last one
+        self._changes = 0
+        self._first_change = self._last_change = 0.
+        # incremented by every change, so clients can tell whether cached results are still valid
+        self._generation = 0
+        # created in the event loop
+        self._rwlock : Optional[_ReadWriteLock] = None
+        self._flush_lock : Optional[asyncio.Lock] = None
+        self._flush_timer : Optional[asyncio.Future] = None
+
+    def _locks(self) -> Tuple['_ReadWriteLock', asyncio.Lock]:
+        # asyncio primitives must not be created before the event loop runs (Python < 3.10)
+        if self._rwlock is None:
+            self._rwlock = _ReadWriteLock()
+            self._flush_lock = asyncio.Lock()
+        return self._rwlock, self._flush_lock
+
+    @asynccontextmanager
+    async def _reading(self):
+        """
+        Share access to the METS with other queries (and saving).
+        """
+        async with self._locks()[0].reading():
+            yield
+
+    @asynccontextmanager
+    async def _mutating(self):
+        """
+        Get exclusive access to the METS, then count the change for the flush policy.
+        """
+        async with self._locks()[0].writing():
+            try:
+                yield
+            finally:
+                self._changed()
+
+    def _changed(self):
+        now = monotonic()
+        if not self._changes:
+            self._first_change = now
+        self._last_change = now
+        self._changes += 1
+        self._generation += 1
+        if config.OCRD_METS_SERVER_FLUSH_CHANGES and self._changes >= config.OCRD_METS_SERVER_FLUSH_CHANGES:
+            asyncio.ensure_future(self._flush_when_due(now=True))
+        elif (config.OCRD_METS_SERVER_FLUSH_INTERVAL or config.OCRD_METS_SERVER_FLUSH_IDLE) \
+                and self._flush_timer is None:
+            self._flush_timer = asyncio.ensure_future(self._flush_when_due())
+
+    async def _flush_when_due(self, now=False):
+        """
+        Save the METS as soon as the flush interval or idle time is reached (or right away).
+        """
+        try:
+            if now:
+                await self.flush()
+                return
+            while self._changes:
+                due = []
+                if config.OCRD_METS_SERVER_FLUSH_INTERVAL:
+                    due.append(self._first_change + config.OCRD_METS_SERVER_FLUSH_INTERVAL)
+                if config.OCRD_METS_SERVER_FLUSH_IDLE:
+                    due.append(self._last_change + config.OCRD_METS_SERVER_FLUSH_IDLE)
+                delay = min(due) - monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                else:
+                    await self.flush()
+        except Exception as err:
+            self.log.error(f"Failed to save METS: {err}")
+        finally:
+            if not now:
+                self._flush_timer = None
+
+    async def flush(self):
+        """
+        Save the METS (if changed) in a worker thread, holding back changes
+        only while it is serialised.
+
+        Searches are still answered meanwhile, and writing the file (along with
+        the journal and backup) does not block changes, so processing workers
+        are not stalled by a save.
+        """
+        _, flush_lock = self._locks()
+        async with flush_lock:
+            async with self._reading():
+                if not self._changes:
+                    return
+                changes = self._changes
+                self._changes = 0
+                try:
+                    self.log.debug(f"Saving METS after {changes} changes")
+                    save = await run_in_threadpool(self.workspace.prepare_save_mets)
+                except BaseException:
+                    self._changes += changes
+                    raise
+            try:
+                await run_in_threadpool(save)
+            except BaseException:
+                self._changes += changes
+                raise
 
     def shutdown(self):
         if self.is_uds:
@@ -225,12 +700,22 @@ class OcrdMetsServer():
         async def exception_handler_file_exists(request: Request, exc: FileExistsError):
             return JSONResponse(status_code=400, content=str(exc))
 
+        @app.exception_handler(FileNotFoundError)
+        async def exception_handler_file_not_found(request: Request, exc: FileNotFoundError):
+            return JSONResponse(status_code=404, content=str(exc))
+
         @app.exception_handler(re.error)
         async def exception_handler_invalid_regex(request: Request, exc: re.error):
             return JSONResponse(status_code=400, content=f'invalid regex: {exc}')
 
+        @app.exception_handler(ValueError)
+        async def exception_handler_value_error(request: Request, exc: ValueError):
+            # e.g. invalid IDs or pageIds
+            return JSONResponse(status_code=400, content=str(exc))
+
         @app.get("/file", response_model=OcrdFileListModel)
         async def find_files(
+            response : Response,
             file_grp : Optional[str] = None,
             file_id : Optional[str] = None,
             page_id : Optional[str] = None,
@@ -241,12 +726,82 @@ class OcrdMetsServer():
             """
             Find files in the mets
             """
-            found = workspace.mets.find_all_files(fileGrp=file_grp, ID=file_id, pageId=page_id, mimetype=mimetype, local_filename=local_filename, url=url)
-            return OcrdFileListModel.create(found)
+            async with self._reading():
+                response.headers[HEADER_GENERATION] = str(self._generation)
+                return await run_in_threadpool(lambda: OcrdFileListModel.create(workspace.mets.find_files(
+                    fileGrp=file_grp, ID=file_id, pageId=page_id, mimetype=mimetype, local_filename=local_filename, url=url)))
+
+        async def stream_files(file_grp, file_id, page_id, mimetype, local_filename, url, encode, media_type):
+            def find_chunks():
+                found = workspace.mets.find_files(fileGrp=file_grp, ID=file_id, pageId=page_id, mimetype=mimetype, local_filename=local_filename, url=url)
+                chunks = []
+                while True:
+                    chunk = encode(islice(found, 100))
+                    if not chunk:
+                        return chunks
+                    chunks.append(chunk)
+            # snapshot the results, so changes need not wait for slow clients to read them
+            # (and errors like invalid regexes are reported with their status)
+            async with self._reading():
+                chunks = await run_in_threadpool(find_chunks)
+                headers = {HEADER_GENERATION: str(self._generation)}
+            async def stream():
+                for chunk in chunks:
+                    yield chunk
+            return StreamingResponse(stream(), media_type=media_type, headers=headers)
+
+        @app.get("/file/stream")
+        async def find_files_stream(
+            file_grp : Optional[str] = None,
+            file_id : Optional[str] = None,
+            page_id : Optional[str] = None,
+            mimetype : Optional[str] = None,
+            local_filename : Optional[str] = None,
+            url : Optional[str] = None,
+        ):
+            """
+            Find files in the mets, streaming results as newline-delimited JSON
+            """
+            return await stream_files(file_grp, file_id, page_id, mimetype, local_filename, url,
+                                lambda files: ''.join(OcrdFileModel.from_file(f).json() + '\n' for f in files),
+                                'application/x-ndjson')
+
+        @app.get("/msgpack/file")
+        async def find_files_msgpack(
+            file_grp : Optional[str] = None,
+            file_id : Optional[str] = None,
+            page_id : Optional[str] = None,
+            mimetype : Optional[str] = None,
+            local_filename : Optional[str] = None,
+            url : Optional[str] = None,
+        ):
+            """
+            Find files in the mets, streaming results as a sequence of msgpack arrays (cf. ``FILE_ROW_FIELDS``)
+            """
+            return await stream_files(file_grp, file_id, page_id, mimetype, local_filename, url,
+                                lambda files: b''.join(msgpack.packb(file_to_row(f)) for f in files),
+                                MIMETYPE_MSGPACK)
+
+        @app.post("/msgpack/files")
+        async def add_files_msgpack(request : Request, force : bool = False, ignore : bool = False):
+            """
+            Add files, given (and returned) as a msgpack array of arrays (cf. ``FILE_ROW_FIELDS``)
+            """
+            try:
+                rows = msgpack.unpackb(await request.body())
+                files = [file_from_row(row) for row in rows]
+            except (ValueError, TypeError, msgpack.UnpackException) as err:
+                return JSONResponse(status_code=400, content=f'invalid msgpack request: {err}')
+            async with self._mutating():
+                await run_in_threadpool(workspace.add_files, files, force=force, ignore=ignore)
+            return Response(content=msgpack.packb(rows), media_type=MIMETYPE_MSGPACK)
 
         @app.put('/')
-        def save():
-            return workspace.save_mets()
+        async def save():
+            """
+            Save the METS (unless unchanged since the last save)
+            """
+            await self.flush()
 
         @app.post('/file', response_model=OcrdFileModel)
         async def add_file(
@@ -264,27 +819,65 @@ class OcrdMetsServer():
             file_resource = OcrdFileModel.create(file_grp=file_grp, file_id=file_id, page_id=page_id, mimetype=mimetype, url=url, local_filename=local_filename)
             # Add to workspace
             kwargs = file_resource.dict()
-            workspace.add_file(**kwargs)
+            async with self._mutating():
+                await run_in_threadpool(partial(workspace.add_file, **kwargs))
             return file_resource
 
+        @app.post('/files', response_model=OcrdFileListModel)
+        async def add_files(files : OcrdFileListModel, force : bool = False, ignore : bool = False):
+            """
+            Add many files at once
+            """
+            async with self._mutating():
+                await run_in_threadpool(workspace.add_files, [f.dict() for f in files.files], force=force, ignore=ignore)
+            return files
+
+        @app.delete('/files', response_model=OcrdFileListModel)
+        async def remove_files(files : OcrdFileIdListModel, force : bool = False):
+            """
+            Remove many files at once
+            """
+            def remove():
+                found = (next(workspace.mets.find_files(ID=file_id), None) for file_id in files.file_ids)
+                # serialize before removal, which detaches the mets:file from its fileGrp
+                removed = OcrdFileListModel.create([f for f in found if f])
+                workspace.mets.remove_files(files.file_ids, force=force)
+                return removed
+            async with self._mutating():
+                return await run_in_threadpool(remove)
+
         @app.get('/file_groups', response_model=OcrdFileGroupListModel)
-        async def file_groups():
-            return {'file_groups': workspace.mets.file_groups}
+        async def file_groups(response : Response):
+            async with self._reading():
+                response.headers[HEADER_GENERATION] = str(self._generation)
+                return {'file_groups': workspace.mets.file_groups}
 
         @app.post('/agent', response_model=OcrdAgentModel)
         async def add_agent(agent : OcrdAgentModel):
             kwargs = agent.dict()
             kwargs['_type'] = kwargs.pop('type')
-            workspace.mets.add_agent(**kwargs)
+            async with self._mutating():
+                await run_in_threadpool(partial(workspace.mets.add_agent, **kwargs))
             return agent
 
         @app.get('/agent', response_model=OcrdAgentListModel)
-        async def agents():
-            return OcrdAgentListModel.create(workspace.mets.agents)
+        async def agents(response : Response):
+            async with self._reading():
+                response.headers[HEADER_GENERATION] = str(self._generation)
+                return OcrdAgentListModel.create(workspace.mets.agents)
 
         @app.get('/unique_identifier', response_model=str)
         async def unique_identifier():
-            return Response(content=workspace.mets.unique_identifier, media_type='text/plain')
+            async with self._reading():
+                return Response(content=workspace.mets.unique_identifier, media_type='text/plain',
+                                headers={HEADER_GENERATION: str(self._generation)})
+
+        @app.get('/generation', response_model=str)
+        async def generation():
+            """
+            Number of changes to the METS since the server started
+            """
+            return Response(content=str(self._generation), media_type='text/plain')
 
         @app.get('/workspace_path', response_model=str)
         async def workspace_path():
@@ -292,7 +885,10 @@ class OcrdMetsServer():
 
         @app.post('/reload')
         async def workspace_reload_mets():
-            workspace.reload_mets()
+            async with self._mutating():
+                await run_in_threadpool(workspace.reload_mets)
+            # discard unsaved changes
+            self._changes = 0
             return Response(content=f'Reloaded from {workspace.directory}', media_type="text/plain")
 
         @app.delete('/')
@@ -301,7 +897,7 @@ class OcrdMetsServer():
             Stop the server
             """
             getLogger('ocrd.models.ocrd_mets').info(f'Shutting down METS Server {self.url}')
-            workspace.save_mets()
+            await self.flush()
             self.shutdown()
 
         # ------------- #
@@ -37,6 +37,7 @@ from ocrd_models.ocrd_page import MetadataItemType, LabelType, LabelsType
 
 # XXX imports must remain for backwards-compatibility
 from .helpers import run_cli, run_processor, generate_processor_help # pylint: disable=unused-import
+from .helpers import process_pages
 
 class Processor():
     """
@@ -172,9 +173,39 @@ class Processor():
         for the given :py:attr:`page_id`
         under the given :py:attr:`parameter`.
         
-        (This contains the main functionality and needs to be overridden by subclasses.)
+        (This contains the main functionality and needs to be overridden by subclasses,
+        unless they implement :py:meth:`process_page_file` instead.)
         """
-        raise Exception("Must be implemented")
+        if not self.implements_page_contract:
+            raise Exception("Must be implemented")
+        process_pages(self)
+
+    def process_page_file(self, *input_files) -> None:
+        """
+        Process the input files for a single physical page,
+        as aligned by :py:meth:`zip_input_files` (one per :py:attr:`input_file_grp`,
+        or ``None`` if a fileGrp has no file for that page).
+
+        Write output files via :py:attr:`workspace` as usual. Implementing this
+        method instead of :py:meth:`process` lets the core schedule pages itself
+        (see :py:func:`~ocrd.processor.helpers.process_pages`), i.e. isolate
+        errors per page and process pages in parallel (``--jobs``). Therefore,
+        implementations must not depend on state from other pages.
+
+        (This is an alternative to overriding :py:meth:`process` in subclasses.)
+        """
+        raise NotImplementedError()
+
+    @property
+    def implements_page_contract(self) -> bool:
+        """
+        Whether this processor implements :py:meth:`process_page_file`
+        (and does not override :py:meth:`process`), so pages can be
+        scheduled by the core.
+        """
+        cls = type(self)
+        return (cls.process is Processor.process and
+                cls.process_page_file is not Processor.process_page_file)
 
 
     def add_metadata(self, pcgts):
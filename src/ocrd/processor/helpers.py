@@ -3,7 +3,11 @@ Helper methods for running and documenting processors
 """
 from os import chdir, getcwd
 from time import perf_counter, process_time
-from functools import lru_cache
+from functools import lru_cache, partial
+from copy import copy
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from multiprocessing import get_context, get_all_start_methods
+from traceback import format_exception
 import json
 import inspect
 from subprocess import run
@@ -11,11 +15,14 @@ from typing import List
 
 from click import wrap_text
 from ocrd.workspace import Workspace
+from ocrd_models import ClientSideOcrdFile
+from ocrd_modelfactory import exif_from_filename
 from ocrd_utils import freeze_args, getLogger, config, setOverrideLogLevel, getLevelName, sparkline
 
 
 __all__ = [
     'generate_processor_help',
+    'process_pages',
     'run_cli',
     'run_processor'
 ]
@@ -45,7 +52,8 @@ def run_processor(
         parameter_override=None,
         working_dir=None,
         mets_server_url=None,
-        instance_caching=False
+        instance_caching=False,
+        jobs=None
 ): # pylint: disable=too-many-locals
     """
     Instantiate a Pythonic processor, open a workspace, run the processor and save the workspace.
@@ -65,6 +73,9 @@ def run_processor(
     This flag is used for an experimental feature we would like to adopt in future.
 
     Run the processor on the workspace (creating output files in the filesystem).
+    If the processor implements :py:meth:`~ocrd.processor.Processor.process_page_file`,
+    process up to :py:attr:`jobs` pages in parallel via :py:func:`process_pages`
+    (defaulting to ``OCRD_MAX_PARALLEL_PAGES``).
 
     Finally, write back the workspace (updating the METS in the filesystem).
 
@@ -95,6 +106,14 @@ def run_processor(
     )
     processor.workspace = workspace
     chdir(processor.workspace.directory)
+    if jobs is None:
+        jobs = config.OCRD_MAX_PARALLEL_PAGES
+    if processor.implements_page_contract:
+        process = partial(process_pages, processor, jobs=jobs)
+    else:
+        if jobs > 1:
+            log.warning("Processor %s does not implement process_page_file, ignoring jobs=%d", processorClass, jobs)
+        process = processor.process
 
     ocrd_tool = processor.ocrd_tool
     name = '%s v%s' % (ocrd_tool['executable'], processor.version)
@@ -107,7 +126,7 @@ def run_processor(
         backend = 'psutil_pss' if 'PSS' in config.OCRD_PROFILE else 'psutil'
         from memory_profiler import memory_usage
         try:
-            mem_usage = memory_usage(proc=processor.process,
+            mem_usage = memory_usage(proc=process,
                                      # only run process once
                                      max_iterations=1,
                                      interval=.1, timeout=None, timestamps=True,
@@ -127,7 +146,7 @@ def run_processor(
         logProfile.info(mem_output)
     else:
         try:
-            processor.process()
+            process()
         except Exception as err:
             log.exception("Failure in processor '%s'" % ocrd_tool['executable'])
             raise err
@@ -145,6 +164,8 @@ def run_processor(
         json.dumps(processor.parameter) or '',
         processor.page_id or ''
     ))
+    logProfile.debug("Image metadata cache: %s", exif_from_filename.cache_info())
+    logProfile.debug("Image cache: %s", Workspace.image_cache.cache_info())
     workspace.mets.add_agent(
         name=name,
         _type='OTHER',
@@ -160,6 +181,184 @@ def run_processor(
     return processor
 
 
+class _PageMets():
+    """
+    Stand-in for the workspace METS while a single page is processed in a pool worker.
+
+    Queries are delegated to the actual METS, but changes are only recorded (and
+    answered with :py:class:`~ocrd_models.ocrd_file.ClientSideOcrdFile` like on a
+    METS server), so :py:func:`process_pages` can replay them as the single writer.
+    """
+
+    def __init__(self, mets):
+        self._mets = mets
+        self.changes = []
+
+    def __getattr__(self, name):
+        return getattr(self._mets, name)
+
+    def add_file(self, fileGrp, **kwargs):
+        ID = kwargs.get('ID')
+        if not ID:
+            raise ValueError("Must set ID of the mets:file")
+        if not (kwargs.get('force') or kwargs.get('ignore')) and next(self._mets.find_files(ID=ID), None):
+            raise FileExistsError(f"A file with ID=={ID} already exists and neither force nor ignore are set")
+        if kwargs.get('local_filename'):
+            kwargs['local_filename'] = str(kwargs['local_filename'])
+        self.changes.append(('add_file', (fileGrp,), kwargs))
+        return ClientSideOcrdFile(
+            None,
+            ID=ID,
+            fileGrp=fileGrp,
+            pageId=kwargs.get('pageId'),
+            mimetype=kwargs.get('mimetype'),
+            url=kwargs.get('url'),
+            local_filename=kwargs.get('local_filename'))
+
+    def remove_file(self, *args, **kwargs):
+        files = self._mets.find_all_files(*args, **kwargs)
+        if not files:
+            raise FileNotFoundError("File not found: %s %s" % (args, kwargs))
+        self.changes.append(('remove_file', args, kwargs))
+        return files if len(files) > 1 else files[0]
+
+
+def _process_page(processor, page_id, input_files):
+    """
+    Run :py:meth:`~ocrd.processor.Processor.process_page_file` for a single page
+    on a shallow copy of ``processor`` which records its METS changes.
+
+    Returns:
+        a tuple of the list of recorded METS changes and the exception raised (if any)
+    """
+    log = getLogger('ocrd.processor.helpers.process_pages')
+    log.debug("Processing page '%s'", page_id)
+    page_processor = copy(processor)
+    page_processor.workspace = copy(processor.workspace)
+    page_processor.workspace.mets = _PageMets(processor.workspace.mets)
+    try:
+        page_processor.process_page_file(*input_files)
+        error = None
+    except Exception as err: # pylint: disable=broad-except
+        error = err
+    return page_processor.workspace.mets.changes, error
+
+# processor and page tasks inherited by forked worker processes
+_FORKED_PAGES = None
+
+def _process_forked_page(index):
+    processor, tasks = _FORKED_PAGES
+    changes, error = _process_page(processor, *tasks[index])
+    if error:
+        # exceptions (with their tracebacks) do not necessarily pickle
+        error = Exception(''.join(format_exception(type(error), error, error.__traceback__)))
+    # image metadata probed in this process would be lost otherwise
+    # (and workers writing the sidecar file themselves would overwrite each other's entries)
+    return changes, error, processor.workspace._pop_exif_sidecar_changes()
+
+def process_pages(processor, jobs=1, pool=None):
+    """
+    Run :py:meth:`~ocrd.processor.Processor.process_page_file` of ``processor``
+    for each page of its input fileGrps (as aligned by
+    :py:meth:`~ocrd.processor.Processor.zip_input_files`).
+
+    Each page only records its METS changes, which are applied when the page
+    succeeds. If an error occurs on a page, its changes are dropped, and depending
+    on ``OCRD_MISSING_OUTPUT``, the error is either logged and processing continues
+    with the next page (``SKIP``), or re-raised (``ABORT``).
+    If all pages fail, then raise an exception nevertheless.
+
+    If ``jobs`` is larger than 1, then process that many pages in parallel,
+    either in a thread pool (sharing the processor instance) or in a pool of
+    forked worker processes, depending on ``pool`` (defaulting to
+    ``OCRD_PARALLEL_PAGES_POOL``). Then the recorded METS changes are only
+    applied when all workers are done (in page order), so files added while
+    processing a page are not visible to queries of other pages yet.
+
+    Args:
+        processor (:py:class:`~ocrd.processor.Processor`): processor with workspace and fileGrps set up
+    Keyword Args:
+        jobs (int): number of pages to process in parallel
+        pool (string): ``thread`` or ``process``
+    """
+    log = getLogger('ocrd.processor.helpers.process_pages')
+    if pool is None:
+        pool = config.OCRD_PARALLEL_PAGES_POOL
+    if pool not in ('thread', 'process'):
+        raise ValueError("Unknown pool '%s', must be 'thread' or 'process'" % pool)
+    if not processor.verify():
+        raise Exception("Processor %s cannot process input_file_grp=%s output_file_grp=%s" % (
+            processor.__class__.__name__, processor.input_file_grp, processor.output_file_grp))
+    tasks = []
+    for input_files in processor.zip_input_files(on_error='abort'):
+        page_id = next(input_file.pageId for input_file in input_files if input_file)
+        tasks.append((page_id, input_files))
+    jobs = max(1, min(jobs, len(tasks)))
+    if jobs > 1 and pool == 'process' and 'fork' not in get_all_start_methods():
+        log.warning("Cannot fork worker processes on this platform, falling back to threads")
+        pool = 'thread'
+    log.info("Processing %d pages with %d %s", len(tasks), jobs,
+             'job' if jobs == 1 else '%s workers' % pool)
+
+    failed = []
+    def handle_error(page_id, error):
+        if config.OCRD_MISSING_OUTPUT == 'ABORT':
+            raise error
+        log.error("Failed to process page '%s': %s", page_id,
+                  ''.join(format_exception(type(error), error, error.__traceback__)) if error.__traceback__ else error)
+        failed.append(page_id)
+
+    def apply_changes(page_id, changes):
+        try:
+            for method, args, kwargs in changes:
+                getattr(processor.workspace.mets, method)(*args, **kwargs)
+        except Exception as err: # pylint: disable=broad-except
+            handle_error(page_id, err)
+
+    if jobs == 1:
+        for page_id, input_files in tasks:
+            changes, error = _process_page(processor, page_id, input_files)
+            if error:
+                handle_error(page_id, error)
+            else:
+                # visible to the following pages already
+                apply_changes(page_id, changes)
+    else:
+        global _FORKED_PAGES # pylint: disable=global-statement
+        if pool == 'thread':
+            executor = ThreadPoolExecutor(max_workers=jobs)
+            submit = lambda i: executor.submit(_process_page, processor, *tasks[i])
+        else:
+            _FORKED_PAGES = (processor, tasks)
+            executor = ProcessPoolExecutor(max_workers=jobs, mp_context=get_context('fork'))
+            submit = lambda i: executor.submit(_process_forked_page, i)
+        futures = []
+        try:
+            futures.extend(submit(i) for i in range(len(tasks)))
+            page_changes = []
+            for (page_id, _), future in zip(tasks, futures):
+                changes, error, *exif_changes = future.result()
+                if exif_changes:
+                    # saved along with the METS
+                    processor.workspace._add_exif_sidecar_changes(exif_changes[0])
+                if error:
+                    # drop whatever the page recorded before failing
+                    handle_error(page_id, error)
+                else:
+                    page_changes.append((page_id, changes))
+            # only change the METS when all workers (which still read it) are done
+            for page_id, changes in page_changes:
+                apply_changes(page_id, changes)
+        finally:
+            for future in futures:
+                future.cancel()
+            executor.shutdown()
+            _FORKED_PAGES = None
+    if failed:
+        log.warning("Failed to process %d of %d pages: %s", len(failed), len(tasks), failed)
+        if len(failed) == len(tasks):
+            raise Exception("Failed to process all %d pages" % len(tasks))
+
 def run_cli(
         executable,
         mets_url=None,
@@ -274,6 +473,8 @@ def generate_processor_help(ocrd_tool, processor_instance=None, subcommand=None)
   -I, --input-file-grp USE        File group(s) used as input
   -O, --output-file-grp USE       File group(s) used as output
   -g, --page-id ID                Physical page ID(s) to process instead of full document []
+  --jobs N                        Number of pages to process in parallel (if supported)
+                                  [$OCRD_MAX_PARALLEL_PAGES or 1]
   --overwrite                     Remove existing output pages/images
                                   (with "--page-id", remove only those)
   --profile                       Enable profiling
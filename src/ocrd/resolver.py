@@ -216,6 +216,10 @@ class Resolver():
         log.debug("workspace_from_url\nmets_basename='%s'\nmets_url='%s'\nsrc_baseurl='%s'\ndst_dir='%s'",
             mets_basename, mets_url, src_baseurl, dst_dir)
         self.download_to_directory(dst_dir, mets_url, basename=mets_basename, if_exists='overwrite' if clobber_mets else 'skip')
+        if is_local_filename(mets_url) and Path(get_local_filename(mets_url) + '.journal').exists():
+            # changes not compacted into the METS file yet (cf. OCRD_METS_JOURNAL)
+            self.download_to_directory(dst_dir, mets_url + '.journal', basename=mets_basename + '.journal',
+                                       if_exists='overwrite' if clobber_mets else 'skip')
 
         workspace = Workspace(self, dst_dir, mets_basename=mets_basename, baseurl=src_baseurl, mets_server_url=mets_server_url)
 
@@ -1,11 +1,17 @@
+import hashlib
 import io
-from os import makedirs, unlink, listdir, path
+import json
+from collections import OrderedDict, namedtuple
+from copy import copy
+from os import fsync, makedirs, unlink, listdir, path, stat, truncate
 from pathlib import Path
 from shutil import move, copyfileobj
 from re import sub
 from tempfile import NamedTemporaryFile
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
-from typing import Optional, Union
+from threading import Lock
+from typing import List, Optional, Union
 
 from cv2 import COLOR_GRAY2BGR, COLOR_RGB2BGR, cvtColor
 from PIL import Image
@@ -13,23 +19,27 @@ import numpy as np
 from deprecated.sphinx import deprecated
 import requests
 
-from ocrd_models import OcrdMets, OcrdFile
+from ocrd_models import OcrdMets, LazyOcrdMets, OcrdFile, OcrdExif, OcrdPageLite
 from ocrd_models.ocrd_file import ClientSideOcrdFile
-from ocrd_models.ocrd_page import parse, BorderType, to_xml
-from ocrd_modelfactory import exif_from_filename, page_from_file
+from ocrd_models.ocrd_page import parse, BorderType
+from ocrd_modelfactory import exif_from_filename
 from ocrd_utils import (
     atomic_write,
+    config,
     getLogger,
-    image_from_polygon,
     coordinates_of_segment,
+    coordinates_of_segments,
     adjust_canvas_to_rotation,
     adjust_canvas_to_transposition,
     shift_coordinates,
     rotate_coordinates,
     transform_coordinates,
     transpose_coordinates,
-    crop_image,
+    crop_array_to_polygon,
+    crop_image_to_polygon,
+    rotate_array,
     rotate_image,
+    transpose_array,
     transpose_image,
     bbox_from_polygon,
     polygon_from_points,
@@ -49,6 +59,78 @@ from .mets_server import ClientSideOcrdMets
 
 __all__ = ['Workspace']
 
+EXIF_SIDECAR_BASENAME = '.ocrd-exif.json'
+
+ImageCacheInfo = namedtuple('ImageCacheInfo', ['hits', 'misses', 'evictions', 'currsize', 'maxsize'])
+
+class ImageCache():
+    """
+    Least-recently-used cache of decoded (and derived) images, bounded by
+    a memory budget of ``OCRD_MAX_IMAGE_CACHE`` bytes.
+
+    Values are stored as-is, so callers must copy them before handing out.
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = Lock()
+        self.cache_clear()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key][0]
+
+    def put(self, key, value, nbytes):
+        """
+        Store :py:attr:`value` unless it exceeds the memory budget on its own.
+
+        Returns whether it was stored (so it must be copied before handing out).
+        """
+        maxsize = config.OCRD_MAX_IMAGE_CACHE
+        if nbytes > maxsize:
+            return False
+        with self._lock:
+            if key in self._entries:
+                self.currsize -= self._entries.pop(key)[1]
+            self._entries[key] = (value, nbytes)
+            self.currsize += nbytes
+            while self.currsize > maxsize:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.currsize -= evicted
+                self.evictions += 1
+        return True
+
+    def cache_info(self):
+        return ImageCacheInfo(self.hits, self.misses, self.evictions, self.currsize, config.OCRD_MAX_IMAGE_CACHE)
+
+    def cache_clear(self):
+        self._entries.clear()
+        self.hits = self.misses = self.evictions = self.currsize = 0
+
+def _image_nbytes(image):
+    return image.width * image.height * len(image.getbands())
+
+def _copy_image(image):
+    ret = image.copy()
+    for attr in ['filename', 'format']:
+        if hasattr(image, attr):
+            setattr(ret, attr, getattr(image, attr))
+    return ret
+
+def _copy_page_image(image, coords, info, as_array=False):
+    return (np.asarray(image) if as_array else _copy_image(image),
+            dict(coords, transform=coords['transform'].copy()), copy(info))
+
+def _image_size(image):
+    if isinstance(image, np.ndarray):
+        return image.shape[1], image.shape[0]
+    return image.width, image.height
+
 @contextmanager
 def download_temporary_file(url):
     with NamedTemporaryFile(prefix='ocrd-download-') as f:
@@ -73,6 +155,9 @@ class Workspace():
         baseurl (string) : Base URL to prefix to relative URL.
     """
 
+    #: decoded and derived images shared by all instances (keyed by file identity)
+    image_cache = ImageCache()
+
     def __init__(
         self,
         resolver,
@@ -86,6 +171,9 @@ class Workspace():
         self.resolver = resolver
         self.directory = directory
         self.mets_target = str(Path(directory, mets_basename))
+        self.mets_journal = self.mets_target + '.journal'
+        # number of entries in the METS journal (or None if the METS file must be rewritten on the next save)
+        self._journal_entries = None
         self.overwrite_mode = False
         self.is_remote = bool(mets_server_url)
         if mets is None:
@@ -95,7 +183,7 @@ class Workspace():
                     raise ValueError(f"METS server {mets_server_url} workspace directory {mets.workspace_path} differs "
                             f"from local workspace directory {self.directory}. These are not the same workspaces.")
             else:
-                mets = OcrdMets(filename=self.mets_target)
+                mets = self._load_mets()
         self.mets = mets
         if automatic_backup:
             self.automatic_backup = WorkspaceBackupManager(self)
@@ -103,6 +191,8 @@ class Workspace():
         else:
             self.automatic_backup = None
         self.baseurl = baseurl
+        self._exif_sidecar = None
+        self._exif_sidecar_changes = {}
         #  print(mets.to_xml(xmllint=True).decode('utf-8'))
 
     def __str__(self):
@@ -118,7 +208,83 @@ class Workspace():
         """
         Reload METS from the filesystem.
         """
-        self.mets = OcrdMets(filename=self.mets_target)
+        self.mets = self._load_mets()
+
+    def _load_mets(self):
+        if config.OCRD_METS_LAZY:
+            mets = LazyOcrdMets(filename=self.mets_target)
+        else:
+            mets = OcrdMets(filename=self.mets_target)
+        self._journal_entries = 0
+        if path.exists(self.mets_journal):
+            entries = self._read_mets_journal()
+            if entries is None:
+                self._journal_entries = None
+            else:
+                mets.replay_journal(entries)
+                self._journal_entries = len(entries)
+        if config.OCRD_METS_JOURNAL and self._journal_entries is not None:
+            mets.start_journal()
+        return mets
+
+    def _mets_checksum(self):
+        with open(self.mets_target, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+
+    def _read_mets_journal(self):
+        """
+        Read the entries of the METS journal, or ``None`` if it does not belong to the current METS file.
+        """
+        log = getLogger('ocrd.workspace.mets_journal')
+        with open(self.mets_journal, 'rb') as f:
+            data = f.read()
+        lines = data.split(b'\n')
+        try:
+            checksum = json.loads(lines[0]).get('mets')
+        except (ValueError, AttributeError):
+            # not a journal written by us
+            checksum = None
+        if len(lines) < 2 or checksum != self._mets_checksum():
+            log.warning("Ignoring METS journal '%s' which does not belong to the current '%s'",
+                        self.mets_journal, self.mets_target)
+            return None
+        entries = []
+        size = len(lines[0]) + 1
+        for line in lines[1:-1]:
+            try:
+                entry = json.loads(line)
+                if not isinstance(entry, list) or len(entry) != 3:
+                    raise ValueError("not a journal entry: %s" % line)
+            except ValueError:
+                break
+            entries.append(entry)
+            size += len(line) + 1
+        if size < len(data):
+            log.warning("Discarding invalid or incomplete entries of METS journal '%s' after %d entries "
+                        "(interrupted write?)", self.mets_journal, len(entries))
+            truncate(self.mets_journal, size)
+        log.debug("Replaying %d entries of METS journal '%s'", len(entries), self.mets_journal)
+        return entries
+
+    def _append_mets_journal(self, lines):
+        """
+        Append the serialised changes :py:attr:`lines` to the METS journal (creating it if necessary).
+        """
+        if not lines:
+            return
+        header = []
+        if not path.exists(self.mets_journal):
+            header.append(json.dumps({'mets': self._mets_checksum()}))
+        try:
+            with open(self.mets_journal, 'a', encoding='utf-8') as f:
+                f.write(''.join(line + '\n' for line in header + lines))
+                f.flush()
+                fsync(f.fileno())
+        except BaseException:
+            # rewrite the METS file on the next save
+            self._journal_entries = None
+            raise
+        self._journal_entries += len(lines)
 
     @deprecated_alias(pageId="page_id")
     @deprecated_alias(ID="file_id")
@@ -273,6 +439,43 @@ class Workspace():
             if not force:
                 raise e
 
+    def remove_files(self, file_ids, force=False, keep_file=False):
+        """
+        Remove many METS `file` from the workspace at once (i.e. with a single
+        request if the workspace uses a METS server).
+
+        Unlike :py:meth:`remove_file`, files which are not locally available
+        are just removed from METS.
+
+        Arguments:
+            file_ids (list): `@ID` of each METS `file` to delete or the file itself
+        Keyword Args:
+            force (boolean): Continue removing even if some file is not found in METS
+                or on disk
+            keep_file (boolean): Whether to keep files on disk
+        Returns:
+            list of removed :py:class:`ocrd_models.ocrd_file.OcrdFile`
+        """
+        log = getLogger('ocrd.workspace.remove_files')
+        if self.overwrite_mode:
+            force = True
+        file_ids = [f.ID if isinstance(f, OcrdFile) else f for f in file_ids]
+        log.debug('Deleting %d mets:file', len(file_ids))
+        ocrd_files = self.mets.remove_files(file_ids, force=force)
+        if not keep_file:
+            with pushd_popd(self.directory):
+                for ocrd_file in ocrd_files:
+                    if not ocrd_file.local_filename:
+                        log.debug("File not locally available: %s", ocrd_file)
+                        continue
+                    log.debug("rm %s [cwd=%s]", ocrd_file.local_filename, self.directory)
+                    try:
+                        unlink(ocrd_file.local_filename)
+                    except FileNotFoundError as e:
+                        if not force:
+                            raise e
+        return ocrd_files
+
     def remove_file_group(self, USE, recursive=False, force=False, keep_files=False, page_recursive=False, page_same_group=False):
         """
         Remove a METS `fileGrp`.
@@ -362,23 +565,8 @@ class Workspace():
             # change file paths in PAGE-XML imageFilename and filename attributes
             for page_file in self.mets.find_files(mimetype=MIMETYPE_PAGE, local_only=True):
                 log.debug("Renaming file references in PAGE-XML %s" % page_file)
-                pcgts = page_from_file(page_file)
-                changed = False
-                for old_local_filename, new_local_filename in local_filename_replacements.items():
-                    if pcgts.get_Page().imageFilename == old_local_filename:
-                        changed = True
-                        log.debug("Rename pc:Page/@imageFilename: %s -> %s" % (old_local_filename, new_local_filename))
-                        pcgts.get_Page().imageFilename = new_local_filename
-                for ai in pcgts.get_Page().get_AllAlternativeImages():
-                    for old_local_filename, new_local_filename in local_filename_replacements.items():
-                        if ai.filename == old_local_filename:
-                            changed = True
-                            log.debug("Rename pc:Page/../AlternativeImage: %s -> %s" % (old_local_filename, new_local_filename))
-                            ai.filename = new_local_filename
-                if changed:
-                    log.debug("PAGE-XML changed, writing %s" % (page_file.local_filename))
-                    with open(page_file.local_filename, 'w', encoding='utf-8') as f:
-                        f.write(to_xml(pcgts))
+                if OcrdPageLite(page_file.local_filename).replace_filenames(local_filename_replacements):
+                    log.debug("PAGE-XML changed, wrote %s" % (page_file.local_filename))
             # change the ``USE`` attribute of the fileGrp
             self.mets.rename_file_group(old, new)
             # Remove the old dir
@@ -419,7 +607,7 @@ class Workspace():
                 # If the local filename has folder components, create those folders
                 local_filename_dir = str(kwargs['local_filename']).rsplit('/', 1)[0]
                 if local_filename_dir != str(kwargs['local_filename']) and not Path(local_filename_dir).is_dir():
-                    makedirs(local_filename_dir)
+                    makedirs(local_filename_dir, exist_ok=True)
 
             #  print(kwargs)
             kwargs["pageId"] = kwargs.pop("page_id")
@@ -438,19 +626,138 @@ class Workspace():
 
         return ret
 
+    def add_files(self, files, force=False, ignore=False) -> List[Union[OcrdFile, ClientSideOcrdFile]]:
+        """
+        Add many files to the :py:class:`ocrd_models.ocrd_mets.OcrdMets` of the workspace
+        at once (i.e. with a single request if the workspace uses a METS server).
+
+        Arguments:
+            files (list): keyword arguments of :py:meth:`add_file` for each file,
+                including `file_grp`, `page_id` and optionally `content`
+        Keyword Args:
+            force (boolean): Whether to replace existing files with the same `@ID`
+            ignore (boolean): Do not look for existing files at all
+        Returns:
+            list of new :py:class:`ocrd_models.ocrd_file.OcrdFile`
+        """
+        log = getLogger('ocrd.workspace.add_files')
+        if self.overwrite_mode:
+            force = True
+        mets_files = []
+        contents = []
+        for kwargs in files:
+            kwargs = dict(kwargs)
+            content = kwargs.pop('content', None)
+            if 'page_id' not in kwargs:
+                raise ValueError("workspace.add_files must be passed a 'page_id' for each file, even if it is None.")
+            if content is not None and not kwargs.get('local_filename'):
+                raise Exception("'content' was set but no 'local_filename'")
+            kwargs["fileGrp"] = kwargs.pop("file_grp")
+            kwargs["pageId"] = kwargs.pop("page_id")
+            if "file_id" in kwargs:
+                kwargs["ID"] = kwargs.pop("file_id")
+            mets_files.append(kwargs)
+            contents.append(content)
+        log.debug('adding %d files', len(mets_files))
+
+        with pushd_popd(self.directory):
+            for local_filename_dir in set(str(kwargs['local_filename']).rsplit('/', 1)[0]
+                                          for kwargs in mets_files if '/' in str(kwargs.get('local_filename') or '')):
+                # If the local filename has folder components, create those folders
+                if not Path(local_filename_dir).is_dir():
+                    makedirs(local_filename_dir, exist_ok=True)
+
+            ret = self.mets.add_files(mets_files, force=force, ignore=ignore)
+
+            for kwargs, content in zip(mets_files, contents):
+                if content is not None:
+                    with open(kwargs['local_filename'], 'wb') as f:
+                        if isinstance(content, str):
+                            content = bytes(content, 'utf-8')
+                        f.write(content)
+
+        return ret
+
     def save_mets(self):
         """
         Write out the current state of the METS file to the filesystem.
         """
+        self.prepare_save_mets()()
+
+    def prepare_save_mets(self):
+        """
+        Capture the current state of the METS file for :py:meth:`save_mets`, but leave
+        writing it out (along with the EXIF sidecar, backup and journal) to the returned
+        function, so the METS may change again meanwhile (as in the METS server).
+
+        Returns:
+            a function without arguments that writes the captured state to the filesystem
+        """
         log = getLogger('ocrd.workspace.save_mets')
+        if self.is_remote:
+            def save():
+                self.save_exif_sidecar()
+                self.mets.save()
+            return save
+        entries = None
+        if config.OCRD_METS_JOURNAL and isinstance(self.mets, OcrdMets):
+            entries = self.mets.pop_journal()
+        lines = None
+        if entries is not None and self._journal_entries is not None and \
+                self._journal_entries + len(entries) <= config.OCRD_METS_JOURNAL_MAX:
+            try:
+                lines = [json.dumps(entry) for entry in entries]
+            except TypeError as err:
+                log.debug("Cannot journal changes of mets '%s' (%s)", self.mets_target, err)
+        # with a journal, only back up the complete METS when compacting it
+        backup = self.mets.to_xml() if self.automatic_backup and lines is None else None
+        compact = self._prepare_compact_mets() if lines is None else None
+        def save():
+            self.save_exif_sidecar()
+            if backup is not None:
+                WorkspaceBackupManager(self).add(backup)
+            if compact:
+                compact()
+            else:
+                log.debug("Appending %d changes of mets '%s' to journal", len(lines), self.mets_target)
+                self._append_mets_journal(lines)
+        return save
+
+    def compact_mets(self):
+        """
+        Write out the complete METS file, replacing the journal of changes (if any, cf. ``OCRD_METS_JOURNAL``).
+        """
         if self.is_remote:
             self.mets.save()
-        else:
+            return
+        self._prepare_compact_mets()()
+
+    def _prepare_compact_mets(self):
+        """
+        Serialise the complete METS file for :py:meth:`compact_mets`, returning a function
+        that writes it out.
+        """
+        log = getLogger('ocrd.workspace.save_mets')
+        content = self.mets.to_xml(xmllint=True)
+        if isinstance(self.mets, OcrdMets):
+            # record the changes made after serialising
+            if config.OCRD_METS_JOURNAL:
+                self.mets.start_journal()
+            else:
+                self.mets.stop_journal()
+        def compact():
             log.debug("Saving mets '%s'", self.mets_target)
-            if self.automatic_backup:
-                WorkspaceBackupManager(self).add()
-            with atomic_write(self.mets_target) as f:
-                f.write(self.mets.to_xml(xmllint=True).decode('utf-8'))
+            try:
+                with atomic_write(self.mets_target, mode='wb') as f:
+                    f.write(content)
+                if path.exists(self.mets_journal):
+                    unlink(self.mets_journal)
+            except BaseException:
+                # rewrite the METS file on the next save
+                self._journal_entries = None
+                raise
+            self._journal_entries = 0
+        return compact
 
     def resolve_image_exif(self, image_url):
         """
@@ -462,19 +769,89 @@ class Workspace():
         Returns:
             :py:class:`ocrd_models.ocrd_exif.OcrdExif`
         """
+        return self._resolve_image_exif(image_url)
+
+    def _resolve_image_exif(self, image_url, image_files=None):
         if not image_url:
             # avoid "finding" just any file
             raise ValueError(f"'image_url' must be a non-empty string, not '{image_url}' ({type(image_url)})")
-        try:
-            f = next(self.mets.find_files(local_filename=str(image_url)))
-            return exif_from_filename(f.local_filename)
-        except StopIteration:
+        f, is_local = self._find_image_file(image_url, image_files)
+        if f is None:
+            with download_temporary_file(image_url) as f:
+                return exif_from_filename(f.name)
+        if is_local:
+            return self._exif_from_local_filename(f.local_filename)
+        return self._exif_from_local_filename(self.download_file(f).local_filename)
+
+    def _exif_from_local_filename(self, local_filename):
+        """
+        Get :py:class:`ocrd_models.ocrd_exif.OcrdExif` of a workspace file,
+        consulting the workspace's sidecar file (if ``OCRD_EXIF_SIDECAR`` is enabled)
+        before the in-memory cache of :py:func:`exif_from_filename`. New entries are
+        only written by :py:meth:`save_exif_sidecar`.
+        """
+        if not config.OCRD_EXIF_SIDECAR:
+            return exif_from_filename(local_filename)
+        with pushd_popd(self.directory):
+            if self._exif_sidecar is None:
+                try:
+                    with open(EXIF_SIDECAR_BASENAME, 'r', encoding='utf-8') as f:
+                        self._exif_sidecar = json.load(f)
+                except (FileNotFoundError, ValueError):
+                    self._exif_sidecar = {}
+            st = stat(local_filename)
+            key = [st.st_ino, st.st_mtime_ns, st.st_size]
+            entry = self._exif_sidecar.get(str(local_filename))
+            if entry and entry['stat'] == key:
+                return OcrdExif.from_dict(entry['exif'])
+            exif = exif_from_filename(local_filename)
+            entry = {'stat': key, 'exif': exif.to_dict()}
+            self._exif_sidecar[str(local_filename)] = entry
+            self._exif_sidecar_changes[str(local_filename)] = entry
+            return exif
+
+    def save_exif_sidecar(self):
+        """
+        Write the image metadata probed since the last save to the workspace's
+        sidecar file (cf. ``OCRD_EXIF_SIDECAR``), merged with its current content
+        (which other processors or page workers may have changed meanwhile).
+
+        (Called by :py:meth:`save_mets`.)
+        """
+        if not self._exif_sidecar_changes:
+            return
+        log = getLogger('ocrd.workspace.resolve_image_exif')
+        changes = self._pop_exif_sidecar_changes()
+        with pushd_popd(self.directory):
             try:
-                f = next(self.mets.find_files(url=str(image_url)))
-                return exif_from_filename(self.download_file(f).local_filename)
-            except StopIteration:
-                with download_temporary_file(image_url) as f:
-                    return exif_from_filename(f.name)
+                with open(EXIF_SIDECAR_BASENAME, 'r', encoding='utf-8') as f:
+                    sidecar = json.load(f)
+            except (FileNotFoundError, ValueError):
+                sidecar = {}
+            sidecar.update(changes)
+            try:
+                with atomic_write(EXIF_SIDECAR_BASENAME) as f:
+                    json.dump(sidecar, f)
+            except OSError as err:
+                log.warning("Cannot write EXIF sidecar file in %s: %s", self.directory, err)
+
+    def _pop_exif_sidecar_changes(self):
+        """
+        Get (and forget) the image metadata probed since the last :py:meth:`save_exif_sidecar`
+        """
+        # copy and clear in place, since page workers share the dict
+        changes = dict(self._exif_sidecar_changes)
+        self._exif_sidecar_changes.clear()
+        return changes
+
+    def _add_exif_sidecar_changes(self, changes):
+        """
+        Take over image metadata probed by :py:meth:`_pop_exif_sidecar_changes` in another process
+        (so :py:meth:`save_exif_sidecar` writes them)
+        """
+        if self._exif_sidecar is not None:
+            self._exif_sidecar.update(changes)
+        self._exif_sidecar_changes.update(changes)
 
     @deprecated(version='1.0.0', reason="Use workspace.image_from_page and workspace.image_from_segment")
     def resolve_image_as_pil(self, image_url, coords=None):
@@ -492,22 +869,87 @@ class Workspace():
         """
         return self._resolve_image_as_pil(image_url, coords)
 
-    def _resolve_image_as_pil(self, image_url, coords=None):
+    def _find_image_file(self, image_url, image_files=None):
+        """
+        Find the METS file for ``image_url`` by local filename, or else by URL
+        (memoised in the dict ``image_files``, if given).
+
+        Returns:
+            a tuple of the :py:class:`ocrd_models.ocrd_file.OcrdFile` (or ``None``)
+            and whether it was found by local filename
+        """
+        if image_files is not None and image_url in image_files:
+            return image_files[image_url]
+        # consume all results (instead of abandoning a streamed response)
+        files = self.mets.find_all_files(local_filename=str(image_url))
+        if files:
+            found = files[0], True
+        else:
+            files = self.mets.find_all_files(url=str(image_url))
+            found = (files[0] if files else None), False
+        if image_files is not None:
+            image_files[image_url] = found
+        return found
+
+    def _image_file_key(self, image_file):
+        """
+        Identify the local file of the METS file ``image_file`` by path, inode, mtime
+        and size (or ``None`` if it is not available locally), so image cache entries
+        get invalidated when the file changes.
+        """
+        if image_file is None or not image_file.local_filename:
+            return None
+        with pushd_popd(self.directory):
+            try:
+                st = stat(image_file.local_filename)
+            except OSError:
+                return None
+            return (path.abspath(image_file.local_filename), st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def _resolve_image_as_pil(self, image_url, coords=None, image_files=None):
         if not image_url:
             # avoid "finding" just any file
             raise Exception("Cannot resolve empty image path")
+        image_file, is_local = self._find_image_file(image_url, image_files)
+        key = self._image_file_key(image_file) if config.OCRD_MAX_IMAGE_CACHE else None
+        pil_image = self.image_cache.get(key) if key else None
+        if pil_image is not None:
+            pil_image = _copy_image(pil_image)
+        else:
+            pil_image = self._open_image_as_pil(image_url, image_file, is_local)
+            if key and self.image_cache.put(key, pil_image, _image_nbytes(pil_image)):
+                # only copy if shared with the cache
+                pil_image = _copy_image(pil_image)
+
+        if coords is None:
+            return pil_image
+
+        log = getLogger('ocrd.workspace._resolve_image_as_pil')
+        # FIXME: remove or replace this by (image_from_polygon+) crop_image ...
+        log.debug("Converting PIL to OpenCV: %s", image_url)
+        color_conversion = COLOR_GRAY2BGR if pil_image.mode in ('1', 'L') else  COLOR_RGB2BGR
+        pil_as_np_array = np.array(pil_image).astype('uint8') if pil_image.mode == '1' else np.array(pil_image)
+        cv2_image = cvtColor(pil_as_np_array, color_conversion)
+
+        poly = np.array(coords, np.int32)
+        log.debug("Cutting region %s from %s", coords, image_url)
+        region_cut = cv2_image[
+            np.min(poly[:, 1]):np.max(poly[:, 1]),
+            np.min(poly[:, 0]):np.max(poly[:, 0])
+        ]
+        return Image.fromarray(region_cut)
+
+    def _open_image_as_pil(self, image_url, image_file, is_local):
         log = getLogger('ocrd.workspace._resolve_image_as_pil')
         with pushd_popd(self.directory):
-            try:
-                f = next(self.mets.find_files(local_filename=str(image_url)))
-                pil_image = Image.open(f.local_filename)
-            except StopIteration:
-                try:
-                    f = next(self.mets.find_files(url=str(image_url)))
-                    pil_image = Image.open(self.download_file(f).local_filename)
-                except StopIteration:
-                    with download_temporary_file(image_url) as f:
-                        pil_image = Image.open(f.name)
+            if image_file is None:
+                with download_temporary_file(image_url) as f:
+                    pil_image = Image.open(f.name)
+                    pil_image.load()
+            elif is_local:
+                pil_image = Image.open(image_file.local_filename)
+            else:
+                pil_image = Image.open(self.download_file(image_file).local_filename)
             pil_image.load() # alloc and give up the FD
 
         # Pillow does not properly support higher color depths
@@ -544,27 +986,12 @@ class Workspace():
                 arr_image *= 255
                 arr_image = arr_image.astype(np.uint8)
             pil_image = Image.fromarray(arr_image)
-
-        if coords is None:
-            return pil_image
-
-        # FIXME: remove or replace this by (image_from_polygon+) crop_image ...
-        log.debug("Converting PIL to OpenCV: %s", image_url)
-        color_conversion = COLOR_GRAY2BGR if pil_image.mode in ('1', 'L') else  COLOR_RGB2BGR
-        pil_as_np_array = np.array(pil_image).astype('uint8') if pil_image.mode == '1' else np.array(pil_image)
-        cv2_image = cvtColor(pil_as_np_array, color_conversion)
-
-        poly = np.array(coords, np.int32)
-        log.debug("Cutting region %s from %s", coords, image_url)
-        region_cut = cv2_image[
-            np.min(poly[:, 1]):np.max(poly[:, 1]),
-            np.min(poly[:, 0]):np.max(poly[:, 0])
-        ]
-        return Image.fromarray(region_cut)
+        return pil_image
 
     def image_from_page(self, page, page_id,
                         fill='background', transparency=False,
-                        feature_selector='', feature_filter='', filename=''):
+                        feature_selector='', feature_filter='', filename='',
+                        as_array=False):
         """Extract an image for a PAGE-XML page from the workspace.
 
         Args:
@@ -576,6 +1003,8 @@ class Workspace():
             feature_selector (string): a comma-separated list of `@comments` classes
             feature_filter (string): a comma-separated list of `@comments` classes
             filename (string): which file path to use
+            as_array (boolean): whether to return a `numpy` array instead of a `PIL.Image` \
+                (to be passed on to :py:meth:`image_from_segment`)
 
         Extract a `PIL.Image` from ``page``, either from its `AlternativeImage`
         (if it exists), or from its `@imageFilename` (otherwise). Also crop it,
@@ -646,8 +1075,16 @@ class Workspace():
                     feature_filter='binarized,grayscale_normalized')
         """
         log = getLogger('ocrd.workspace.image_from_page')
-        page_image_info = self.resolve_image_exif(page.imageFilename)
-        page_image = self._resolve_image_as_pil(page.imageFilename)
+        # METS files of the images, so they are only looked up once
+        image_files = {}
+        cache_key = self._page_image_cache_key(page, image_files, fill, transparency,
+                                               feature_selector, feature_filter, filename)
+        cached = self.image_cache.get(cache_key) if cache_key else None
+        if cached:
+            log.debug("Using cached image for page '%s'", page_id)
+            return _copy_page_image(*cached, as_array=as_array)
+        page_image_info = self._resolve_image_exif(page.imageFilename, image_files)
+        page_image = self._resolve_image_as_pil(page.imageFilename, image_files=image_files)
         page_coords = dict()
         # use identity as initial affine coordinate transform:
         page_coords['transform'] = np.eye(3)
@@ -703,7 +1140,7 @@ class Workspace():
                 log.debug("Using AlternativeImage %d %s for page '%s'",
                           alternative_images.index(best_image) + 1,
                           best_features, page_id)
-                page_image = self._resolve_image_as_pil(best_image.get_filename())
+                page_image = self._resolve_image_as_pil(best_image.get_filename(), image_files=image_files)
                 page_coords['features'] = best_image.get_comments() # including duplicates
 
         # adjust the coord transformation to the steps applied on the image,
@@ -787,11 +1224,39 @@ class Workspace():
                             'filter="%s" in page "%s"' % (
                                 feature_filter, page_id))
         page_image.format = 'PNG' # workaround for tesserocr#194
+        if cache_key and self.image_cache.put(cache_key, (page_image, page_coords, page_image_info),
+                                              _image_nbytes(page_image)):
+            return _copy_page_image(page_image, page_coords, page_image_info, as_array=as_array)
+        if as_array:
+            page_image = np.asarray(page_image)
         return page_image, page_coords, page_image_info
 
+    def _page_image_cache_key(self, page, image_files, *args):
+        """
+        Identify the result of :py:meth:`image_from_page` by all image files
+        involved (looked up via ``image_files``) and all annotations and arguments
+        it depends on (or ``None`` if some image is not available locally or
+        the image cache is disabled).
+        """
+        if not config.OCRD_MAX_IMAGE_CACHE:
+            return None
+        alternative_images = page.get_AlternativeImage()
+        image_urls = [page.imageFilename] + [alternative_image.get_filename()
+                                             for alternative_image in alternative_images]
+        files = [self._image_file_key(self._find_image_file(image_url, image_files)[0])
+                 for image_url in image_urls]
+        if not all(files):
+            return None
+        border = page.get_Border()
+        return ('page', tuple(files),
+                tuple(alternative_image.get_comments() for alternative_image in alternative_images),
+                border.get_Coords().points if border else None,
+                page.get_orientation(), repr(args))
+
     def image_from_segment(self, segment, parent_image, parent_coords,
                            fill='background', transparency=False,
-                           feature_selector='', feature_filter='', filename=''):
+                           feature_selector='', feature_filter='', filename='',
+                           as_array=False):
         """Extract an image for a PAGE-XML hierarchy segment from its parent's image.
 
         Args:
@@ -800,7 +1265,7 @@ class Workspace():
                 or :py:class:`~ocrd_models.ocrd_page.TextLineType` \
                 or :py:class:`~ocrd_models.ocrd_page.WordType` \
                 or :py:class:`~ocrd_models.ocrd_page.GlyphType`)
-            parent_image (`PIL.Image`): image of the `segment`'s parent
+            parent_image (`PIL.Image` or `numpy.ndarray`): image of the `segment`'s parent
             parent_coords (dict): a `dict` with information about `parent_image`:
 
                - `"transform"`: a `Numpy` array with an affine transform which
@@ -814,11 +1279,14 @@ class Workspace():
             transparency (boolean): whether to add an alpha channel for masking
             feature_selector (string): a comma-separated list of ``@comments`` classes
             feature_filter (string): a comma-separated list of ``@comments`` classes
+            as_array (boolean): whether to return a `numpy` array instead of a `PIL.Image`
 
         Extract a `PIL.Image` from `segment`, either from ``AlternativeImage``
         (if it exists), or producing a new image via cropping from `parent_image`
         (otherwise). Pass in `parent_image` and `parent_coords` from the result
         of the next higher-level of this function or from :py:meth:`image_from_page`.
+        If `parent_image` is a `numpy` array (cf. ``as_array``), then cropping,
+        masking and transposition operate on arrays without converting to `PIL`.
 
         If ``filename`` is given, then among the available `AlternativeImage/@filename`
         images, pick that one, or raise an error.
@@ -887,6 +1355,64 @@ class Workspace():
                     feature_selector='deskewed,cropped',
                     feature_filter='binarized,grayscale_normalized')
         """
+        return self._image_from_segment(segment, None, parent_image, parent_coords,
+                                        fill=fill, transparency=transparency,
+                                        feature_selector=feature_selector,
+                                        feature_filter=feature_filter, filename=filename,
+                                        as_array=as_array)
+
+    def image_from_segments(self, segments, parent_image, parent_coords,
+                            fill='background', transparency=False,
+                            feature_selector='', feature_filter='', max_workers=None,
+                            as_array=False):
+        """Extract images for many PAGE-XML hierarchy segments from their common parent's image.
+
+        Args:
+            segments (list): PAGE segment objects sharing the same parent \
+                (e.g. all ``region.get_TextLine()``), or at least the same `parent_image` \
+                (e.g. all ``page.get_AllTextLines()`` with the page image)
+            parent_image (`PIL.Image` or `numpy.ndarray`): image of the `segments`' parent
+            parent_coords (dict): a `dict` with information about `parent_image` \
+                (see :py:meth:`image_from_segment`)
+        Keyword Args:
+            fill (string): a `PIL` color specifier, or `background` or `none`
+            transparency (boolean): whether to add an alpha channel for masking
+            feature_selector (string): a comma-separated list of ``@comments`` classes
+            feature_filter (string): a comma-separated list of ``@comments`` classes
+            max_workers (int): number of threads to extract segments in parallel \
+                (defaulting to ``OCRD_MAX_SEGMENT_WORKERS``)
+            as_array (boolean): whether to return `numpy` arrays instead of `PIL.Image`
+
+        Same as calling :py:meth:`image_from_segment` for each of `segments`,
+        but the coordinates of all segments are transformed into `parent_image`
+        in a single vectorised operation, and the cropping, masking and rotation
+        of the individual segments runs in a thread pool (if `max_workers` > 1).
+
+        Returns:
+            a list of tuples of the extracted `PIL.Image` and a `dict` with information
+            about it (cf. :py:meth:`image_from_segment`), in the order of `segments`
+        """
+        segments = list(segments)
+        if not segments:
+            return []
+        if max_workers is None:
+            max_workers = config.OCRD_MAX_SEGMENT_WORKERS
+        # transform all polygons at once:
+        polygons = coordinates_of_segments(segments, parent_image, parent_coords)
+        def extract(segment, segment_polygon):
+            return self._image_from_segment(segment, segment_polygon, parent_image, parent_coords,
+                                            fill=fill, transparency=transparency,
+                                            feature_selector=feature_selector,
+                                            feature_filter=feature_filter, as_array=as_array)
+        if max_workers > 1 and len(segments) > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                return list(executor.map(extract, segments, polygons))
+        return list(map(extract, segments, polygons))
+
+    def _image_from_segment(self, segment, segment_polygon, parent_image, parent_coords,
+                            fill='background', transparency=False,
+                            feature_selector='', feature_filter='', filename='',
+                            as_array=False):
         log = getLogger('ocrd.workspace.image_from_segment')
         # note: We should mask overlapping neighbouring segments here,
         # but finding the right clipping rules can be difficult if operating
@@ -905,6 +1431,7 @@ class Workspace():
         segment_image, segment_coords, segment_xywh = _crop(
             log, "parent image for segment '%s'" % segment.id,
             segment, parent_image, parent_coords,
+            segment_polygon=segment_polygon,
             fill=fill, transparency=transparency)
 
         # Semantics of missing @orientation at region level could be either
@@ -1007,12 +1534,13 @@ class Workspace():
             # FIXME we should enforce consistency here (i.e. split into transposition
             #       and minimal rotation, rotation always reshapes, rescaling never happens)
             # FIXME: inconsistency currently unavoidable with line-level dewarping (which increases height)
+            segment_width, segment_height = _image_size(segment_image)
             if (i == len(alternative_image_features) and
-                not (segment_xywh['w'] - 2 < segment_image.width < segment_xywh['w'] + 2 and
-                     segment_xywh['h'] - 2 < segment_image.height < segment_xywh['h'] + 2)):
+                not (segment_xywh['w'] - 2 < segment_width < segment_xywh['w'] + 2 and
+                     segment_xywh['h'] - 2 < segment_height < segment_xywh['h'] + 2)):
                 log.error('segment "%s" image (%s; %dx%d) has not been cropped properly (%dx%d)',
                           segment.id, segment_coords['features'],
-                          segment_image.width, segment_image.height,
+                          segment_width, segment_height,
                           segment_xywh['w'], segment_xywh['h'])
             name = "%s for segment '%s'" % ("AlternativeImage" if best_image
                                             else "parent image", segment.id)
@@ -1040,6 +1568,10 @@ class Workspace():
             raise Exception('Found no AlternativeImage that satisfies all requirements ' +
                             'filter="%s" in segment "%s"' % (
                                 feature_filter, segment.id))
+        if as_array:
+            return np.asarray(segment_image), segment_coords
+        if isinstance(segment_image, np.ndarray):
+            segment_image = Image.fromarray(segment_image)
         segment_image.format = 'PNG' # workaround for tesserocr#194
         return segment_image, segment_coords
 
@@ -1107,10 +1639,11 @@ class Workspace():
         with pushd_popd(self.directory):
             return self.mets.find_files(*args, **kwargs)
 
-def _crop(log, name, segment, parent_image, parent_coords, op='cropped', **kwargs):
+def _crop(log, name, segment, parent_image, parent_coords, op='cropped', segment_polygon=None, **kwargs):
     segment_coords = parent_coords.copy()
     # get polygon outline of segment relative to parent image:
-    segment_polygon = coordinates_of_segment(segment, parent_image, parent_coords)
+    if segment_polygon is None:
+        segment_polygon = coordinates_of_segment(segment, parent_image, parent_coords)
     # get relative bounding box:
     segment_bbox = bbox_from_polygon(segment_polygon)
     # get size of the segment in the parent image after cropping
@@ -1125,10 +1658,12 @@ def _crop(log, name, segment, parent_image, parent_coords, op='cropped', **kwarg
         elif isinstance(segment, BorderType):
             log.debug("Cropping %s", name)
             segment_coords['features'] += ',' + op
-        # create a mask from the segment polygon:
-        segment_image = image_from_polygon(parent_image, segment_polygon, **kwargs)
-        # crop to bbox:
-        segment_image = crop_image(segment_image, box=segment_bbox)
+        # create a mask from the segment polygon and crop to bbox
+        # (only masking the bbox window of the parent image):
+        if isinstance(parent_image, np.ndarray):
+            segment_image = crop_array_to_polygon(parent_image, segment_polygon, **kwargs)
+        else:
+            segment_image = crop_image_to_polygon(parent_image, segment_polygon, **kwargs)
     else:
         segment_image = parent_image
     # subtract offset from parent in affine coordinate transform:
@@ -1157,7 +1692,10 @@ def _reflect(log, name, orientation, segment_image, segment_coords, segment_xywh
     # transpose, if (still) necessary:
     if not 'rotated-%d' % orientation in segment_coords['features']:
         log.debug("Transposing %s by %d°", name, orientation)
-        segment_image = transpose_image(segment_image, transposition)
+        if isinstance(segment_image, np.ndarray):
+            segment_image = transpose_array(segment_image, transposition)
+        else:
+            segment_image = transpose_image(segment_image, transposition)
         segment_coords['features'] += ',rotated-%d' % orientation
     return segment_image, segment_coords, segment_xywh
 
@@ -1174,7 +1712,10 @@ def _rotate(log, name, skew, segment, segment_image, segment_coords, segment_xyw
     # deskew, if (still) necessary:
     if not 'deskewed' in segment_coords['features']:
         log.debug("Rotating %s by %.2f°", name, skew)
-        segment_image = rotate_image(segment_image, skew, **kwargs)
+        if isinstance(segment_image, np.ndarray):
+            segment_image = rotate_array(segment_image, skew, **kwargs)
+        else:
+            segment_image = rotate_image(segment_image, skew, **kwargs)
         segment_coords['features'] += ',deskewed'
         if (segment and
             (not isinstance(segment, BorderType) or # always crop below page level
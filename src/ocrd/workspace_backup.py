@@ -1,6 +1,6 @@
 from datetime import datetime
-from os import makedirs
-from os.path import join, basename, getsize, abspath
+from os import makedirs, unlink
+from os.path import join, basename, getsize, abspath, exists
 from glob import glob
 from shutil import copy
 import hashlib
@@ -65,14 +65,20 @@ class WorkspaceBackupManager():
         dest = self.workspace.mets_target
         log.debug('cp "%s" "%s"', src, dest)
         copy(src, dest)
+        if exists(self.workspace.mets_journal):
+            unlink(self.workspace.mets_journal)
         self.workspace.reload_mets()
 
-    def add(self):
+    def add(self, mets_str=None):
         """
         Create a backup in <self.backup_directory>
+
+        Args:
+            mets_str (bytes): serialised METS to back up (instead of the current state of the workspace's METS)
         """
         log = getLogger('ocrd.workspace_backup.add')
-        mets_str = self.workspace.mets.to_xml()
+        if mets_str is None:
+            mets_str = self.workspace.mets.to_xml()
         chksum = _chksum(mets_str)
         backups = self.list()
         if backups and backups[0].chksum == chksum:
@@ -83,8 +89,8 @@ class WorkspaceBackupManager():
             mets_file = join(d, DEFAULT_METS_BASENAME)
             log.info("Backing up to %s" % mets_file)
             makedirs(d)
-            with atomic_write(mets_file) as f:
-                f.write(mets_str.decode('utf-8'))
+            with atomic_write(mets_file, mode='wb') as f:
+                f.write(mets_str)
         return chksum
 
     def list(self):
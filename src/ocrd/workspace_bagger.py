@@ -21,8 +21,7 @@ from ocrd_utils import (
     dist_version,
 )
 from ocrd_validators.constants import BAGIT_TXT, TMP_BAGIT_PREFIX, OCRD_BAGIT_PROFILE_URL
-from ocrd_modelfactory import page_from_file
-from ocrd_models.ocrd_page import to_xml
+from ocrd_models import OcrdPageLite
 
 from .workspace import Workspace
 
@@ -96,17 +95,7 @@ class WorkspaceBagger():
         bag_workspace = Workspace(self.resolver, directory=join(bagdir, 'data'), mets_basename=ocrd_mets)
         with pushd_popd(bag_workspace.directory):
             for page_file in bag_workspace.mets.find_files(mimetype=MIMETYPE_PAGE):
-                pcgts = page_from_file(page_file)
-                changed = False
-                for old, new in changed_local_filenames.items():
-                    if pcgts.get_Page().imageFilename == old:
-                        pcgts.get_Page().imageFilename = new
-                        changed = True
-                    # TODO replace AlternativeImage, recursively...
-                if changed:
-                    with open(page_file.local_filename, 'w') as out:
-                        out.write(to_xml(pcgts))
-                    #  log.info("Replace %s -> %s in %s" % (old, new, page_file))
+                OcrdPageLite(page_file.local_filename).replace_filenames(changed_local_filenames)
 
             with pushd_popd(bagdir):
                 total_bytes, total_files = make_manifests('data', processes, algorithms=['sha512'])
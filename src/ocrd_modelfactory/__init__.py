@@ -3,7 +3,11 @@
 Factory methods to create models for data, files, URLs.
 
 """
+from copy import copy
 from datetime import datetime
+from functools import lru_cache
+from os import stat
+from os.path import abspath
 from pathlib import Path
 from typing import Tuple, Union
 from yaml import safe_load, safe_dump
@@ -11,7 +15,7 @@ from yaml import safe_load, safe_dump
 from PIL import Image
 from lxml import etree as ET
 
-from ocrd_utils import VERSION, MIMETYPE_PAGE, guess_media_type
+from ocrd_utils import VERSION, MIMETYPE_PAGE, guess_media_type, config
 from ocrd_models import OcrdExif, OcrdFile, ClientSideOcrdFile
 from ocrd_models.ocrd_page import (
     PcGtsType, PageType, MetadataType,
@@ -25,20 +29,39 @@ __all__ = [
 ]
 
 
-def exif_from_filename(image_filename):
+def exif_from_filename(image_filename, resolution=None):
     """
     Create :py:class:`~ocrd_models.ocrd_exif.OcrdExif`
     by opening an image file with PIL and reading its metadata.
 
     Arguments:
         image_filename (str): Local image path name (relative to workspace).
+
+    Keyword Args:
+        resolution (tuple): pixel density if already known, cf. \
+            :py:func:`~ocrd_models.ocrd_exif.identify_resolutions`
     """
     if image_filename is None:
         raise Exception("Must pass 'image_filename' to 'exif_from_filename'")
+    if resolution:
+        return _exif_from_file(image_filename, resolution=resolution)
+    # the cache key changes whenever the file is replaced or modified
+    st = stat(image_filename)
+    return copy(_cached_exif_from_file(abspath(image_filename), st.st_ino, st.st_mtime_ns, st.st_size))
+
+def _exif_from_file(image_filename, resolution=None):
     with Image.open(image_filename) as pil_img:
-        ocrd_exif = OcrdExif(pil_img)
+        ocrd_exif = OcrdExif(pil_img, resolution=resolution)
     return ocrd_exif
 
+@lru_cache(maxsize=config.OCRD_MAX_EXIF_CACHE)
+def _cached_exif_from_file(image_path, inode, mtime, size):
+    return _exif_from_file(image_path)
+
+# hit/miss statistics and invalidation like for lru_cache
+exif_from_filename.cache_info = _cached_exif_from_file.cache_info
+exif_from_filename.cache_clear = _cached_exif_from_file.cache_clear
+
 def page_from_image(input_file, with_tree=False):
     """
     Create :py:class:`~ocrd_models.ocrd_page.OcrdPage`
@@ -8,6 +8,52 @@ from subprocess import run, PIPE
 from distutils.spawn import find_executable as which
 from ocrd_utils import getLogger
 
+__all__ = ['OcrdExif', 'identify_resolutions']
+
+IDENTIFY_FORMAT = r'%[resolution.x] %[resolution.y] %U'
+IDENTIFY_BATCH_SIZE = 500
+
+def _parse_identify_resolution(tokens):
+    xResolution = max(int(float(tokens[0])), 1)
+    yResolution = max(int(float(tokens[1])), 1)
+    resolutionUnit = 'inches' if tokens[2] == 'undefined' else \
+                     'cm' if tokens[2] == 'PixelsPerCentimeter' else \
+                     'inches'
+    return xResolution, yResolution, resolutionUnit
+
+def identify_resolutions(filenames):
+    """
+    Determine the pixel density of many image files at once, spawning a single
+    ImageMagick ``identify`` process per batch of files instead of one per file.
+
+    Arguments:
+        filenames (list of str): Local image paths
+
+    Returns:
+        dict mapping each filename that could be probed to a tuple of
+        ``(xResolution, yResolution, resolutionUnit)``. Files that ``identify``
+        failed on (or all files, if ``identify`` is not available) are missing.
+    """
+    ret = {}
+    filenames = [str(filename) for filename in filenames]
+    if not filenames or not which('identify'):
+        return ret
+    for start in range(0, len(filenames), IDENTIFY_BATCH_SIZE):
+        batch = filenames[start:start + IDENTIFY_BATCH_SIZE]
+        # only the first frame of each file, so there is exactly one line per file
+        proc = run(['identify', '-format', '%i\t' + IDENTIFY_FORMAT + '\n'] + ['%s[0]' % filename for filename in batch],
+                   check=False, stderr=PIPE, stdout=PIPE)
+        if proc.returncode:
+            getLogger('ocrd.exif').warning("identify exited with non-zero %s: %s",
+                                           proc.returncode, proc.stderr.decode('utf-8'))
+        for line in proc.stdout.decode('utf-8').splitlines():
+            filename, _, tokens = line.rpartition('\t')
+            if filename.endswith('[0]'):
+                filename = filename[:-3]
+            if filename in batch:
+                ret[filename] = _parse_identify_resolution(tokens.split(' ', 3))
+    return ret
+
 class OcrdExif():
     """Represents technical image metadata.
 
@@ -28,31 +74,81 @@ class OcrdExif():
         resolutionUnit (str): unit of measurement (either ``inches`` or ``cm``)
     """
 
-    def __init__(self, img):
+    def __init__(self, img, resolution=None):
         """
         Arguments:
             img (`PIL.Image`): PIL image technical metadata is about.
+
+        Keyword Args:
+            resolution (tuple): ``(xResolution, yResolution, resolutionUnit)``
+                if already known (e.g. from :py:func:`identify_resolutions`)
         """
         #  print(img.__dict__)
         self.width = img.width
         self.height = img.height
         self.photometricInterpretation = img.mode
         self.n_frames = img.n_frames if 'n_frames' in img.__dict__ else 1
-        if which('identify'):
+        if resolution:
+            for prop in ['compression', 'photometric_interpretation']:
+                setattr(self, prop, img.info[prop] if prop in img.info else None)
+            self.xResolution, self.yResolution, self.resolutionUnit = resolution
+            self.resolution = round(sqrt(self.xResolution * self.yResolution))
+        elif self.run_header(img):
+            pass
+        elif which('identify'):
             self.run_identify(img)
         else:
             getLogger('ocrd.exif').warning("ImageMagick 'identify' not available, Consider installing ImageMagick for more robust pixel density estimation")
             self.run_pil(img)
 
+    def run_header(self, img):
+        """
+        Determine pixel density from the TIFF, PNG or JPEG header tags
+        already parsed by PIL, with the same semantics as ``identify``
+        (i.e. in the units stored in the file), without spawning a process.
+
+        Returns:
+            whether the image format was supported
+        """
+        if img.format == 'TIFF':
+            tags = img.tag_v2
+            unit = tags.get(296, 2)
+            xres, yres = tags.get(282), tags.get(283)
+        elif img.format == 'PNG':
+            if 'dpi' in img.info:
+                # pHYs in pixels per meter (converted to DPI by PIL)
+                unit = 3
+                xres, yres = (round(dpi / 0.0254) / 100 for dpi in img.info['dpi'])
+            else:
+                unit = 1
+                xres, yres = img.info.get('aspect', (None, None))
+        elif img.format in ('JPEG', 'MPO'):
+            if 'jfif_density' in img.info:
+                unit = {0: 1, 1: 2, 2: 3}.get(img.info.get('jfif_unit'), 1)
+                xres, yres = img.info['jfif_density']
+            else:
+                tags = img.getexif()
+                unit = tags.get(296, 2)
+                xres, yres = tags.get(282), tags.get(283)
+        else:
+            return False
+        for prop in ['compression', 'photometric_interpretation']:
+            setattr(self, prop, img.info[prop] if prop in img.info else None)
+        self.xResolution = max(int(float(xres or 0)), 1)
+        self.yResolution = max(int(float(yres or 0)), 1)
+        self.resolutionUnit = 'cm' if unit == 3 else 'inches'
+        self.resolution = round(sqrt(self.xResolution * self.yResolution))
+        return True
+
     def run_identify(self, img):
         for prop in ['compression', 'photometric_interpretation']:
             setattr(self, prop, img.info[prop] if prop in img.info else None)
         if img.filename:
-            ret = run(['identify', '-format', r'%[resolution.x] %[resolution.y] %U', img.filename], check=False, stderr=PIPE, stdout=PIPE)
+            ret = run(['identify', '-format', IDENTIFY_FORMAT, img.filename], check=False, stderr=PIPE, stdout=PIPE)
         else:
             with BytesIO() as bio:
                 img.save(bio, format=img.format)
-                ret = run(['identify', '-format', r'%[resolution.x] %[resolution.y] %U', '/dev/stdin'], check=False, stderr=PIPE, stdout=PIPE, input=bio.getvalue())
+                ret = run(['identify', '-format', IDENTIFY_FORMAT, '/dev/stdin'], check=False, stderr=PIPE, stdout=PIPE, input=bio.getvalue())
         if ret.returncode:
             stderr = ret.stderr.decode('utf-8')
             if 'no decode delegate for this image format' in stderr:
@@ -63,11 +159,7 @@ class OcrdExif():
             self.resolutionUnit = 'inches'
         else:
             tokens = ret.stdout.decode('utf-8').split(' ', 3)
-            self.xResolution = max(int(float(tokens[0])), 1)
-            self.yResolution = max(int(float(tokens[1])), 1)
-            self.resolutionUnit = 'inches' if tokens[2] == 'undefined' else \
-                                  'cm' if tokens[2] == 'PixelsPerCentimeter' else \
-                                  'inches'
+            self.xResolution, self.yResolution, self.resolutionUnit = _parse_identify_resolution(tokens)
         self.resolution = round(sqrt(self.xResolution * self.yResolution))
 
     def run_pil(self, img):
@@ -96,6 +188,21 @@ class OcrdExif():
         #  print('format=%s type=%s' % (img.format, type(self.xResolution))
         self.resolution = round(sqrt(self.xResolution * self.yResolution))
 
+    @classmethod
+    def from_dict(cls, props):
+        """
+        Create an instance from the properties of :py:meth:`to_dict` without an image.
+        """
+        ret = cls.__new__(cls)
+        ret.__dict__.update(props)
+        return ret
+
+    def to_dict(self):
+        """
+        Serialize all properties as a (JSON-serializable) dict.
+        """
+        return dict(self.__dict__)
+
     def to_xml(self):
         """
         Serialize all properties as XML string.
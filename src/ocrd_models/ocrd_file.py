@@ -110,6 +110,7 @@ class OcrdFile():
             raise Exception("OcrdFile %s has no member 'mets' pointing to parent OcrdMets" % self)
         old_id = self.ID
         self._el.set('ID', ID)
+        self._changed(old_ID=old_id)
         # also update the references in the physical structmap
         for pageId in self.mets.remove_physical_page_fptr(fileId=old_id):
             self.pageId = pageId
@@ -156,6 +157,7 @@ class OcrdFile():
         if mimetype is None:
             return
         self._el.set('MIMETYPE', mimetype)
+        self._changed()
 
     @property
     def fileGrp(self) -> str:
@@ -186,11 +188,13 @@ class OcrdFile():
         if url is None:
             if el_FLocat:
                 self._el.remove(el_FLocat)
+                self._changed()
             return
         if el_FLocat is None:
             el_FLocat = ET.SubElement(self._el, TAG_METS_FLOCAT)
         el_FLocat.set("{%s}href" % NS["xlink"], url)
         el_FLocat.set("LOCTYPE", "URL")
+        self._changed()
 
     @property
     def local_filename(self) -> Optional[str]:
@@ -211,6 +215,7 @@ class OcrdFile():
         if not fname:
             if el_FLocat is not None:
                 self._el.remove(el_FLocat)
+                self._changed()
             return
         else:
             fname = str(fname)
@@ -219,6 +224,14 @@ class OcrdFile():
         el_FLocat.set("{%s}href" % NS["xlink"], fname)
         el_FLocat.set("LOCTYPE", "OTHER")
         el_FLocat.set("OTHERLOCTYPE", "FILE")
+        self._changed()
+
+    def _changed(self, old_ID : Optional[str] = None) -> None:
+        """
+        Notify the containing :py:class:`ocrd_models.ocrd_mets.OcrdMets` about changed attributes (to update its index).
+        """
+        if self.mets is not None and hasattr(self.mets, '_file_changed'):
+            self.mets._file_changed(self._el, old_ID=old_ID)
 
 
 class ClientSideOcrdFile:
@@ -1,14 +1,19 @@
 """
 API to METS
 """
+from collections.abc import Iterator as _Iterator
 from datetime import datetime
+from functools import wraps
+from itertools import count
+from os.path import exists
+from pathlib import PurePath
 import re
+from threading import Lock
 from lxml import etree as ET
-from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
 
 from ocrd_utils import (
     getLogger,
-    generate_range,
     VERSION,
     REGEX_PREFIX,
     REGEX_FILE_ID
@@ -35,9 +40,51 @@ from .constants import (
 from .ocrd_xml_base import OcrdXmlDocument, ET      # type: ignore
 from .ocrd_file import OcrdFile
 from .ocrd_agent import OcrdAgent
+from .ocrd_mets_index import OcrdMetsFileIndex, flocat_hrefs
+from .ocrd_mets_selector import FileSelector, PageSelector
 
 REGEX_PREFIX_LEN = len(REGEX_PREFIX)
 
+def _journal_value(value : Any) -> Any:
+    """
+    Convert an argument of a journaled method call to JSON-serialisable form
+    """
+    if isinstance(value, OcrdFile):
+        return {'__OcrdFile__': value.ID}
+    if isinstance(value, (list, tuple)):
+        return [_journal_value(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _journal_value(v) for k, v in value.items()}
+    if isinstance(value, PurePath):
+        return str(value)
+    return value
+
+def _journaled(method : Callable) -> Callable:
+    """
+    Record top-level calls of the decorated method in the journal of the :py:class:`OcrdMets` (if started)
+    """
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self._journal is None or self._journal_depth:
+            return method(self, *args, **kwargs)
+        # consume iterators only once
+        args = tuple(list(arg) if isinstance(arg, _Iterator) else arg for arg in args)
+        kwargs = {k: list(v) if isinstance(v, _Iterator) else v for k, v in kwargs.items()}
+        entry = [method.__name__, _journal_value(args), _journal_value(kwargs)]
+        self._journal_depth += 1
+        try:
+            ret = method(self, *args, **kwargs)
+        except BaseException:
+            # the METS may have been changed partially, so it cannot be reproduced anymore
+            self._journal = None
+            raise
+        finally:
+            self._journal_depth -= 1
+        if self._journal is not None:
+            self._journal.append(entry)
+        return ret
+    return wrapper
+
 class OcrdMets(OcrdXmlDocument):
     """
     API to a single METS file
@@ -59,9 +106,37 @@ class OcrdMets(OcrdXmlDocument):
     # The inner dictionary's Key: 'fptr.FILEID'
     # The inner dictionary's Value: a 'fptr' object at some memory location
     _fptr_cache : Dict[str, Dict[str, ET._Element]]
+    # Reverse cache for the file pointers (mets:fptr) - two nested dictionaries
+    # The outer dictionary's Key: 'fptr.FILEID'
+    # The outer dictionary's Value: Inner dictionary
+    # The inner dictionary's Key: 'div.ID'
+    # The inner dictionary's Value: a 'fptr' object at some memory location
+    _fptr_by_file_cache : Dict[str, Dict[str, ET._Element]]
+    # Cache for the file locations (mets:FLocat) - two nested dictionaries
+    # The outer dictionary's Key: 'url' or 'local_filename'
+    # The outer dictionary's Value: Inner dictionary
+    # The inner dictionary's Key: 'FLocat.href'
+    # The inner dictionary's Value: the 'file' objects with that location (as ordered keys)
+    _flocat_cache : Dict[str, Dict[str, Dict[ET._Element, None]]]
+    # The location of each cached file (mets:file) - the dictionary's Value: (url, local_filename)
+    _flocat_by_file_cache : Dict[ET._Element, Tuple[Optional[str], Optional[str]]]
+    # Insertion order of each cached file (mets:file), to sort files found by page like the file cache
+    _file_order : Dict[ET._Element, int]
+    # Columnar index of the files (mets:file) for find_files (if index is enabled)
+    _file_index : Optional[OcrdMetsFileIndex]
+    _index_flag : bool = False
+    # Mutations since start_journal as [method name, args, kwargs] (if recording)
+    _journal : Optional[List[List[Any]]] = None
+    # Nesting depth of journaled method calls (only top-level calls are recorded)
+    _journal_depth : int = 0
+    # Methods that may be called when replaying a journal
+    _JOURNAL_METHODS = ['add_agent', 'add_file_group', 'rename_file_group', 'remove_file_group',
+                        'add_file', 'add_files', 'remove_file', 'remove_one_file', 'remove_files',
+                        'set_physical_page_for_file', 'update_physical_page_attributes',
+                        'remove_physical_page', 'remove_physical_page_fptr', '_update_file']
 
     @staticmethod
-    def empty_mets(now : Optional[str] = None, cache_flag : bool = False):
+    def empty_mets(now : Optional[str] = None, cache_flag : bool = False, index_flag : bool = False):
         """
         Create an empty METS file from bundled template.
         """
@@ -70,12 +145,15 @@ class OcrdMets(OcrdXmlDocument):
         tpl = METS_XML_EMPTY
         tpl = tpl.replace('{{ VERSION }}', VERSION)
         tpl = tpl.replace('{{ NOW }}', '%s' % now)
-        return OcrdMets(content=tpl.encode('utf-8'), cache_flag=cache_flag)
+        return OcrdMets(content=tpl.encode('utf-8'), cache_flag=cache_flag, index_flag=index_flag)
 
-    def __init__(self, **kwargs) -> None:
+    def __init__(self, index_flag : bool = False, **kwargs) -> None:
         """
+        Keyword Args:
+            index_flag (bool): Whether to search files via a columnar index (only if caching is enabled)
         """
         super(OcrdMets, self).__init__(**kwargs)
+        self._index_flag = index_flag
 
         # XXX If the environment variable OCRD_METS_CACHING is set to "true",
         # then enable caching, if "false", disable caching, overriding the
@@ -84,6 +162,8 @@ class OcrdMets(OcrdXmlDocument):
             getLogger('ocrd.models.ocrd_mets').debug('METS Caching %s because OCRD_METS_CACHING is %s',
                     'enabled' if config.OCRD_METS_CACHING else 'disabled', config.raw_value('OCRD_METS_CACHING'))
             self._cache_flag = config.OCRD_METS_CACHING
+        if config.is_set('OCRD_METS_INDEX'):
+            self._index_flag = config.OCRD_METS_INDEX
 
 
         # If cache is enabled
@@ -119,9 +199,8 @@ class OcrdMets(OcrdXmlDocument):
             self._file_cache[fileGrp_use] = {}
 
             for el_file in el_fileGrp:
-                file_id = el_file.get('ID')
-                self._file_cache[fileGrp_use].update({file_id: el_file})
-                # log.info("File added to the cache: %s" % file_id)
+                self._cache_file(el_file)
+                # log.info("File added to the cache: %s" % el_file.get('ID'))
 
         # Fill with pages
         el_div_list = tree_root.findall(".//mets:div[@TYPE='page']", NS)
@@ -143,6 +222,7 @@ class OcrdMets(OcrdXmlDocument):
 
             for el_fptr in el_div:
                 self._fptr_cache[div_id].update({el_fptr.get('FILEID'): el_fptr})
+                self._fptr_by_file_cache.setdefault(el_fptr.get('FILEID'), {})[div_id] = el_fptr
                 # log.info("Fptr added to the cache: %s" % el_fptr.get('FILEID'))
 
         # log.info("Len of page_cache: %s" % len(self._page_cache[METS_PAGE_DIV_ATTRIBUTE.ID]))
@@ -153,6 +233,49 @@ class OcrdMets(OcrdXmlDocument):
         # NOTE we can only guarantee uniqueness for @ID and @ORDER
         self._page_cache = {k : {} for k in METS_PAGE_DIV_ATTRIBUTE}
         self._fptr_cache = {}
+        self._fptr_by_file_cache = {}
+        self._flocat_cache = {'url': {}, 'local_filename': {}}
+        self._flocat_by_file_cache = {}
+        self._file_order = {}
+        self._file_counter = count()
+        self._file_index = OcrdMetsFileIndex() if self._index_flag else None
+
+    def _cache_file(self, el_file : ET._Element) -> None:
+        """
+        Add a ``mets:file`` to the file cache, location cache and index
+        """
+        self._file_cache[el_file.getparent().get('USE')][el_file.get('ID')] = el_file
+        self._file_order[el_file] = next(self._file_counter)
+        self._cache_flocat(el_file)
+        if self._file_index is not None:
+            self._file_index.add(el_file)
+
+    def _uncache_file(self, el_file : ET._Element) -> None:
+        """
+        Remove a ``mets:file`` from the file cache, location cache and index
+        """
+        del self._file_cache[el_file.getparent().get('USE')][el_file.get('ID')]
+        self._file_order.pop(el_file, None)
+        self._uncache_flocat(el_file)
+        if self._file_index is not None:
+            self._file_index.remove(el_file)
+
+    def _cache_flocat(self, el_file : ET._Element) -> None:
+        self._uncache_flocat(el_file)
+        hrefs = flocat_hrefs(el_file)
+        self._flocat_by_file_cache[el_file] = hrefs
+        for kind, href in zip(('url', 'local_filename'), hrefs):
+            if href is not None:
+                self._flocat_cache[kind].setdefault(href, {})[el_file] = None
+
+    def _uncache_flocat(self, el_file : ET._Element) -> None:
+        hrefs = self._flocat_by_file_cache.pop(el_file, (None, None))
+        for kind, href in zip(('url', 'local_filename'), hrefs):
+            if href is not None:
+                el_files = self._flocat_cache[kind][href]
+                del el_files[el_file]
+                if not el_files:
+                    del self._flocat_cache[kind][href]
 
     def _refresh_caches(self) -> None:
         if self._cache_flag:
@@ -174,6 +297,7 @@ class OcrdMets(OcrdXmlDocument):
                 return found.text
 
     @unique_identifier.setter
+    @_journaled
     def unique_identifier(self, purl : str) -> None:
         """
         Set the unique identifier by looking through ``mods:identifier``
@@ -198,6 +322,7 @@ class OcrdMets(OcrdXmlDocument):
         """
         return [OcrdAgent(el_agent) for el_agent in self._tree.getroot().findall('mets:metsHdr/mets:agent', NS)]
 
+    @_journaled
     def add_agent(self, *args, **kwargs) -> OcrdAgent:
         """
         Add an :py:class:`ocrd_models.ocrd_agent.OcrdAgent` to the list of agents in the ``metsHdr``.
@@ -246,6 +371,7 @@ class OcrdMets(OcrdXmlDocument):
         local_only : bool = False,
         include_fileGrp : Optional[List[str]] = None,
         exclude_fileGrp : Optional[List[str]] = None,
+        selector : Optional[FileSelector] = None,
     ) -> Iterator[OcrdFile]:
         """
         Search ``mets:file`` entries in this METS document and yield results.
@@ -269,38 +395,74 @@ class OcrdMets(OcrdXmlDocument):
             local (boolean) : Whether to restrict results to local files in the filesystem
             include_fileGrp (list[str]) : List of allowed file groups
             exclude_fileGrp (list[str]) : List of disallowd file groups
+            selector (:py:class:`ocrd_models.ocrd_mets_selector.FileSelector`) : Precompiled
+                :py:attr:`ID`, :py:attr:`fileGrp`, :py:attr:`pageId`, :py:attr:`mimetype`,
+                :py:attr:`url` and :py:attr:`local_filename` (instead of passing them individually)
         Yields:
             :py:class:`ocrd_models:ocrd_file:OcrdFile` instantiations
         """
-        pageId_list = []
-        if pageId:
+        if selector is None:
+            selector = FileSelector.compile(ID=ID, fileGrp=fileGrp, pageId=pageId, mimetype=mimetype,
+                                            url=url, local_filename=local_filename)
+        ID, fileGrp, mimetype = selector.ID, selector.fileGrp, selector.mimetype
+        url, local_filename = selector.url, selector.local_filename
+        pageId = selector.pageId
+        # @ID of all files on the requested pages
+        fileIds = None
+        if pageId is not None:
+            fileIds = set()
+        if pageId and pageId.expression:
             # returns divs instead of strings of ids
             physical_pages = self.get_physical_pages(for_pageIds=pageId, return_divs=True)
             for div in physical_pages:
                 if self._cache_flag:
-                    pageId_list += self._fptr_cache[div.get('ID')]
+                    fileIds.update(self._fptr_cache[div.get('ID')])
                 else:
-                    pageId_list += [fptr.get('FILEID') for fptr in div.findall('mets:fptr', NS)]
-
-        if ID and ID.startswith(REGEX_PREFIX):
-            ID = re.compile(ID[REGEX_PREFIX_LEN:])
-        if fileGrp and fileGrp.startswith(REGEX_PREFIX):
-            fileGrp = re.compile(fileGrp[REGEX_PREFIX_LEN:])
-        if mimetype and mimetype.startswith(REGEX_PREFIX):
-            mimetype = re.compile(mimetype[REGEX_PREFIX_LEN:])
-        if url and url.startswith(REGEX_PREFIX):
-            url = re.compile(url[REGEX_PREFIX_LEN:])
+                    fileIds.update(fptr.get('FILEID') for fptr in div.findall('mets:fptr', NS))
+
+        if self._cache_flag and self._file_index is not None:
+            for cand in self._file_index.find(
+                    list(self._file_cache), ID=ID, fileGrp=fileGrp, mimetype=mimetype, url=url,
+                    local_filename=local_filename, local_only=local_only,
+                    fileIds=fileIds,
+                    include_fileGrp=include_fileGrp, exclude_fileGrp=exclude_fileGrp):
+                yield OcrdFile(cand, mets=self)
+            return
 
         candidates = []
-        if self._cache_flag:
+        if self._cache_flag and (isinstance(url, str) or isinstance(local_filename, str)):
+            # literal locations are looked up directly
+            if isinstance(url, str):
+                candidates = list(self._flocat_cache['url'].get(url, {}))
+            if isinstance(local_filename, str):
+                by_local_filename = self._flocat_cache['local_filename'].get(local_filename, {})
+                candidates = [el for el in candidates if el in by_local_filename] \
+                    if isinstance(url, str) else list(by_local_filename)
+            if fileGrp:
+                candidates = [el for el in candidates if
+                              (fileGrp == el.getparent().get('USE') if isinstance(fileGrp, str)
+                               else fileGrp.fullmatch(el.getparent().get('USE')))]
+            if len(candidates) > 1:
+                # same order as the file cache (by fileGrp, then by insertion into the fileGrp)
+                fileGrp_order = {fileGrp_: n for n, fileGrp_ in enumerate(list(self._file_cache))}
+                candidates.sort(key=lambda el: (fileGrp_order[el.getparent().get('USE')], self._file_order[el]))
+        elif self._cache_flag:
             if fileGrp:
                 if isinstance(fileGrp, str):
-                    candidates += self._file_cache.get(fileGrp, {}).values()
+                    id_to_files = [self._file_cache.get(fileGrp, {})]
                 else:
-                    candidates = [x for fileGrp_needle, el_file_list in self._file_cache.items() if
-                                  fileGrp.match(fileGrp_needle) for x in el_file_list.values()]
+                    # snapshot, since LazyOcrdMets may add fileGrps concurrently
+                    id_to_files = [el_file_list for fileGrp_needle, el_file_list in list(self._file_cache.items()) if
+                                   fileGrp.match(fileGrp_needle)]
             else:
-                candidates = [el_file for id_to_file in self._file_cache.values() for el_file in id_to_file.values()]
+                id_to_files = list(self._file_cache.values())
+            for id_to_file in id_to_files:
+                if fileIds is not None and len(fileIds) < len(id_to_file):
+                    # visit only the files of the pages (in the same order as the file cache)
+                    candidates += sorted((id_to_file[ID_] for ID_ in fileIds if ID_ in id_to_file),
+                                         key=self._file_order.__getitem__)
+                else:
+                    candidates += id_to_file.values()
         else:
             candidates = self._tree.getroot().xpath('//mets:file', namespaces=NS)
 
@@ -311,7 +473,7 @@ class OcrdMets(OcrdXmlDocument):
                 else:
                     if not ID.fullmatch(cand.get('ID')): continue
 
-            if pageId is not None and cand.get('ID') not in pageId_list:
+            if fileIds is not None and cand.get('ID') not in fileIds:
                 continue
 
             if not self._cache_flag and fileGrp:
@@ -362,6 +524,7 @@ class OcrdMets(OcrdXmlDocument):
 
             yield ret
 
+    @_journaled
     def add_file_group(self, fileGrp: str) -> ET._Element:
         """
         Add a new ``mets:fileGrp``.
@@ -384,6 +547,7 @@ class OcrdMets(OcrdXmlDocument):
 
         return el_fileGrp
 
+    @_journaled
     def rename_file_group(self, old: str, new: str) -> None:
         """
         Rename a ``mets:fileGrp`` by changing the ``@USE`` from :py:attr:`old` to :py:attr:`new`.
@@ -395,7 +559,105 @@ class OcrdMets(OcrdXmlDocument):
 
         if self._cache_flag:
             self._file_cache[new] = self._file_cache.pop(old)
+            if self._file_index is not None:
+                self._file_index.rename_file_group(old, new)
+
+    def _file_changed(self, el_file : ET._Element, old_ID : Optional[str] = None) -> None:
+        """
+        Update the location cache and index after attributes of a ``mets:file`` were changed via :py:class:`OcrdFile`
+        (and record the change in the journal, unless it is part of a journaled method call)
+        """
+        if self._journal is not None and not self._journal_depth and el_file.getparent() is not None:
+            ocrd_file = OcrdFile(el_file, mets=self)
+            self._journal.append(['_update_file', [ocrd_file.fileGrp, ocrd_file.ID], {
+                'old_ID': old_ID, 'mimetype': ocrd_file.mimetype,
+                'url': ocrd_file.url or None, 'local_filename': ocrd_file.local_filename}])
+        if self._cache_flag:
+            if el_file in self._flocat_by_file_cache:
+                el_files = self._file_cache[el_file.getparent().get('USE')]
+                if el_files.get(el_file.get('ID')) is not el_file:
+                    # @ID changed
+                    for ID in [ID for ID, el in el_files.items() if el is el_file]:
+                        del el_files[ID]
+                    el_files[el_file.get('ID')] = el_file
+                    self._file_order[el_file] = next(self._file_counter)
+                self._cache_flocat(el_file)
+            if self._file_index is not None:
+                self._file_index.update(el_file)
+
+    def _update_file(self, fileGrp : str, ID : str, old_ID : Optional[str] = None, mimetype : Optional[str] = None,
+                     url : Optional[str] = None, local_filename : Optional[str] = None) -> None:
+        """
+        Set the attributes of a ``mets:file`` as recorded for changes via :py:class:`OcrdFile` in the journal.
+        """
+        ocrd_file = next(self.find_files(ID=old_ID or ID, fileGrp=fileGrp), None)
+        if not ocrd_file:
+            raise FileNotFoundError("File not found: %s (fileGrp=%s)" % (old_ID or ID, fileGrp))
+        if old_ID and old_ID != ID:
+            # the physical page refs are updated by separate journal entries
+            ocrd_file._el.set('ID', ID)
+            self._file_changed(ocrd_file._el, old_ID=old_ID)
+        ocrd_file.mimetype = mimetype
+        ocrd_file.url = url
+        ocrd_file.local_filename = local_filename
+
+    def start_journal(self) -> None:
+        """
+        Start recording all changes to the METS, so they can be persisted incrementally
+        via :py:meth:`pop_journal` and reproduced by :py:meth:`replay_journal`
+        (instead of serialising the complete document).
+        """
+        self._journal = []
+
+    def stop_journal(self) -> None:
+        """
+        Stop recording changes to the METS.
+        """
+        self._journal = None
+
+    def pop_journal(self) -> Optional[List[List[Any]]]:
+        """
+        Get the changes recorded since :py:meth:`start_journal` (or the last call) and start over.
 
+        Returns:
+            list of JSON-serialisable entries, or ``None`` if not recording or some change
+            could not be recorded (so the complete document must be persisted instead)
+        """
+        entries = self._journal
+        if entries is not None:
+            self._journal = []
+        return entries
+
+    def replay_journal(self, entries : Iterable[List[Any]]) -> None:
+        """
+        Apply changes recorded by :py:meth:`pop_journal` (e.g. to the METS they were originally made on).
+        """
+        journal, self._journal = self._journal, None
+        try:
+            for name, args, kwargs in entries:
+                args, kwargs = self._resolve_journal_value(args), self._resolve_journal_value(kwargs)
+                if isinstance(getattr(type(self), name, None), property):
+                    setattr(self, name, *args)
+                elif name in self._JOURNAL_METHODS:
+                    getattr(self, name)(*args, **kwargs)
+                else:
+                    raise ValueError("Cannot replay unknown journal entry '%s'" % name)
+        finally:
+            self._journal = journal
+
+    def _resolve_journal_value(self, value : Any) -> Any:
+        if isinstance(value, list):
+            return [self._resolve_journal_value(v) for v in value]
+        if isinstance(value, dict):
+            if '__OcrdFile__' in value:
+                ocrd_file = next(self.find_files(ID=value['__OcrdFile__']), None)
+                if not ocrd_file:
+                    raise FileNotFoundError("File not found: %s" % value['__OcrdFile__'])
+                return ocrd_file
+            return {k: self._resolve_journal_value(v) for k, v in value.items()}
+        return value
+
+    @_journaled
     def remove_file_group(self, USE: str, recursive : bool = False, force : bool = False) -> None:
         """
         Remove a ``mets:fileGrp`` (single fixed ``@USE`` or multiple regex ``@USE``)
@@ -447,6 +709,7 @@ class OcrdMets(OcrdXmlDocument):
 
         el_fileGrp.getparent().remove(el_fileGrp)
 
+    @_journaled
     def add_file(self, fileGrp : str, mimetype : Optional[str] = None, url : Optional[str] = None, 
                  ID : Optional[str] = None, pageId : Optional[str] = None, force : bool = False, 
                  local_filename : Optional[str] = None, ignore : bool = False, **kwargs) -> OcrdFile:
@@ -463,29 +726,14 @@ class OcrdMets(OcrdXmlDocument):
             ignore (boolean): Do not look for existing files at all. Shift responsibility for preventing errors from duplicate ID to the user.
             local_filename (string):
         """
-        if not ID:
-            raise ValueError("Must set ID of the mets:file")
-        if not fileGrp:
-            raise ValueError("Must set fileGrp of the mets:file")
-        if not REGEX_FILE_ID.fullmatch(ID):
-            raise ValueError("Invalid syntax for mets:file/@ID %s (not an xs:ID)" % ID)
-        if not REGEX_FILE_ID.fullmatch(fileGrp):
-            raise ValueError("Invalid syntax for mets:fileGrp/@USE %s (not an xs:ID)" % fileGrp)
+        self._validate_file_args(fileGrp, ID)
 
         el_fileGrp = self.add_file_group(fileGrp)
         if not ignore:
             mets_file = next(self.find_files(ID=ID, fileGrp=fileGrp), None)
             if mets_file:
-                if mets_file.fileGrp == fileGrp and \
-                        mets_file.pageId == pageId and \
-                        mets_file.mimetype == mimetype:
-                    if not force:
-                        raise FileExistsError(
-                            f"A file with ID=={ID} already exists {mets_file} and neither force nor ignore are set")
-                    self.remove_file(ID=ID, fileGrp=fileGrp)
-                else:
-                    raise FileExistsError(
-                        f"A file with ID=={ID} already exists {mets_file} but unrelated - cannot mitigate")
+                self._check_existing_file(mets_file, fileGrp, pageId, mimetype, force)
+                self.remove_file(ID=ID, fileGrp=fileGrp)
 
         # To get rid of Python's FutureWarning - checking if v is not None
         kwargs = {k: v for k, v in locals().items() if
@@ -497,10 +745,95 @@ class OcrdMets(OcrdXmlDocument):
 
         if self._cache_flag:
             # Add the file to the file cache
-            self._file_cache[fileGrp].update({ID: el_mets_file})
+            self._cache_file(el_mets_file)
 
         return mets_file
 
+    @staticmethod
+    def _validate_file_args(fileGrp : Optional[str], ID : Optional[str]) -> None:
+        if not ID:
+            raise ValueError("Must set ID of the mets:file")
+        if not fileGrp:
+            raise ValueError("Must set fileGrp of the mets:file")
+        if not REGEX_FILE_ID.fullmatch(ID):
+            raise ValueError("Invalid syntax for mets:file/@ID %s (not an xs:ID)" % ID)
+        if not REGEX_FILE_ID.fullmatch(fileGrp):
+            raise ValueError("Invalid syntax for mets:fileGrp/@USE %s (not an xs:ID)" % fileGrp)
+
+    @staticmethod
+    def _check_existing_file(mets_file : OcrdFile, fileGrp : str, pageId : Optional[str],
+                             mimetype : Optional[str], force : bool) -> None:
+        """
+        Raise :py:class:`FileExistsError` unless :py:attr:`mets_file` may be replaced.
+        """
+        if mets_file.fileGrp == fileGrp and \
+                mets_file.pageId == pageId and \
+                mets_file.mimetype == mimetype:
+            if not force:
+                raise FileExistsError(
+                    f"A file with ID=={mets_file.ID} already exists {mets_file} and neither force nor ignore are set")
+        else:
+            raise FileExistsError(
+                f"A file with ID=={mets_file.ID} already exists {mets_file} but unrelated - cannot mitigate")
+
+    @_journaled
+    def add_files(self, files : Iterable[Dict[str, Any]], force : bool = False, ignore : bool = False) -> List[OcrdFile]:
+        """
+        Instantiate and add many new :py:class:`ocrd_models.ocrd_file.OcrdFile` at once.
+
+        All entries are validated and checked against existing files before the
+        METS is modified, so either all or none of the files are added.
+        Arguments:
+            files (list): keyword arguments of :py:meth:`add_file` for each file
+                (``fileGrp``, ``ID``, ``mimetype``, ``url``, ``local_filename``, ``pageId``)
+        Keyword Args:
+            force (boolean): Whether to replace files if a ``mets:file`` with the same ``@ID`` already exists.
+            ignore (boolean): Do not look for existing files at all.
+        Returns:
+            list of the new :py:class:`ocrd_models.ocrd_file.OcrdFile`
+        """
+        files = [dict(f) for f in files]
+        ids = set()
+        for f in files:
+            self._validate_file_args(f.get('fileGrp'), f.get('ID'))
+            if f['ID'] in ids:
+                raise FileExistsError(f"Duplicate ID=={f['ID']} in batch")
+            ids.add(f['ID'])
+        fileGrps = list(dict.fromkeys(f['fileGrp'] for f in files))
+
+        replaced = []
+        if not ignore:
+            # look up all existing files of the affected fileGrps in one go
+            existing = {}
+            for fileGrp in fileGrps:
+                if self._cache_flag:
+                    el_files = [el for ID, el in self._file_cache.get(fileGrp, {}).items() if ID in ids]
+                else:
+                    el_files = [el for el in self._tree.getroot().iterfind(
+                        'mets:fileSec/mets:fileGrp[@USE="%s"]/mets:file' % fileGrp, namespaces=NS)
+                                if el.get('ID') in ids]
+                for el in el_files:
+                    existing[fileGrp, el.get('ID')] = OcrdFile(el, mets=self)
+            for f in files:
+                mets_file = existing.get((f['fileGrp'], f['ID']))
+                if mets_file:
+                    self._check_existing_file(mets_file, f['fileGrp'], f.get('pageId'), f.get('mimetype'), force)
+                    replaced.append(mets_file)
+        if replaced:
+            self.remove_files(replaced)
+
+        el_fileGrps = {fileGrp: self.add_file_group(fileGrp) for fileGrp in fileGrps}
+        ret = []
+        for f in files:
+            kwargs = {k: v for k, v in f.items() if
+                      k in ['url', 'ID', 'mimetype', 'pageId', 'local_filename'] and v is not None}
+            el_mets_file = ET.SubElement(el_fileGrps[f['fileGrp']], TAG_METS_FILE)
+            ret.append(OcrdFile(el_mets_file, mets=self, **kwargs))
+            if self._cache_flag:
+                self._cache_file(el_mets_file)
+        return ret
+
+    @_journaled
     def remove_file(self, *args, **kwargs) -> Union[List[OcrdFile],OcrdFile]:
         """
         Delete each ``ocrd:file`` matching the query. Same arguments as :py:meth:`find_files`
@@ -519,6 +852,7 @@ class OcrdMets(OcrdXmlDocument):
             return []
         raise FileNotFoundError("File not found: %s %s" % (args, kwargs))
 
+    @_journaled
     def remove_one_file(self, ID : Union[str, OcrdFile], fileGrp : str = None) -> OcrdFile:
         """
         Delete an existing :py:class:`ocrd_models.ocrd_file.OcrdFile`.
@@ -542,12 +876,63 @@ class OcrdMets(OcrdXmlDocument):
         # Delete the physical page ref
         fptrs = []
         if self._cache_flag:
-            for page in self._fptr_cache.keys():
-                if ID in self._fptr_cache[page]:
-                    fptrs.append(self._fptr_cache[page][ID])
+            fptrs = list(self._fptr_by_file_cache.get(ID, {}).values())
         else:
             fptrs = self._tree.getroot().findall('.//mets:fptr[@FILEID="%s"]' % ID, namespaces=NS)
 
+        self._remove_one_file(ocrd_file, fptrs)
+        return ocrd_file
+
+    @_journaled
+    def remove_files(self, files : Iterable[Union[str, OcrdFile]], force : bool = False) -> List[OcrdFile]:
+        """
+        Delete many existing :py:class:`ocrd_models.ocrd_file.OcrdFile` at once.
+
+        All files are looked up before the METS is modified, so either all or
+        none of the files are removed.
+        Arguments:
+            files (list): ``@ID`` or :py:class:`ocrd_models.ocrd_file.OcrdFile` of each ``mets:file`` to delete
+        Keyword Args:
+            force (boolean): Skip files not found instead of raising :py:class:`FileNotFoundError`
+        Returns:
+            list of the old :py:class:`ocrd_models.ocrd_file.OcrdFile` references
+        """
+        files = list(files)
+        ids = set(f for f in files if not isinstance(f, OcrdFile))
+        found = {}
+        if ids:
+            if self._cache_flag:
+                for el_files in self._file_cache.values():
+                    for ID in ids.intersection(el_files):
+                        found[ID] = OcrdFile(el_files[ID], mets=self)
+            else:
+                for el in self._tree.getroot().iterfind('mets:fileSec/mets:fileGrp/mets:file', namespaces=NS):
+                    if el.get('ID') in ids and el.get('ID') not in found:
+                        found[el.get('ID')] = OcrdFile(el, mets=self)
+            missing = ids.difference(found)
+            if missing and not force:
+                raise FileNotFoundError("File not found: %s" % sorted(missing))
+        ocrd_files = [f if isinstance(f, OcrdFile) else found[f] for f in files
+                      if isinstance(f, OcrdFile) or f in found]
+
+        fptrs : Dict[str, List[ET._Element]] = {}
+        if self._cache_flag:
+            for ocrd_file in ocrd_files:
+                fptrs[ocrd_file.ID] = list(self._fptr_by_file_cache.get(ocrd_file.ID, {}).values())
+        else:
+            # collect the physical page refs of all files in a single pass
+            ids = set(ocrd_file.ID for ocrd_file in ocrd_files)
+            for el_fptr in self._tree.getroot().iter(TAG_METS_FPTR):
+                if el_fptr.get('FILEID') in ids:
+                    fptrs.setdefault(el_fptr.get('FILEID'), []).append(el_fptr)
+
+        for ocrd_file in ocrd_files:
+            self._remove_one_file(ocrd_file, fptrs.get(ocrd_file.ID, []))
+        return ocrd_files
+
+    def _remove_one_file(self, ocrd_file : OcrdFile, fptrs : List[ET._Element]) -> None:
+        log = getLogger('ocrd.models.ocrd_mets.remove_one_file')
+        ID = ocrd_file.ID
         # Delete the physical page ref
         for fptr in fptrs:
             log.debug("Delete fptr element %s for page '%s'", fptr, ID)
@@ -555,7 +940,7 @@ class OcrdMets(OcrdXmlDocument):
             page_div.remove(fptr)
             # Remove the fptr from the cache as well
             if self._cache_flag:
-                del self._fptr_cache[page_div.get('ID')][ID]
+                self._uncache_fptr(page_div.get('ID'), ID)
             # delete empty pages
             if not list(page_div):
                 log.debug("Delete empty page %s", page_div)
@@ -568,15 +953,12 @@ class OcrdMets(OcrdXmlDocument):
 
         # Delete the file reference from the cache
         if self._cache_flag:
-            parent_use = ocrd_file._el.getparent().get('USE')
-            del self._file_cache[parent_use][ocrd_file.ID]
+            self._uncache_file(ocrd_file._el)
 
         # Delete the file reference
         # pylint: disable=protected-access
         ocrd_file._el.getparent().remove(ocrd_file._el)
 
-        return ocrd_file
-
     @property
     def physical_pages(self) -> List[str]:
         """
@@ -589,12 +971,14 @@ class OcrdMets(OcrdXmlDocument):
             'mets:structMap[@TYPE="PHYSICAL"]/mets:div[@TYPE="physSequence"]/mets:div[@TYPE="page"]/@ID',
             namespaces=NS)]
 
-    def get_physical_pages(self, for_fileIds : Optional[List[str]] = None, for_pageIds : Optional[str] = None, 
+    def get_physical_pages(self, for_fileIds : Optional[List[str]] = None,
+                           for_pageIds : Optional[Union[str, PageSelector]] = None,
                            return_divs : bool = False) -> List[Union[str, ET._Element]]:
         """
         List all page IDs (the ``@ID`` of each physical ``mets:structMap`` ``mets:div``),
         optionally for a subset of ``mets:file`` ``@ID`` :py:attr:`for_fileIds`,
-        or for a subset selector expression (comma-separated, range, and/or regex) :py:attr:`for_pageIds`.
+        or for a subset selector expression (comma-separated, range, and/or regex) :py:attr:`for_pageIds`
+        (or its :py:class:`ocrd_models.ocrd_mets_selector.PageSelector`).
         If return_divs is set, returns div memory objects instead of strings of ids
         """
         if for_fileIds is None and for_pageIds is None:
@@ -602,16 +986,12 @@ class OcrdMets(OcrdXmlDocument):
         # log = getLogger('ocrd.models.ocrd_mets.get_physical_pages')
         if for_pageIds is not None:
             ret = []
-            page_attr_patterns = []
-            page_attr_patterns_raw = re.split(r',', for_pageIds)
-            for pageId_token in page_attr_patterns_raw:
-                if pageId_token.startswith(REGEX_PREFIX):
-                    page_attr_patterns.append((None, re.compile(pageId_token[REGEX_PREFIX_LEN:])))
-                elif '..' in pageId_token:
-                    val_range = generate_range(*pageId_token.split('..', 1))
-                    page_attr_patterns.append(val_range)
-                else:
-                    page_attr_patterns.append(pageId_token)
+            page_selector = PageSelector.compile(for_pageIds)
+            page_attr_patterns_raw = page_selector.tokens
+            # (copies, since ranges and regexes are narrowed down while matching)
+            page_attr_patterns = [list(pat) if isinstance(pat, tuple) else
+                                  pat if isinstance(pat, str) else (None, pat)
+                                  for pat in page_selector.patterns]
             if not page_attr_patterns:
                 return []
             range_patterns_first_last = [(x[0], x[-1]) if isinstance(x, list) else None for x in page_attr_patterns]
@@ -700,14 +1080,13 @@ class OcrdMets(OcrdXmlDocument):
         assert for_fileIds # at this point we know for_fileIds is set, assert to convince pyright
         ret = [None] * len(for_fileIds)
         if self._cache_flag:
-            for pageId in self._fptr_cache.keys():
-                for fptr in self._fptr_cache[pageId].keys():
-                    if fptr in for_fileIds:
-                        index = for_fileIds.index(fptr)
-                        if return_divs:
-                            ret[index] = self._page_cache[METS_PAGE_DIV_ATTRIBUTE.ID][pageId]
-                        else:
-                            ret[index] = pageId
+            for index, fileId in enumerate(for_fileIds):
+                # (if there are several pages, the last one takes precedence)
+                for pageId in self._fptr_by_file_cache.get(fileId, {}):
+                    if return_divs:
+                        ret[index] = self._page_cache[METS_PAGE_DIV_ATTRIBUTE.ID][pageId]
+                    else:
+                        ret[index] = pageId
         else:
             for page in self._tree.getroot().xpath(
                     'mets:structMap[@TYPE="PHYSICAL"]/mets:div[@TYPE="physSequence"]/mets:div[@TYPE="page"]',
@@ -721,6 +1100,7 @@ class OcrdMets(OcrdXmlDocument):
                             ret[index] = page.get('ID')
         return ret
 
+    @_journaled
     def set_physical_page_for_file(self, pageId : str, ocrd_file : OcrdFile, 
                                    order : Optional[str] = None, orderlabel : Optional[str] = None) -> None:
         """
@@ -737,10 +1117,7 @@ class OcrdMets(OcrdXmlDocument):
         # delete any existing page mapping for this file.ID
         fptrs = []
         if self._cache_flag:
-            for page_id in self._fptr_cache.keys():
-                if ocrd_file.ID in self._fptr_cache[page_id].keys():
-                    if self._fptr_cache[page_id][ocrd_file.ID] is not None:
-                        fptrs.append(self._fptr_cache[page_id][ocrd_file.ID])
+            fptrs = list(self._fptr_by_file_cache.get(ocrd_file.ID, {}).values())
         else:
             fptrs = self._tree.getroot().findall(
                 'mets:structMap[@TYPE="PHYSICAL"]/mets:div[@TYPE="physSequence"]/mets:div[@TYPE="page"]/mets:fptr[@FILEID="%s"]' %
@@ -748,7 +1125,7 @@ class OcrdMets(OcrdXmlDocument):
 
         for el_fptr in fptrs:
             if self._cache_flag:
-                del self._fptr_cache[el_fptr.getparent().get('ID')][ocrd_file.ID]
+                self._uncache_fptr(el_fptr.getparent().get('ID'), ocrd_file.ID)
             el_fptr.getparent().remove(el_fptr)
 
         # find/construct as necessary
@@ -789,7 +1166,9 @@ class OcrdMets(OcrdXmlDocument):
         if self._cache_flag:
             # Assign the ocrd fileID to the pageId in the cache
             self._fptr_cache[pageId].update({ocrd_file.ID: el_fptr})
+            self._fptr_by_file_cache.setdefault(ocrd_file.ID, {})[pageId] = el_fptr
 
+    @_journaled
     def update_physical_page_attributes(self, page_id : str, **kwargs) -> None:
         invalid_keys = list(k for k in kwargs.keys() if k not in METS_PAGE_DIV_ATTRIBUTE.names())
         if invalid_keys:
@@ -812,9 +1191,7 @@ class OcrdMets(OcrdXmlDocument):
         corresponding to the ``mets:file`` :py:attr:`ocrd_file`.
         """
         if self._cache_flag:
-            for pageId in self._fptr_cache.keys():
-                if ocrd_file.ID in self._fptr_cache[pageId].keys():
-                    return pageId
+            return next(iter(self._fptr_by_file_cache.get(ocrd_file.ID, {})), None)
         else:
             ret = self._tree.getroot().find(
                 'mets:structMap[@TYPE="PHYSICAL"]/mets:div[@TYPE="physSequence"]/mets:div[@TYPE="page"]/mets:fptr[@FILEID="%s"]' %
@@ -822,6 +1199,7 @@ class OcrdMets(OcrdXmlDocument):
             if ret is not None:
                 return ret.getparent().get('ID')
 
+    @_journaled
     def remove_physical_page(self, ID : str) -> None:
         """
         Delete page (physical ``mets:structMap`` ``mets:div`` entry ``@ID``) :py:attr:`ID`.
@@ -841,8 +1219,11 @@ class OcrdMets(OcrdXmlDocument):
                 for attr in METS_PAGE_DIV_ATTRIBUTE:
                     if attr.name in mets_div_attrib:
                         del self._page_cache[attr][mets_div_attrib[attr.name]]
+                for fileId in list(self._fptr_cache[ID]):
+                    self._uncache_fptr(ID, fileId)
                 del self._fptr_cache[ID]
 
+    @_journaled
     def remove_physical_page_fptr(self, fileId : str) -> List[str]:
         """
         Delete all ``mets:fptr[@FILEID = fileId]`` to ``mets:file[@ID == fileId]`` for :py:attr:`fileId` from all ``mets:div`` entries in the physical ``mets:structMap``.
@@ -857,9 +1238,7 @@ class OcrdMets(OcrdXmlDocument):
         # If that's the case then we do not need to iterate 2 loops, just one.
         mets_fptrs = []
         if self._cache_flag:
-            for page_id in self._fptr_cache.keys():
-                if fileId in self._fptr_cache[page_id].keys():
-                    mets_fptrs.append(self._fptr_cache[page_id][fileId])
+            mets_fptrs = list(self._fptr_by_file_cache.get(fileId, {}).values())
         else:
             mets_fptrs = self._tree.getroot().xpath(
                 'mets:structMap[@TYPE="PHYSICAL"]/mets:div[@TYPE="physSequence"]/mets:div[@TYPE="page"]/mets:fptr[@FILEID="%s"]' % fileId,
@@ -869,10 +1248,19 @@ class OcrdMets(OcrdXmlDocument):
             mets_div = mets_fptr.getparent()
             ret.append(mets_div.get('ID'))
             if self._cache_flag:
-                del self._fptr_cache[mets_div.get('ID')][mets_fptr.get('FILEID')]
+                self._uncache_fptr(mets_div.get('ID'), mets_fptr.get('FILEID'))
             mets_div.remove(mets_fptr)
         return ret
 
+    def _uncache_fptr(self, pageId : str, fileId : str) -> None:
+        """
+        Remove the ``mets:fptr`` for :py:attr:`fileId` on :py:attr:`pageId` from both fptr caches.
+        """
+        del self._fptr_cache[pageId][fileId]
+        del self._fptr_by_file_cache[fileId][pageId]
+        if not self._fptr_by_file_cache[fileId]:
+            del self._fptr_by_file_cache[fileId]
+
     @property
     def physical_pages_labels(self) -> Dict[str, Tuple[Optional[str], Optional[str], Optional[str]]]:
         """
@@ -920,3 +1308,153 @@ class OcrdMets(OcrdXmlDocument):
             if after_add_cb:
                 after_add_cb(f_dest)
 
+
+class LazyOcrdMets(OcrdMets):
+    """
+    Read-mostly variant of :py:class:`OcrdMets` for very large METS files
+
+    The file is streamed once with ``iterparse`` to build a skeleton tree
+    containing everything except the ``mets:file`` entries (i.e. header,
+    metadata sections and structMaps, plus empty ``mets:fileGrp`` elements).
+    The entries of a ``mets:fileGrp`` are only materialised (by streaming the
+    file again) when they are requested via :py:meth:`find_files`.
+
+    Modifications of the fileSec and serialisation materialise all
+    remaining ``mets:fileGrp`` first, so the document then behaves like a
+    fully loaded (cached) :py:class:`OcrdMets`.
+    """
+
+    def __init__(self, filename : str, **kwargs) -> None:
+        filename = filename.replace('file://', '')
+        if not exists(filename):
+            raise Exception('File does not exist: %s' % filename)
+        self._filename = filename
+        # USE of each mets:fileGrp whose mets:file entries have not been materialised yet
+        self._unloaded_file_groups = set()
+        # queries may run concurrently (e.g. in the METS server), but must not load the same fileGrp twice
+        self._load_lock = Lock()
+        context = ET.iterparse(filename, events=('end',), tag=(TAG_METS_FILE, TAG_METS_FILEGRP))
+        for _, el in context:
+            if el.tag == TAG_METS_FILE:
+                el.clear()
+                while el.getprevious() is not None:
+                    del el.getparent()[0]
+            else:
+                for el_file in list(el):
+                    el.remove(el_file)
+                self._unloaded_file_groups.add(el.get('USE'))
+        self._tree = ET.ElementTree(context.root)
+        # the index of the skeleton relies on the caches
+        self._cache_flag = True
+        self._index_flag = False
+        self._initialize_caches()
+        self._refresh_caches()
+
+    def _fill_caches(self) -> None:
+        super()._fill_caches()
+        for fileGrp in self._unloaded_file_groups:
+            self._file_cache.pop(fileGrp, None)
+
+    def _load_file_groups(self, fileGrps : List[str]) -> None:
+        """
+        Materialise the ``mets:file`` entries of all :py:attr:`fileGrps` not loaded yet
+        in a single pass over the file, stopping as early as possible.
+        """
+        if not self._unloaded_file_groups.intersection(fileGrps):
+            return
+        with self._load_lock:
+            self._load_unloaded_file_groups(self._unloaded_file_groups.intersection(fileGrps))
+
+    def _load_unloaded_file_groups(self, fileGrps : Set[str]) -> None:
+        if not fileGrps:
+            return
+        getLogger('ocrd.models.ocrd_mets.lazy').debug("Loading fileGrps %s from %s", fileGrps, self._filename)
+        el_fileSec = self._tree.getroot().find('mets:fileSec', NS)
+        for _, el in ET.iterparse(self._filename, events=('end',), tag=TAG_METS_FILEGRP):
+            fileGrp = el.get('USE')
+            if fileGrp in fileGrps:
+                el_fileGrp = el_fileSec.find('mets:fileGrp[@USE="%s"]' % fileGrp, NS)
+                # concurrent queries must never see a fileGrp partially loaded,
+                # so add it to the file cache complete with file order, then index its locations
+                el_files = {}
+                for el_file in list(el):
+                    el_fileGrp.append(el_file)
+                    el_files[el_file.get('ID')] = el_file
+                    self._file_order[el_file] = next(self._file_counter)
+                self._file_cache[fileGrp] = el_files
+                for el_file in el_files.values():
+                    self._cache_flocat(el_file)
+                self._unloaded_file_groups.remove(fileGrp)
+                fileGrps.remove(fileGrp)
+                if not fileGrps:
+                    break
+            el.clear()
+
+    def _load_all_file_groups(self) -> None:
+        self._load_file_groups(list(self._unloaded_file_groups))
+
+    @property
+    def file_groups(self) -> List[str]:
+        return [el.get('USE') for el in self._tree.getroot().findall('mets:fileSec/mets:fileGrp', NS)]
+
+    def find_files(
+        self,
+        ID : Optional[str] = None,
+        fileGrp : Optional[str] = None,
+        pageId : Optional[str] = None,
+        mimetype : Optional[str] = None,
+        url : Optional[str] = None,
+        local_filename : Optional[str] = None,
+        local_only : bool = False,
+        include_fileGrp : Optional[List[str]] = None,
+        exclude_fileGrp : Optional[List[str]] = None,
+        selector : Optional[FileSelector] = None,
+    ) -> Iterator[OcrdFile]:
+        """
+        Like :py:meth:`OcrdMets.find_files`, but materialise the ``mets:fileGrp``
+        entries needed for the query first.
+        """
+        if selector is None:
+            selector = FileSelector.compile(ID=ID, fileGrp=fileGrp, pageId=pageId, mimetype=mimetype,
+                                            url=url, local_filename=local_filename)
+        fileGrp = selector.fileGrp
+        # snapshot, since other queries may load fileGrps concurrently
+        fileGrps = list(self._unloaded_file_groups)
+        if isinstance(fileGrp, str) and fileGrp:
+            fileGrps = [fileGrp]
+        elif fileGrp:
+            fileGrps = [x for x in fileGrps if fileGrp.fullmatch(x)]
+        if include_fileGrp:
+            fileGrps = [x for x in fileGrps if x in include_fileGrp]
+        if exclude_fileGrp:
+            fileGrps = [x for x in fileGrps if x not in exclude_fileGrp]
+        self._load_file_groups(fileGrps)
+        return super().find_files(local_only=local_only, include_fileGrp=include_fileGrp,
+                                  exclude_fileGrp=exclude_fileGrp, selector=selector)
+
+    def add_file(self, fileGrp : str, *args, **kwargs) -> OcrdFile:
+        self._load_file_groups([fileGrp])
+        return super().add_file(fileGrp, *args, **kwargs)
+
+    def add_files(self, files : Iterable[Dict[str, Any]], *args, **kwargs) -> List[OcrdFile]:
+        files = list(files)
+        self._load_file_groups(list(dict.fromkeys(f.get('fileGrp') for f in files if f.get('fileGrp'))))
+        return super().add_files(files, *args, **kwargs)
+
+    def remove_files(self, files : Iterable[Union[str, OcrdFile]], force : bool = False) -> List[OcrdFile]:
+        files = list(files)
+        if any(not isinstance(f, OcrdFile) for f in files):
+            self._load_all_file_groups()
+        return super().remove_files(files, force=force)
+
+    def rename_file_group(self, old : str, new : str) -> None:
+        self._load_all_file_groups()
+        super().rename_file_group(old, new)
+
+    def remove_file_group(self, USE : str, recursive : bool = False, force : bool = False) -> None:
+        self._load_all_file_groups()
+        super().remove_file_group(USE, recursive=recursive, force=force)
+
+    def to_xml(self, xmllint : bool = False) -> bytes:
+        self._load_all_file_groups()
+        return super().to_xml(xmllint=xmllint)
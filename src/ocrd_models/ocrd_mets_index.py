@@ -0,0 +1,242 @@
+"""
+Columnar index of ``mets:file`` entries for :py:class:`ocrd_models.ocrd_mets.OcrdMets`
+"""
+from array import array
+from typing import Dict, Iterable, List, Optional, Pattern, Set, Tuple, Union
+
+from .constants import NAMESPACES as NS
+from .ocrd_xml_base import ET # type: ignore
+
+__all__ = ['OcrdMetsFileIndex', 'flocat_hrefs']
+
+def flocat_hrefs(el : ET._Element) -> Tuple[Optional[str], Optional[str]]:
+    """
+    URL and local filename (first ``@xlink:href`` of each kind of ``mets:FLocat``) of a ``mets:file``
+    """
+    url = local_filename = None
+    for el_FLocat in el.iterchildren('{%s}FLocat' % NS['mets']):
+        if el_FLocat.get('LOCTYPE') == 'URL':
+            url = url or el_FLocat.get('{%s}href' % NS['xlink'])
+        elif el_FLocat.get('LOCTYPE') == 'OTHER' and el_FLocat.get('OTHERLOCTYPE') == 'FILE':
+            local_filename = local_filename or el_FLocat.get('{%s}href' % NS['xlink'])
+    return url, local_filename
+
+class IndexColumn():
+    """
+    A single attribute of all rows, interned as integer codes, with the set of
+    rows for each distinct value, so literal queries are lookups and regex
+    queries only need to be matched once per distinct value.
+    """
+
+    def __init__(self) -> None:
+        # code -> value
+        self.values : List[str] = []
+        # value -> code
+        self.codes : Dict[str, int] = {}
+        # code -> rows having that value
+        self.postings : List[Set[int]] = []
+        # row -> code (-1 for no value)
+        self.rows = array('l')
+
+    def _intern(self, value : Optional[str]) -> int:
+        if value is None:
+            return -1
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.codes[value] = code
+            self.values.append(value)
+            self.postings.append(set())
+        return code
+
+    def append(self, value : Optional[str]) -> None:
+        code = self._intern(value)
+        if code >= 0:
+            self.postings[code].add(len(self.rows))
+        self.rows.append(code)
+
+    def get(self, row : int) -> Optional[str]:
+        code = self.rows[row]
+        return self.values[code] if code >= 0 else None
+
+    def set(self, row : int, value : Optional[str]) -> None:
+        old_code = self.rows[row]
+        if old_code >= 0:
+            self.postings[old_code].discard(row)
+        code = self._intern(value)
+        if code >= 0:
+            self.postings[code].add(row)
+        self.rows[row] = code
+
+    def rename(self, old : str, new : str) -> None:
+        """
+        Change :py:attr:`old` to :py:attr:`new` for all rows at once.
+        """
+        code = self.codes.pop(old, None)
+        if code is None:
+            return
+        if new in self.codes:
+            for row in list(self.postings[code]):
+                self.set(row, new)
+            return
+        self.values[code] = new
+        self.codes[new] = code
+
+    def compact(self, rows : List[int]) -> None:
+        """
+        Keep only :py:attr:`rows` (renumbered in that order), and only the values they still use.
+        """
+        codes = [self.rows[row] for row in rows]
+        used = sorted(set(codes) - {-1})
+        new_codes = {code: n for n, code in enumerate(used)}
+        new_codes[-1] = -1
+        self.values = [self.values[code] for code in used]
+        self.codes = {value: code for code, value in enumerate(self.values)}
+        self.rows = array('l', [new_codes[code] for code in codes])
+        self.postings = [set() for _ in used]
+        for row, code in enumerate(self.rows):
+            if code >= 0:
+                self.postings[code].add(row)
+
+    def match(self, needle : Union[str, Pattern]) -> Set[int]:
+        """
+        Rows whose value equals the literal string or fully matches the compiled regex :py:attr:`needle`.
+        """
+        if isinstance(needle, str):
+            code = self.codes.get(needle)
+            return self.postings[code] if code is not None else set()
+        ret = set()
+        for code, value in enumerate(self.values):
+            if self.postings[code] and needle.fullmatch(value):
+                ret |= self.postings[code]
+        return ret
+
+    def match_any(self, values : Iterable[str]) -> Set[int]:
+        ret = set()
+        for value in values:
+            ret |= self.match(value)
+        return ret
+
+    def non_empty(self) -> Set[int]:
+        ret = set()
+        for postings in self.postings:
+            ret |= postings
+        return ret
+
+class OcrdMetsFileIndex():
+    """
+    Columnar index of all ``mets:file`` entries (one row per entry, in order of
+    addition) with interned ``@ID``, ``@USE`` of the ``mets:fileGrp``, ``@MIMETYPE``,
+    and URL and local filename ``@xlink:href`` of the ``mets:FLocat``, answering
+    :py:meth:`ocrd_models.ocrd_mets.OcrdMets.find_files` queries by set intersection.
+
+    Removed rows are kept as tombstones until they outnumber the live rows
+    (and :py:attr:`COMPACT_MIN_DEAD`), then the live rows are renumbered.
+    """
+
+    COLUMNS = ['ID', 'fileGrp', 'mimetype', 'url', 'local_filename']
+    COMPACT_MIN_DEAD = 1024
+
+    def __init__(self) -> None:
+        self.columns = {name: IndexColumn() for name in self.COLUMNS}
+        # row -> mets:file element (None if removed)
+        self.elements : List[Optional[ET._Element]] = []
+        # mets:file element -> row
+        self.row_of : Dict[ET._Element, int] = {}
+        self.alive : Set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self.alive)
+
+    @staticmethod
+    def _values(el : ET._Element) -> Dict[str, Optional[str]]:
+        url, local_filename = flocat_hrefs(el)
+        return {'ID': el.get('ID'), 'fileGrp': el.getparent().get('USE'), 'mimetype': el.get('MIMETYPE'),
+                'url': url, 'local_filename': local_filename}
+
+    def add(self, el : ET._Element) -> None:
+        if el in self.row_of:
+            return self.update(el)
+        row = len(self.elements)
+        self.elements.append(el)
+        self.row_of[el] = row
+        self.alive.add(row)
+        for name, value in self._values(el).items():
+            self.columns[name].append(value)
+
+    def update(self, el : ET._Element) -> None:
+        """
+        Re-read all columns of a (modified) ``mets:file`` element (if indexed).
+        """
+        row = self.row_of.get(el)
+        if row is None:
+            return
+        for name, value in self._values(el).items():
+            self.columns[name].set(row, value)
+
+    def remove(self, el : ET._Element) -> None:
+        row = self.row_of.pop(el, None)
+        if row is None:
+            return
+        for column in self.columns.values():
+            column.set(row, None)
+        self.elements[row] = None
+        self.alive.discard(row)
+        dead = len(self.elements) - len(self.alive)
+        if dead > len(self.alive) and dead >= self.COMPACT_MIN_DEAD:
+            self.compact()
+
+    def compact(self) -> None:
+        """
+        Drop the tombstones of removed rows, renumbering the live rows (in order of addition).
+        """
+        rows = sorted(self.alive)
+        for column in self.columns.values():
+            column.compact(rows)
+        self.elements = [self.elements[row] for row in rows]
+        self.row_of = {el: row for row, el in enumerate(self.elements)}
+        self.alive = set(range(len(rows)))
+
+    def rename_file_group(self, old : str, new : str) -> None:
+        self.columns['fileGrp'].rename(old, new)
+
+    def find(
+        self,
+        fileGrp_order : List[str],
+        fileIds : Optional[Iterable[str]] = None,
+        local_only : bool = False,
+        include_fileGrp : Optional[List[str]] = None,
+        exclude_fileGrp : Optional[List[str]] = None,
+        **needles : Union[None, str, Pattern]
+    ) -> List[ET._Element]:
+        """
+        Find all ``mets:file`` elements matching all criteria, each a
+        literal string or compiled regex :py:attr:`needles` per column,
+        sorted by position of the fileGrp in :py:attr:`fileGrp_order` first
+        and order of addition second.
+        """
+        candidates = []
+        for name, needle in needles.items():
+            if needle:
+                candidates.append(self.columns[name].match(needle))
+        if fileIds is not None:
+            candidates.append(self.columns['ID'].match_any(fileIds))
+        if local_only:
+            candidates.append(self.columns['local_filename'].non_empty())
+        if include_fileGrp:
+            candidates.append(self.columns['fileGrp'].match_any(include_fileGrp))
+        if not candidates:
+            rows = set(self.alive)
+        else:
+            candidates.sort(key=len)
+            rows = set(candidates[0])
+            for other in candidates[1:]:
+                if not rows:
+                    break
+                rows &= other
+        if exclude_fileGrp:
+            rows -= self.columns['fileGrp'].match_any(exclude_fileGrp)
+        fileGrp_column = self.columns['fileGrp']
+        position = {fileGrp_column.codes.get(fileGrp): n for n, fileGrp in enumerate(fileGrp_order)}
+        return [self.elements[row] for row in
+                sorted(rows, key=lambda row: (position.get(fileGrp_column.rows[row], len(position)), row))]
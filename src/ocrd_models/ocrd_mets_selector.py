@@ -0,0 +1,122 @@
+"""
+Compiled page and file selectors for :py:class:`ocrd_models.ocrd_mets.OcrdMets`
+"""
+from functools import lru_cache
+import re
+from typing import List, Optional, Pattern, Tuple, Union
+
+from ocrd_utils import generate_range, REGEX_PREFIX
+
+__all__ = ['PageSelector', 'FileSelector']
+
+class PageSelector():
+    """
+    Page selector expression (comma-separated literal values of ``@ID``, ``@ORDER``
+    etc., ``..`` ranges and ``//`` regexes) parsed once, with ranges expanded
+    and regexes compiled.
+
+    Use :py:meth:`compile` to get instances cached by expression.
+    """
+
+    def __init__(self, expression : str) -> None:
+        self.expression = expression
+        self.tokens : Tuple[str, ...] = tuple(expression.split(','))
+        patterns : List[Union[str, Tuple[str, ...], Pattern]] = []
+        for token in self.tokens:
+            if token.startswith(REGEX_PREFIX):
+                patterns.append(re.compile(token[len(REGEX_PREFIX):]))
+            elif '..' in token:
+                patterns.append(tuple(generate_range(*token.split('..', 1))))
+            else:
+                patterns.append(token)
+        # literal value, range of literal values or regex per token
+        self.patterns : Tuple[Union[str, Tuple[str, ...], Pattern], ...] = tuple(patterns)
+
+    @staticmethod
+    def compile(expression : Union[str, 'PageSelector']) -> 'PageSelector':
+        """
+        Parse :py:attr:`expression` (unless already parsed recently or a :py:class:`PageSelector` itself)
+        """
+        if isinstance(expression, PageSelector):
+            return expression
+        return _compile_page_selector(expression)
+
+    def expand(self) -> List[Union[str, Pattern]]:
+        """
+        List of all literal values (with ranges expanded) and regexes
+        """
+        ret : List[Union[str, Pattern]] = []
+        for pattern in self.patterns:
+            if isinstance(pattern, tuple):
+                ret.extend(pattern)
+            else:
+                ret.append(pattern)
+        return ret
+
+    def __str__(self) -> str:
+        return self.expression
+
+    def __repr__(self) -> str:
+        return f'PageSelector({self.expression!r})'
+
+@lru_cache(maxsize=256)
+def _compile_page_selector(expression : str) -> PageSelector:
+    return PageSelector(expression)
+
+def _compile_value(value : Optional[str]) -> Union[None, str, Pattern]:
+    if value and value.startswith(REGEX_PREFIX):
+        return re.compile(value[len(REGEX_PREFIX):])
+    return value
+
+class FileSelector():
+    """
+    Search criteria of :py:meth:`ocrd_models.ocrd_mets.OcrdMets.find_files`
+    parsed once: :py:attr:`ID`, :py:attr:`fileGrp`, :py:attr:`mimetype`,
+    :py:attr:`url` and :py:attr:`local_filename` are each ``None``, a literal
+    string or a compiled regex, and :py:attr:`pageId` is ``None`` or a
+    :py:class:`PageSelector`.
+
+    Use :py:meth:`compile` to get instances cached by criteria.
+    """
+
+    FIELDS = ('ID', 'fileGrp', 'pageId', 'mimetype', 'url', 'local_filename')
+
+    def __init__(
+        self,
+        ID : Optional[str] = None,
+        fileGrp : Optional[str] = None,
+        pageId : Optional[str] = None,
+        mimetype : Optional[str] = None,
+        url : Optional[str] = None,
+        local_filename : Optional[str] = None,
+    ) -> None:
+        # the criteria as given (e.g. to pass them on to a METS server)
+        self.expressions = dict(ID=ID, fileGrp=fileGrp, pageId=pageId, mimetype=mimetype,
+                                url=url, local_filename=local_filename)
+        self.ID = _compile_value(ID)
+        self.fileGrp = _compile_value(fileGrp)
+        self.pageId = PageSelector.compile(pageId) if pageId is not None else None
+        self.mimetype = _compile_value(mimetype)
+        self.url = _compile_value(url)
+        self.local_filename = _compile_value(local_filename)
+
+    @staticmethod
+    def compile(
+        ID : Optional[str] = None,
+        fileGrp : Optional[str] = None,
+        pageId : Optional[str] = None,
+        mimetype : Optional[str] = None,
+        url : Optional[str] = None,
+        local_filename : Optional[str] = None,
+    ) -> 'FileSelector':
+        """
+        Parse the criteria (unless already parsed recently)
+        """
+        return _compile_file_selector(ID, fileGrp, pageId, mimetype, url, local_filename)
+
+    def __repr__(self) -> str:
+        return 'FileSelector(%s)' % ', '.join(f'{k}={v!r}' for k, v in self.expressions.items() if v is not None)
+
+@lru_cache(maxsize=256)
+def _compile_file_selector(*args) -> FileSelector:
+    return FileSelector(*args)
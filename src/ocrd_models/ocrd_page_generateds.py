@@ -3496,6 +3496,14 @@ class CoordsType(GeneratedsSuper):
                 # BorderType:
                 parent.parent_object_.invalidate_AlternativeImage(feature_selector='cropped')
         self.points = points
+    def get_polygon(self):
+        """
+        Get coordinate polygon as a (read-only) numpy array of points,
+        cf. :py:func:`ocrd_utils.polygon_from_points` with ``as_array=True``
+        (which caches the result for the same ``points``).
+        """
+        from ocrd_utils import polygon_from_points  # pylint: disable=import-outside-toplevel
+        return polygon_from_points(self.points, as_array=True)
 # end class CoordsType
 
 
@@ -0,0 +1,166 @@
+"""
+Lightweight access to PAGE-XML with :py:mod:`lxml`, without building the
+:py:mod:`ocrd_models.ocrd_page` object tree.
+"""
+from typing import Dict, List, NamedTuple, Optional, Union
+from os import PathLike
+
+from lxml import etree as ET
+
+__all__ = ['OcrdPageLite', 'LiteAlternativeImage']
+
+class LiteAlternativeImage(NamedTuple):
+    """
+    Attributes of a ``pc:AlternativeImage`` and its parent element
+    """
+    filename : str
+    comments : Optional[str]
+    parent_tag : str
+    parent_id : Optional[str]
+
+def _localname(el : ET._Element) -> str:
+    # QName is slow, PAGE elements are always namespaced
+    return el.tag.rsplit('}', 1)[-1]
+
+def _level(tag : str) -> str:
+    if tag == 'Page':
+        return 'page'
+    if tag.endswith('Region'):
+        return 'region'
+    if tag == 'TextLine':
+        return 'line'
+    if tag == 'Word':
+        return 'word'
+    if tag == 'Glyph':
+        return 'glyph'
+    return ''
+
+class OcrdPageLite():
+    """
+    Read-only view of a PAGE-XML file for the common queries that do not need
+    the full :py:class:`~ocrd_models.ocrd_page.OcrdPage` (as parsed by
+    :py:func:`ocrd_modelfactory.page_from_file`).
+
+    The attributes of ``pc:PcGts`` and ``pc:Page`` are read incrementally and
+    parsing stops at the ``pc:Page`` start tag. AlternativeImages are collected
+    in a single streaming pass, discarding each ``pc:TextLine`` when done.
+    """
+
+    def __init__(self, filename : Union[str, PathLike]) -> None:
+        self.filename = str(filename)
+        self._pcgts_attrib : Optional[Dict[str, str]] = None
+        self._page_attrib : Optional[Dict[str, str]] = None
+
+    def _read_header(self) -> None:
+        if self._page_attrib is not None:
+            return
+        self._pcgts_attrib = {}
+        self._page_attrib = {}
+        with open(self.filename, 'rb') as f:
+            for _, el in ET.iterparse(f, events=('start',), remove_comments=True):
+                tag = _localname(el)
+                if tag == 'PcGts':
+                    self._pcgts_attrib = dict(el.attrib)
+                elif tag == 'Page':
+                    self._page_attrib = dict(el.attrib)
+                    break
+
+    @property
+    def pcGtsId(self) -> Optional[str]:
+        """
+        ``pc:PcGts/@pcGtsId``
+        """
+        self._read_header()
+        return self._pcgts_attrib.get('pcGtsId') # type: ignore[union-attr]
+
+    @property
+    def imageFilename(self) -> Optional[str]:
+        """
+        ``pc:Page/@imageFilename``
+        """
+        self._read_header()
+        return self._page_attrib.get('imageFilename') # type: ignore[union-attr]
+
+    @property
+    def imageWidth(self) -> Optional[int]:
+        """
+        ``pc:Page/@imageWidth``
+        """
+        self._read_header()
+        width = self._page_attrib.get('imageWidth') # type: ignore[union-attr]
+        return int(width) if width is not None else None
+
+    @property
+    def imageHeight(self) -> Optional[int]:
+        """
+        ``pc:Page/@imageHeight``
+        """
+        self._read_header()
+        height = self._page_attrib.get('imageHeight') # type: ignore[union-attr]
+        return int(height) if height is not None else None
+
+    def get_AllAlternativeImages(self, page=True, region=True, line=True, word=True, glyph=True) -> List[LiteAlternativeImage]:
+        """
+        Get all the ``pc:AlternativeImage`` in the document, in document order
+        (cf. :py:meth:`ocrd_models.ocrd_page.PageType.get_AllAlternativeImages`,
+        but including images of all kinds of regions)
+
+        Arguments:
+            page (boolean): Get images on ``pc:Page`` level
+            region (boolean): Get images on ``pc:*Region`` level
+            line (boolean): Get images on ``pc:TextLine`` level
+            word (boolean): Get images on ``pc:Word`` level
+            glyph (boolean): Get images on ``pc:Glyph`` level
+
+        Returns:
+            a list of :py:class:`LiteAlternativeImage`
+        """
+        levels = {level for level, wanted in [('page', page), ('region', region), ('line', line),
+                                              ('word', word), ('glyph', glyph)] if wanted}
+        ret = []
+        with open(self.filename, 'rb') as f:
+            for _, el in ET.iterparse(f, events=('end',), tag=('{*}AlternativeImage', '{*}TextLine'),
+                                      remove_comments=True):
+                if _localname(el) == 'AlternativeImage':
+                    parent = el.getparent()
+                    parent_tag = _localname(parent)
+                    if _level(parent_tag) in levels:
+                        ret.append(LiteAlternativeImage(el.get('filename'), el.get('comments'),
+                                                        parent_tag, parent.get('id')))
+                else:
+                    # keep memory bounded: drop finished lines (with their words and glyphs)
+                    el.clear()
+                    while el.getprevious() is not None:
+                        del el.getparent()[0]
+        return ret
+
+    def replace_filenames(self, replacements : Dict[str, str]) -> bool:
+        """
+        Change ``pc:Page/@imageFilename`` and ``pc:AlternativeImage/@filename``
+        according to ``replacements`` (mapping old to new filenames) and write
+        back the file, if any of them matched.
+
+        Returns:
+            whether the file was changed
+        """
+        tree = ET.parse(self.filename)
+        changed = False
+        for el in tree.getroot().iter(ET.Element):
+            tag = _localname(el)
+            if tag == 'Page':
+                attr = 'imageFilename'
+            elif tag == 'AlternativeImage':
+                attr = 'filename'
+            else:
+                continue
+            old = el.get(attr)
+            if old in replacements:
+                el.set(attr, replacements[old])
+                changed = True
+        if changed:
+            tree.write(self.filename, xml_declaration=True, encoding='UTF-8')
+            self._page_attrib = None
+        return changed
+
+    def __repr__(self) -> str:
+        return f'OcrdPageLite({self.filename!r})'
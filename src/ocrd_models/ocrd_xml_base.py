@@ -1,6 +1,7 @@
 """
 Base class for XML documents loaded from either content or filename.
 """
+from io import BytesIO
 from os.path import exists
 from lxml import etree as ET
 
@@ -8,6 +9,8 @@ from .constants import NAMESPACES
 from .utils import xmllint_format
 
 
+XML_DECLARATION = b'<?xml version="1.0" encoding="UTF-8"?>\n'
+
 for curie in NAMESPACES:
     ET.register_namespace(curie, NAMESPACES[curie])
 
@@ -43,10 +46,24 @@ class OcrdXmlDocument():
         Serialize all properties as pretty-printed XML
 
         Args:
-            xmllint (boolean): Format with ``xmllint`` in addition to pretty-printing
+            xmllint (boolean): Format like ``xmllint`` (cf. :py:func:`ocrd_models.utils.xmllint_format`)
+                in addition to pretty-printing
         """
-        root = self._tree.getroot()
-        ret = ET.tostring(ET.ElementTree(root), pretty_print=True, encoding='UTF-8')
         if xmllint:
-            ret = xmllint_format(ret)
-        return ret
+            f = BytesIO()
+            self.write(f)
+            return f.getvalue()
+        return ET.tostring(ET.ElementTree(self._tree.getroot()), pretty_print=True, encoding='UTF-8')
+
+    def write(self, f):
+        """
+        Serialize as XML formatted like ``xmllint`` (i.e. the same as ``to_xml(xmllint=True)``)
+        into the binary file object :py:attr:`f`, streaming the output.
+        """
+        # re-parse without blank text, leaving the document itself alone
+        # (do not indent before, or it would become significant under xml:space="preserve")
+        parser = ET.XMLParser(resolve_entities=False, strip_cdata=False, remove_blank_text=True)
+        root = ET.fromstring(ET.tostring(self._tree, encoding='UTF-8'), parser)
+        f.write(XML_DECLARATION)
+        with ET.xmlfile(f, encoding='UTF-8') as xf:
+            xf.write(root, pretty_print=True)
@@ -3,16 +3,15 @@ from datetime import datetime
 from fastapi import UploadFile
 from functools import wraps
 from hashlib import md5
-from re import compile as re_compile, split as re_split
 from requests import get as requests_get, Session as Session_TCP
 from requests_unixsocket import Session as Session_UDS
 from time import sleep
-from typing import List
+from typing import List, Union
 from uuid import uuid4
 
 from ocrd.resolver import Resolver
 from ocrd.workspace import Workspace
-from ocrd_utils import generate_range, REGEX_PREFIX
+from ocrd_models import PageSelector
 from .rabbitmq_utils import OcrdResultMessage
 
 
@@ -43,18 +42,11 @@ def convert_url_to_uds_format(url: str) -> str:
     return f"http+unix://{url.replace('/', '%2F')}"
 
 
-def expand_page_ids(page_id: str) -> List:
-    page_ids = []
+def expand_page_ids(page_id: Union[str, PageSelector]) -> List:
     if not page_id:
-        return page_ids
-    for page_id_token in re_split(pattern=r',', string=page_id):
-        if page_id_token.startswith(REGEX_PREFIX):
-            page_ids.append(re_compile(pattern=page_id_token[len(REGEX_PREFIX):]))
-        elif '..' in page_id_token:
-            page_ids += generate_range(*page_id_token.split(sep='..', maxsplit=1))
-        else:
-            page_ids += [page_id_token]
-    return page_ids
+        return []
+    # parsed only once for the same page_id
+    return PageSelector.compile(page_id).expand()
 
 
 def generate_created_time() -> int:
@@ -0,0 +1,8 @@
+def get_polygon(self):
+    """
+    Get coordinate polygon as a (read-only) numpy array of points,
+    cf. :py:func:`ocrd_utils.polygon_from_points` with ``as_array=True``
+    (which caches the result for the same ``points``).
+    """
+    from ocrd_utils import polygon_from_points  # pylint: disable=import-outside-toplevel
+    return polygon_from_points(self.points, as_array=True)
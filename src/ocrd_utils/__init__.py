@@ -2,7 +2,9 @@
 Utility functions and constants usable in various circumstances.
 
 * :py:func:`coordinates_of_segment`,
-  :py:func:`coordinates_for_segment`
+  :py:func:`coordinates_for_segment`,
+  :py:func:`coordinates_of_segments`,
+  :py:func:`coordinates_for_segments`
 
     These functions convert polygon outlines for PAGE elements on all hierarchy
     levels below page (i.e. region, line, word, glyph) between relative coordinates
@@ -11,6 +13,7 @@ Utility functions and constants usable in various circumstances.
     (Used by :py:class:`ocrd.workspace.Workspace` methods 
     :py:meth:`ocrd.workspace.Workspace.image_from_page` and 
     :py:meth:`ocrd.workspace.Workspace.image_from_segment`.)
+    The plural variants transform many segments sharing the same parent at once.
 
 * :py:func:`rotate_coordinates`, 
   :py:func:`shift_coordinates`,
@@ -33,10 +36,21 @@ Utility functions and constants usable in various circumstances.
     `transpose` methods.
 
 * :py:func:`image_from_polygon`,
+  :py:func:`crop_image_to_polygon`,
   :py:func:`polygon_mask`
 
     These functions apply polygon masks to `PIL.Image` objects.
 
+* :py:func:`rotate_array`,
+  :py:func:`crop_array`,
+  :py:func:`transpose_array`,
+  :py:func:`array_from_polygon`,
+  :py:func:`crop_array_to_polygon`,
+  :py:func:`polygon_mask_array`
+
+    These functions are equivalents of the above for `numpy` arrays
+    (as in ``numpy.asarray(image)``), returning views where possible.
+
 * :py:func:`xywh_from_points`,
   :py:func:`points_from_xywh`,
   :py:func:`polygon_from_points` etc.
@@ -60,6 +74,10 @@ Utility functions and constants usable in various circumstances.
 
       (produced by `tesserocr`)
     * `y0x0y1x1` is the same as `x0y0x1y1` with positions of `x` and `y` in the list swapped
+    * `ragged` is a tuple of a numpy array of the points of many polygons (with shape N×2)
+      and a numpy array of offsets where each polygon starts (plus the total length)
+
+      (used to convert and transform the polygons of many segments at once)
 
 * :py:func:`is_file_in_directory`
   :py:func:`is_local_filename`,
@@ -128,15 +146,22 @@ from .deprecate import (
 from .image import (
     adjust_canvas_to_rotation,
     adjust_canvas_to_transposition,
+    array_from_polygon,
     bbox_from_points,
     bbox_from_polygon,
     bbox_from_xywh,
     coordinates_for_segment,
     coordinates_of_segment,
+    coordinates_for_segments,
+    coordinates_of_segments,
+    crop_array,
+    crop_array_to_polygon,
     crop_image,
+    crop_image_to_polygon,
     image_from_polygon,
     points_from_bbox,
     points_from_polygon,
+    points_from_ragged,
     points_from_x0y0x1y1,
     points_from_xywh,
     points_from_y0x0y1x1,
@@ -145,10 +170,16 @@ from .image import (
     polygon_from_x0y0x1y1,
     polygon_from_xywh,
     polygon_mask,
+    polygon_mask_array,
+    polygons_from_ragged,
+    ragged_from_points,
+    ragged_from_polygons,
+    rotate_array,
     rotate_coordinates,
     rotate_image,
     shift_coordinates,
     transform_coordinates,
+    transpose_array,
     transpose_coordinates,
     transpose_image,
     xywh_from_bbox,
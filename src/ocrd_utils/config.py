@@ -105,11 +105,79 @@ config.add('OCRD_METS_CACHING',
     validator=lambda val: val in ('true', 'false', '0', '1'),
     parser=lambda val: val in ('true', '1'))
 
+config.add('OCRD_METS_INDEX',
+    description='If set to `true`, searching files in a cached METS (cf. `OCRD_METS_CACHING`) uses a columnar index of interned file attributes, answering queries by set intersection.',
+    validator=lambda val: val in ('true', 'false', '0', '1'),
+    parser=lambda val: val in ('true', '1'))
+
+config.add('OCRD_METS_LAZY',
+    description='If set to `true`, workspaces load their METS file lazily, materialising the `mets:file` entries of a `mets:fileGrp` only when searched for (speeding up read-mostly access to very large METS files).',
+    validator=lambda val: isinstance(val, bool) or val in ('true', 'false', '0', '1'),
+    parser=lambda val: val in ('true', '1', True),
+    default=(True, False))
+
+config.add('OCRD_METS_JOURNAL',
+    description='If set to `true`, saving the METS of a workspace only appends the changes since the last save to a journal file next to it (`mets.xml.journal`), which is replayed when loading the workspace, instead of rewriting the complete file every time.',
+    validator=lambda val: isinstance(val, bool) or val in ('true', 'false', '0', '1'),
+    parser=lambda val: val in ('true', '1', True),
+    default=(True, False))
+
+config.add('OCRD_METS_JOURNAL_MAX',
+    description='Maximum number of entries in the METS journal (cf. `OCRD_METS_JOURNAL`) before the next save compacts it into a complete rewrite of the METS file.',
+    parser=int,
+    default=(True, 1000))
+
 config.add('OCRD_MAX_PROCESSOR_CACHE',
     description="Maximum number of processor instances (for each set of parameters) to be kept in memory (including loaded models) for processing workers or processor servers.",
     parser=int,
     default=(True, 128))
 
+config.add("OCRD_MAX_EXIF_CACHE",
+    description="Maximum number of image metadata (`OcrdExif`) results to be kept in memory, keyed by path, inode, mtime and size of the image file.",
+    parser=int,
+    default=(True, 1024))
+
+config.add("OCRD_EXIF_SIDECAR",
+    description="If set to `true`, image metadata (`OcrdExif`) of workspace files is also persisted in a `.ocrd-exif.json` file in the workspace directory, (merged with its current content when saving the METS), so subsequent processors can reuse it.",
+    validator=lambda val: isinstance(val, bool) or val in ('true', 'false', '0', '1'),
+    parser=lambda val: val in ('true', '1', True),
+    default=(True, False))
+
+config.add("OCRD_MAX_IMAGE_CACHE",
+    description="Maximum number of bytes of decoded (and cropped/deskewed) images to be kept in memory by `Workspace.image_from_page`, keyed by image files and selectors (0 disables the cache).",
+    parser=int,
+    default=(True, 256 * 1024 * 1024))
+
+config.add("OCRD_MAX_SEGMENT_WORKERS",
+    description="Number of threads for extracting segment images in parallel in `Workspace.image_from_segments`.",
+    parser=int,
+    validator=lambda val: int(val) > 0,
+    default=(True, 1))
+
+config.add("OCRD_MAX_PARALLEL_PAGES",
+    description="Maximum number of pages to process in parallel (for processors implementing `process_page_file`), unless overridden by `--jobs`.",
+    parser=int,
+    validator=lambda val: int(val) > 0,
+    default=(True, 1))
+
+config.add("OCRD_PARALLEL_PAGES_POOL",
+    description="""\
+Kind of worker pool to use when processing pages in parallel:
+- `thread`: pages share the processor instance in a thread pool
+- `process`: pages are processed in forked worker processes
+""",
+    validator=lambda val: val in ('thread', 'process'),
+    default=(True, 'thread'))
+
+config.add("OCRD_MISSING_OUTPUT",
+    description="""\
+How to deal with errors in a single page (for processors implementing `process_page_file`):
+- `SKIP`: log the error and continue with the next page (but fail if no page succeeded)
+- `ABORT`: re-raise the error, stopping the processor
+""",
+    validator=lambda val: val in ('SKIP', 'ABORT'),
+    default=(True, 'SKIP'))
+
 config.add("OCRD_PROFILE",
     description="""\
 Whether to enable gathering runtime statistics
@@ -141,6 +209,53 @@ config.add("OCRD_DOWNLOAD_TIMEOUT",
     description="Timeout in seconds for connecting or reading (comma-separated) when downloading.",
     parser=_ocrd_download_timeout_parser)
 
+config.add("OCRD_METS_SERVER_POOL_SIZE",
+    description="Maximum number of keep-alive connections each METS server client keeps open (shared by its threads).",
+    validator=int,
+    parser=int,
+    default=(True, 10))
+
+config.add("OCRD_METS_SERVER_RETRIES",
+    description="Number of times to retry failed attempts to connect to the METS server (or to read from it for queries).",
+    validator=int,
+    parser=int,
+    default=(True, 3))
+
+config.add("OCRD_METS_SERVER_TIMEOUT",
+    description="Timeout in seconds for connecting or reading (comma-separated) when talking to the METS server.",
+    parser=_ocrd_download_timeout_parser)
+
+config.add("OCRD_METS_SERVER_MSGPACK",
+    description="If set to `true`, METS server clients exchange files with the server as msgpack instead of JSON (falling back to JSON for servers without msgpack support).",
+    validator=lambda val: isinstance(val, bool) or val in ('true', 'false', '0', '1'),
+    parser=lambda val: val in ('true', '1', True),
+    default=(True, True))
+
+config.add("OCRD_METS_SERVER_CACHE_SIZE",
+    description="Maximum number of query results (like `find_files`) each METS server client caches until the METS changes (0 to disable).",
+    parser=int,
+    default=(True, 256))
+
+config.add("OCRD_METS_SERVER_CACHE_TTL",
+    description="Time in seconds during which METS server clients use cached query results without asking the server whether the METS changed (changes by other clients may go unnoticed that long, set to `0` to ask on every use).",
+    parser=float,
+    default=(True, 1))
+
+config.add("OCRD_METS_SERVER_FLUSH_CHANGES",
+    description="Number of changes after which the METS server saves the METS in the background (0 to disable).",
+    parser=int,
+    default=(True, 0))
+
+config.add("OCRD_METS_SERVER_FLUSH_INTERVAL",
+    description="Maximum time in seconds that changes to the METS server remain unsaved before it saves the METS in the background (0 to disable).",
+    parser=float,
+    default=(True, 0))
+
+config.add("OCRD_METS_SERVER_FLUSH_IDLE",
+    description="Time in seconds without changes after which the METS server saves the METS in the background (0 to disable).",
+    parser=float,
+    default=(True, 0))
+
 config.add("OCRD_NETWORK_SERVER_ADDR_PROCESSING",
         description="Default address of Processing Server to connect to (for `ocrd network client processing`).",
         default=(True, ''))
@@ -1,7 +1,10 @@
+import re
 import sys
+from functools import lru_cache
+from itertools import chain
 
 import numpy as np
-from PIL import Image, ImageStat, ImageDraw, ImageChops
+from PIL import Image, ImageStat, ImageDraw, ImageChops, ImageColor
 
 from .logging import getLogger
 from .introspect import membername
@@ -13,14 +16,21 @@ Image.MAX_IMAGE_PIXELS = 40_000 ** 2
 __all__ = [
     'adjust_canvas_to_rotation',
     'adjust_canvas_to_transposition',
+    'array_from_polygon',
     'bbox_from_points',
     'bbox_from_polygon',
     'bbox_from_xywh',
     'coordinates_for_segment',
     'coordinates_of_segment',
+    'coordinates_for_segments',
+    'coordinates_of_segments',
+    'crop_array',
+    'crop_array_to_polygon',
+    'crop_image_to_polygon',
     'image_from_polygon',
     'points_from_bbox',
     'points_from_polygon',
+    'points_from_ragged',
     'points_from_x0y0x1y1',
     'points_from_xywh',
     'points_from_y0x0y1x1',
@@ -29,10 +39,16 @@ __all__ = [
     'polygon_from_x0y0x1y1',
     'polygon_from_xywh',
     'polygon_mask',
+    'polygon_mask_array',
+    'polygons_from_ragged',
+    'ragged_from_points',
+    'ragged_from_polygons',
+    'rotate_array',
     'rotate_coordinates',
     'shift_coordinates',
     'scale_coordinates',
     'transform_coordinates',
+    'transpose_array',
     'transpose_coordinates',
     'xywh_from_bbox',
     'xywh_from_points',
@@ -72,6 +88,19 @@ def adjust_canvas_to_transposition(size, method):
         size = size[::-1]
     return size
 
+# whitespace-separated pairs of comma-separated numbers
+_POINTS_SYNTAX = re.compile(r'\s*[^\s,]+,[^\s,]+(?:\s+[^\s,]+,[^\s,]+)*\s*')
+
+def _array_from_points(points):
+    if not _POINTS_SYNTAX.fullmatch(points):
+        raise ValueError("invalid points '%s'" % points)
+    # parse all numbers at once in C (instead of splitting pairs in Python)
+    values = np.fromstring(points.replace(',', ' '), dtype=float, sep=' ')
+    if points.count(',') * 2 != len(values):
+        raise ValueError("invalid points '%s'" % points)
+    values.shape = (-1, 2) # no view, so it can be made read-only
+    return values
+
 def bbox_from_points(points):
     """Construct a numeric list representing a bounding box from polygon coordinates in page representation."""
     xys = [[int(p) for p in pair.split(',')] for pair in points.split(' ')]
@@ -133,21 +162,34 @@ def coordinates_of_segment(segment, parent_image, parent_coords):
     Return the rounded numpy array of the resulting polygon.
     """
     # get polygon:
-    polygon = np.array(polygon_from_points(segment.get_Coords().points))
+    polygon = polygon_from_points(segment.get_Coords().points, as_array=True)
     # apply affine transform:
     polygon = transform_coordinates(polygon, parent_coords['transform'])
     return np.round(polygon).astype(np.int32)
 
-def polygon_from_points(points):
+def polygon_from_points(points, as_array=False):
     """
     Convert polygon coordinates in page representation to polygon coordinates in numeric list representation.
+
+    If ``as_array``, then parse all numbers at once and return a read-only float numpy
+    array (with shape N×2) instead, which is cached for the same ``points`` (so parsing
+    the coordinates of the same segment again is free, while changing them invalidates
+    the cache implicitly).
     """
+    if as_array:
+        return _cached_array_from_points(points)
     polygon = []
     for pair in points.split(" "):
         x_y = pair.split(",")
         polygon.append([float(x_y[0]), float(x_y[1])])
     return polygon
 
+@lru_cache(maxsize=1 << 15)
+def _cached_array_from_points(points):
+    polygon = _array_from_points(points)
+    polygon.flags.writeable = False
+    return polygon
+
 
 def coordinates_for_segment(polygon, parent_image, parent_coords):
     """Convert relative coordinates to absolute.
@@ -182,6 +224,36 @@ def coordinates_for_segment(polygon, parent_image, parent_coords):
     polygon = transform_coordinates(polygon, inv_transform)
     return np.round(polygon).astype(np.int32)
 
+def coordinates_of_segments(segments, parent_image, parent_coords):
+    """Extract the coordinates of many PAGE segment elements relative to their parent.
+
+    Like :py:func:`coordinates_of_segment`, but for a sequence of ``segments``
+    (which all share the same ``parent_coords``): parse all their points into
+    one ragged buffer (cf. :py:func:`ragged_from_points`) and apply the affine
+    transform to all of them in a single operation.
+
+    Return a list of rounded numpy arrays of the resulting polygons.
+    """
+    points, offsets = ragged_from_polygons([polygon_from_points(segment.get_Coords().points, as_array=True)
+                                            for segment in segments])
+    points = transform_coordinates(points, parent_coords['transform'])
+    return polygons_from_ragged(np.round(points).astype(np.int32), offsets)
+
+def coordinates_for_segments(polygons, parent_image, parent_coords):
+    """Convert many relative polygons to absolute.
+
+    Like :py:func:`coordinates_for_segment`, but for a sequence of ``polygons``
+    (which all share the same ``parent_coords``): concatenate them into one
+    ragged buffer (cf. :py:func:`ragged_from_polygons`) and apply the inverse
+    affine transform to all of them in a single operation.
+
+    Return a list of rounded numpy arrays of the resulting polygons
+    (cf. :py:func:`points_from_ragged` to serialise them all at once).
+    """
+    points, offsets = ragged_from_polygons(polygons)
+    points = transform_coordinates(points.astype(np.float32), np.linalg.inv(parent_coords['transform']))
+    return polygons_from_ragged(np.round(points).astype(np.int32), offsets)
+
 def polygon_mask(image, coordinates):
     """"Create a mask image of a polygon.
 
@@ -500,10 +572,13 @@ def image_from_polygon(image, polygon, fill='background', transparency=False):
     
     Return a new PIL.Image.
     """
+    return _image_from_mask(image, lambda: polygon_mask(image, polygon), fill, transparency)
+
+def _image_from_mask(image, make_mask, fill, transparency):
     if fill == 'none' or fill is None:
         new_image = image.copy()
     else:
-        mask = polygon_mask(image, polygon)
+        mask = make_mask()
         if fill == 'background':
             background = ImageStat.Stat(image, mask=mask)
             if len(background.bands) > 1:
@@ -528,6 +603,201 @@ def image_from_polygon(image, polygon, fill='background', transparency=False):
         new_image.putalpha(mask)
     return new_image
 
+def crop_image_to_polygon(image, polygon, fill='background', transparency=False):
+    """"Mask an image with a polygon and crop to its bounding box.
+
+    Given a PIL.Image ``image`` and a numpy array ``polygon``
+    of relative coordinates into the image, produce the same
+    result as ``crop_image(image_from_polygon(image, polygon, ...),
+    box=bbox_from_polygon(polygon))``, but without masking and
+    copying the full image: cut out the window of the bounding box
+    (including its last row and column, which the background estimation
+    of :py:func:`crop_image` covers) first, and mask only that.
+
+    Return a new PIL.Image.
+    """
+    box = bbox_from_polygon(polygon)
+    x0, y0, x1, y1 = (max(box[0], 0), max(box[1], 0),
+                      min(box[2] + 1, image.width), min(box[3] + 1, image.height))
+    if x0 >= x1 or y0 >= y1:
+        # segment entirely outside of image
+        return crop_image(image_from_polygon(image, polygon, fill=fill, transparency=transparency), box=box)
+    def make_mask():
+        # only shift vertically: PIL's polygon rasterization is invariant
+        # under integer translation in y, but not always in x
+        mask = Image.new('L', (x1, y1 - y0), 0)
+        ImageDraw.Draw(mask).polygon(list(map(tuple, polygon - np.array([0, y0]))), outline=0, fill=255)
+        return mask.crop((x0, 0, x1, y1 - y0))
+    window_image = _image_from_mask(image.crop((x0, y0, x1, y1)), make_mask, fill, transparency)
+    return crop_image(window_image, box=(box[0] - x0, box[1] - y0, box[2] - x0, box[3] - y0))
+
+def _array_mode(array):
+    # PIL mode corresponding to a numpy array (as in PIL.Image.fromarray)
+    if array.dtype == bool:
+        return '1'
+    if array.ndim == 2:
+        return 'L'
+    return {2: 'LA', 3: 'RGB', 4: 'RGBA'}[array.shape[2]]
+
+def _array_color(array, fill):
+    # convert a PIL color specifier into pixel values for ``array``
+    if isinstance(fill, str):
+        fill = ImageColor.getcolor(fill, _array_mode(array))
+    return np.asarray(fill).astype(array.dtype)
+
+def _array_median(values):
+    # median of a list of pixels (optionally with bands) as in PIL.ImageStat,
+    # i.e. the lowest value above half of the pixels (or 255 if there are none)
+    if not len(values):
+        return np.full(values.shape[1:], 255).astype(values.dtype)
+    half = len(values) // 2
+    if values.ndim == 2 and values.shape[1] == 2:
+        # PIL's masked histogram of LA images repeats the L band for A
+        values = values[:, :1].repeat(2, axis=1)
+    if values.dtype != np.uint8:
+        return np.partition(values, half, axis=0)[half]
+    # 8-bit: cumulative histogram per band (linear instead of a partial sort)
+    bands = values.reshape(len(values), -1)
+    median = [np.argmax(np.cumsum(np.bincount(band, minlength=256)) > half) for band in bands.T]
+    return np.array(median, dtype=np.uint8).reshape(values.shape[1:])
+
+def polygon_mask_array(array, coordinates):
+    """"Create a mask array of a polygon.
+
+    Like :py:func:`polygon_mask`, but given a numpy array ``array``
+    (merely for dimensions), return a boolean numpy array which is
+    true for everything inside the polygon hull.
+    """
+    mask = Image.new('L', (array.shape[1], array.shape[0]), 0)
+    ImageDraw.Draw(mask).polygon(list(map(tuple, coordinates)), outline=0, fill=255)
+    return np.asarray(mask) > 0
+
+def rotate_array(array, angle, fill='background', transparency=False):
+    """"Rotate an image array, enlarging and filling with background.
+
+    Like :py:func:`rotate_image`, but for a numpy array ``array``
+    (with shape height×width or height×width×bands, as in ``numpy.asarray(image)``).
+
+    Return a new numpy array.
+    """
+    # (rotation is delegated to PIL to get the exact same canvas and resampling)
+    return np.asarray(rotate_image(Image.fromarray(array), angle, fill=fill, transparency=transparency))
+
+def transpose_array(array, method):
+    """"Transpose (i.e. flip or rotate in 90° multiples) an image array.
+
+    Like :py:func:`transpose_image`, but for a numpy array ``array``
+    (with shape height×width or height×width×bands, as in ``numpy.asarray(image)``).
+
+    Return a numpy array view (without copying).
+    """
+    LOG = getLogger('ocrd.utils.transpose_image')
+    LOG.debug('transposing image array with %s', membername(Image, method))
+    if method == Image.FLIP_LEFT_RIGHT:
+        return array[:, ::-1]
+    if method == Image.FLIP_TOP_BOTTOM:
+        return array[::-1]
+    if method == Image.ROTATE_90:
+        return np.rot90(array, 1)
+    if method == Image.ROTATE_180:
+        return array[::-1, ::-1]
+    if method == Image.ROTATE_270:
+        return np.rot90(array, 3)
+    if method == Image.TRANSPOSE:
+        return np.swapaxes(array, 0, 1)
+    if method == Image.TRANSVERSE:
+        return np.swapaxes(array, 0, 1)[::-1, ::-1]
+    raise ValueError("Unknown transposition method %s" % method)
+
+def crop_array(array, box=None):
+    """"Crop an image array to a rectangle, filling with background.
+
+    Like :py:func:`crop_image`, but for a numpy array ``array``
+    (with shape height×width or height×width×bands, as in ``numpy.asarray(image)``).
+
+    Return a numpy array view (without copying) if ``box`` lies within ``array``,
+    otherwise a new numpy array.
+    """
+    LOG = getLogger('ocrd.utils.crop_image')
+    height, width = array.shape[:2]
+    if not box:
+        return array
+    minx, miny, maxx, maxy = box
+    if minx >= 0 and miny >= 0 and maxx <= width and maxy <= height:
+        return array[miny:maxy, minx:maxx]
+    # (It should be invalid in PAGE-XML to extend beyond parents.)
+    LOG.warning('crop coordinates (%s) exceed image (%dx%d)',
+                str(box), width, height)
+    background = _array_median(array[polygon_mask_array(array, polygon_from_bbox(*box))])
+    new_array = np.empty((maxy - miny, maxx - minx) + array.shape[2:], dtype=array.dtype)
+    new_array[...] = background
+    x0, y0 = max(minx, 0), max(miny, 0)
+    x1, y1 = min(maxx, width), min(maxy, height)
+    if x0 < x1 and y0 < y1:
+        new_array[y0 - miny:y1 - miny, x0 - minx:x1 - minx] = array[y0:y1, x0:x1]
+    return new_array
+
+def array_from_polygon(array, polygon, fill='background', transparency=False):
+    """"Mask an image array with a polygon.
+
+    Like :py:func:`image_from_polygon`, but for a numpy array ``array``
+    (with shape height×width or height×width×bands, as in ``numpy.asarray(image)``).
+    Adding transparency adds a band (i.e. L becomes LA and RGB becomes RGBA).
+
+    Return a new numpy array (or ``array`` itself if there is nothing to mask).
+    """
+    return _array_from_mask(array, lambda: polygon_mask_array(array, polygon), fill, transparency)
+
+def _array_from_mask(array, make_mask, fill, transparency):
+    mask = None
+    if fill == 'none' or fill is None:
+        new_array = array
+    else:
+        mask = make_mask()
+        if fill == 'background':
+            background = _array_median(array[mask])
+        else:
+            background = _array_color(array, fill)
+        new_array = np.where(mask[:, :, np.newaxis] if array.ndim == 3 else mask, array, background)
+    mode = _array_mode(array)
+    if mode in ['RGBA', 'LA']:
+        # ensure transparency maximizes (i.e. parent mask AND mask):
+        if mask is None:
+            mask = make_mask()
+        new_array = new_array.copy() if new_array is array else new_array
+        new_array[:, :, -1] = np.minimum(mask * np.uint8(255), array[:, :, -1])
+    elif transparency and mode in ['RGB', 'L']:
+        # introduce transparency:
+        if mask is None:
+            mask = make_mask()
+        alpha = mask * np.uint8(255)
+        new_array = np.concatenate([new_array.reshape(new_array.shape[:2] + (-1,)),
+                                    alpha[:, :, np.newaxis]], axis=2)
+    return new_array
+
+def crop_array_to_polygon(array, polygon, fill='background', transparency=False):
+    """"Mask an image array with a polygon and crop to its bounding box.
+
+    Like :py:func:`crop_image_to_polygon`, but for a numpy array ``array``
+    (with shape height×width or height×width×bands, as in ``numpy.asarray(image)``).
+
+    Return a new numpy array (or a view of ``array`` if there is nothing to mask).
+    """
+    box = bbox_from_polygon(polygon)
+    height, width = array.shape[:2]
+    x0, y0, x1, y1 = (max(box[0], 0), max(box[1], 0),
+                      min(box[2] + 1, width), min(box[3] + 1, height))
+    if x0 >= x1 or y0 >= y1:
+        # segment entirely outside of image
+        return crop_array(array_from_polygon(array, polygon, fill=fill, transparency=transparency), box=box)
+    def make_mask():
+        # only shift vertically (cf. crop_image_to_polygon)
+        mask = Image.new('L', (x1, y1 - y0), 0)
+        ImageDraw.Draw(mask).polygon(list(map(tuple, polygon - np.array([0, y0]))), outline=0, fill=255)
+        return np.asarray(mask)[:, x0:] > 0
+    window_array = _array_from_mask(array[y0:y1, x0:x1], make_mask, fill, transparency)
+    return crop_array(window_array, box=(box[0] - x0, box[1] - y0, box[2] - x0, box[3] - y0))
+
 def points_from_bbox(minx, miny, maxx, maxy):
     """Construct polygon coordinates in page representation from a numeric list representing a bounding box."""
     return "%i,%i %i,%i %i,%i %i,%i" % (
@@ -535,7 +805,57 @@ def points_from_bbox(minx, miny, maxx, maxy):
 
 def points_from_polygon(polygon):
     """Convert polygon coordinates from a numeric list representation to a page representation."""
-    return " ".join("%i,%i" % (x, y) for x, y in polygon)
+    if isinstance(polygon, np.ndarray):
+        # formatting numpy scalars is slow
+        polygon = polygon.tolist()
+    elif not isinstance(polygon, (list, tuple)):
+        # e.g. zip or generator
+        polygon = list(polygon)
+    return ('%i,%i ' * len(polygon) % tuple(chain.from_iterable(polygon)))[:-1]
+
+def ragged_from_points(points_list):
+    """
+    Convert a sequence of polygon coordinates in page representation to a ragged array.
+
+    Return a tuple of a float numpy array of all points (with shape N×2)
+    and a numpy array of offsets into it (with length one more than
+    ``points_list``, where polygon ``i`` is ``points[offsets[i]:offsets[i+1]]``).
+    """
+    points_list = list(points_list)
+    offsets = np.zeros(len(points_list) + 1, dtype=np.int64)
+    np.cumsum([points.count(',') for points in points_list], out=offsets[1:])
+    if not points_list:
+        return np.empty((0, 2)), offsets
+    return _array_from_points(' '.join(points_list)), offsets
+
+def ragged_from_polygons(polygons):
+    """
+    Convert a sequence of polygons in numeric list representation to a ragged array
+    (cf. :py:func:`ragged_from_points`).
+    """
+    polygons = [np.asarray(polygon).reshape(-1, 2) for polygon in polygons]
+    offsets = np.zeros(len(polygons) + 1, dtype=np.int64)
+    np.cumsum([len(polygon) for polygon in polygons], out=offsets[1:])
+    if not polygons:
+        return np.empty((0, 2)), offsets
+    return np.concatenate(polygons), offsets
+
+def polygons_from_ragged(points, offsets):
+    """
+    Split a ragged array of polygons (cf. :py:func:`ragged_from_points`)
+    into a list of numpy arrays (views into ``points``).
+    """
+    return [points[start:end] for start, end in zip(offsets[:-1].tolist(), offsets[1:].tolist())]
+
+def points_from_ragged(points, offsets):
+    """
+    Convert a ragged array of polygons (cf. :py:func:`ragged_from_points`)
+    to a list of polygon coordinates in page representation
+    (formatting all points at once, otherwise like :py:func:`points_from_polygon`).
+    """
+    points = np.asarray(points).reshape(-1, 2).astype(np.int64)
+    pairs = (('%d,%d\n' * len(points)) % tuple(points.ravel().tolist())).split('\n')
+    return [' '.join(pairs[start:end]) for start, end in zip(offsets[:-1].tolist(), offsets[1:].tolist())]
 
 def points_from_xywh(box):
     """
@@ -271,7 +271,7 @@ def validate_consistency(node, page_textequiv_consistency, page_textequiv_strate
             parent = node
         if parent:
             parent_points = parent.get_Coords().points
-            node_poly = make_poly(polygon_from_points(parent_points))
+            node_poly = make_poly(polygon_from_points(parent_points, as_array=True))
             if not isinstance(node_poly, Polygon):
                 report.add_error(CoordinateValidityError(tag, node_id, file_id,
                                                          parent_points, node_poly))
@@ -309,7 +309,7 @@ def validate_consistency(node, page_textequiv_consistency, page_textequiv_strate
             if check_coords and node_poly:
                 child_tag = child.original_tagname_
                 child_points = child.get_Coords().points
-                child_poly = make_poly(polygon_from_points(child_points))
+                child_poly = make_poly(polygon_from_points(child_points, as_array=True))
                 if not isinstance(child_poly, Polygon):
                     # report.add_error(CoordinateValidityError(child_tag, child.id, file_id, child_points))
                     # log.debug("Invalid coords of %s %s", child_tag, child.id)
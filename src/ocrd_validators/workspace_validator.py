@@ -6,8 +6,9 @@ from traceback import format_exc
 from pathlib import Path
 
 from ocrd_utils import getLogger, MIMETYPE_PAGE, pushd_popd, is_local_filename, DEFAULT_METS_BASENAME
-from ocrd_models import ValidationReport
-from ocrd_modelfactory import page_from_file
+from ocrd_models import ValidationReport, OcrdPageLite
+from ocrd_models.ocrd_exif import identify_resolutions
+from ocrd_modelfactory import page_from_file, exif_from_filename
 
 from .constants import FILE_GROUP_CATEGORIES, FILE_GROUP_PREFIX
 from .page_validator import PageValidator
@@ -190,8 +191,7 @@ class WorkspaceValidator():
                 self.log.warning("Not available locally and 'download' is not set: %s", f)
                 continue
             self.workspace.download_file(f)
-            page = page_from_file(f).get_Page()
-            imageFilename = page.imageFilename
+            imageFilename = OcrdPageLite(f.local_filename).imageFilename
             if not self.mets.find_files(url=imageFilename, **self.find_kwargs):
                 self.report.add_error("PAGE-XML %s : imageFilename '%s' not found in METS" % (f.local_filename, imageFilename))
             if is_local_filename(imageFilename) and not Path(imageFilename).exists():
@@ -241,12 +241,17 @@ class WorkspaceValidator():
         See `spec <https://ocr-d.github.io/mets#pixel-density-of-images-must-be-explicit-and-high-enough>`_.
         """
         self.log.debug('_validate_pixel_density')
+        files = []
         for f in self.mets.find_files(mimetype='//image/.*', **self.find_kwargs):
             if not f.local_filename and not self.download:
                 self.log.warning("Not available locally and 'download' is not set: %s", f)
                 continue
-            self.workspace.download_file(f)
-            exif = self.workspace.resolve_image_exif(f.local_filename)
+            files.append(self.workspace.download_file(f))
+        # TIFF/PNG/JPEG headers are read directly, probe all other formats in one go
+        resolutions = identify_resolutions([f.local_filename for f in files
+                                            if f.mimetype not in ('image/tiff', 'image/png', 'image/jpeg')])
+        for f in files:
+            exif = exif_from_filename(f.local_filename, resolution=resolutions.get(str(f.local_filename)))
             for k in ['xResolution', 'yResolution']:
                 v = exif.__dict__.get(k)
                 if v is None or v <= 72:
@@ -318,22 +323,23 @@ class WorkspaceValidator():
                                                      check_coords=self.page_coordinate_consistency in ['poly', 'both'],
                                                      check_baseline=self.page_coordinate_consistency in ['baseline', 'both'])
                 self.report.merge_report(page_report)
-            pcgts = page_from_file(f)
-            page = pcgts.get_Page()
+            # attributes only, without building the object tree
+            page_lite = OcrdPageLite(f.local_filename)
             if 'dimension' in self.page_checks:
+                page = page_from_file(f).get_Page()
                 _, _, exif = self.workspace.image_from_page(page, f.pageId)
                 if page.imageHeight != exif.height:
                     self.report.add_error("PAGE '%s': @imageHeight != image's actual height (%s != %s)" % (f.ID, page.imageHeight, exif.height))
                 if page.imageWidth != exif.width:
                     self.report.add_error("PAGE '%s': @imageWidth != image's actual width (%s != %s)" % (f.ID, page.imageWidth, exif.width))
             if 'imagefilename' in self.page_checks:
-                imageFilename = page.imageFilename
+                imageFilename = page_lite.imageFilename
                 if not self.mets.find_files(url=imageFilename):
                     self.report.add_error("PAGE-XML %s : imageFilename '%s' not found in METS" % (f.url, imageFilename))
                 if is_local_filename(imageFilename) and not Path(imageFilename).exists():
                     self.report.add_warning("PAGE-XML %s : imageFilename '%s' points to non-existent local file" % (f.url, imageFilename))
-            if 'mets_fileid_page_pcgtsid' in self.page_checks and pcgts.pcGtsId != f.ID:
-                self.report.add_warning('pc:PcGts/@pcGtsId differs from mets:file/@ID: "%s" !== "%s"' % (pcgts.pcGtsId or '', f.ID or ''))
+            if 'mets_fileid_page_pcgtsid' in self.page_checks and page_lite.pcGtsId != f.ID:
+                self.report.add_warning('pc:PcGts/@pcGtsId differs from mets:file/@ID: "%s" !== "%s"' % (page_lite.pcGtsId or '', f.ID or ''))
 
 
     def _validate_page_xsd(self):
@@ -59,6 +59,26 @@ class DummyProcessorWithOutput(Processor):
                 local_filename=os.path.join(self.output_file_grp, file_id),
                 content='CONTENT')
 
+class DummyPageProcessor(Processor):
+
+    def __init__(self, *args, **kwargs):
+        kwargs['ocrd_tool'] = DUMMY_TOOL
+        kwargs['version'] = '0.0.1'
+        super().__init__(*args, **kwargs)
+
+    def process_page_file(self, input_file):
+        file_id = make_file_id(input_file, self.output_file_grp)
+        self.workspace.add_file(
+            ID=file_id,
+            file_grp=self.output_file_grp,
+            pageId=input_file.pageId,
+            mimetype=input_file.mimetype,
+            local_filename=os.path.join(self.output_file_grp, file_id),
+            content='CONTENT %d' % os.getpid())
+        # fail after writing (some) output
+        if input_file.pageId == self.parameter['baz']:
+            raise ValueError("cannot process %s" % input_file.pageId)
+
 class IncompleteProcessor(Processor):
     pass
 
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
 import sys
+from shutil import which
 
 from PIL import Image, __version__ as pil_version
 
@@ -12,6 +13,8 @@ from tests.base import (
 )
 
 from ocrd_models import OcrdExif
+from ocrd_models.ocrd_exif import identify_resolutions
+import ocrd_models.ocrd_exif
 
 
 @pytest.mark.parametrize("path,width,height,xResolution,yResolution,resolution,resolutionUnit,photometricInterpretation,compression", [
@@ -65,5 +68,51 @@ def test_ocrd_exif_serialize_xml():
                 '</exif>')
     assert expected == exif.to_xml()
 
+@pytest.mark.parametrize("fmt,save_kwargs,xResolution,yResolution,resolutionUnit", [
+    ('TIFF', {'dpi': (300, 150)}, 300, 150, 'inches'),
+    ('TIFF', {'resolution': 118, 'resolution_unit': 3}, 118, 118, 'cm'),
+    ('TIFF', {}, 1, 1, 'inches'),
+    ('PNG', {'dpi': (300, 300)}, 118, 118, 'cm'),
+    ('PNG', {}, 1, 1, 'inches'),
+    ('JPEG', {'dpi': (300, 300)}, 300, 300, 'inches'),
+    ('JPEG', {}, 1, 1, 'inches'),
+])
+def test_ocrd_exif_header(tmpdir, monkeypatch, fmt, save_kwargs, xResolution, yResolution, resolutionUnit):
+    """Pixel density of TIFF/PNG/JPEG is read from the header without running identify"""
+    def fail(*args, **kwargs):
+        raise AssertionError("must not spawn a process")
+    monkeypatch.setattr(ocrd_models.ocrd_exif, 'run', fail)
+    path = str(tmpdir.join('img.' + fmt.lower()))
+    Image.new('RGB', (20, 10)).save(path, format=fmt, **save_kwargs)
+    with Image.open(path) as img:
+        exif = OcrdExif(img)
+    assert (exif.width, exif.height) == (20, 10)
+    assert exif.xResolution == xResolution
+    assert exif.yResolution == yResolution
+    assert exif.resolutionUnit == resolutionUnit
+
+def test_ocrd_exif_resolution_kwarg(tmpdir):
+    path = str(tmpdir.join('img.png'))
+    Image.new('L', (20, 10)).save(path, dpi=(300, 300))
+    with Image.open(path) as img:
+        exif = OcrdExif(img, resolution=(100, 400, 'inches'))
+    assert exif.resolution == 200
+    assert exif.resolutionUnit == 'inches'
+
+@pytest.mark.skipif(not which('identify'), reason="requires ImageMagick")
+def test_identify_resolutions(tmpdir):
+    paths = []
+    for i, dpi in enumerate([150, 300]):
+        paths.append(str(tmpdir.join('img%d.tif' % i)))
+        Image.new('RGB', (20, 10)).save(paths[-1], dpi=(dpi, dpi))
+    paths.append(str(tmpdir.join('missing.tif')))
+    assert identify_resolutions(paths) == {
+        paths[0]: (150, 150, 'inches'),
+        paths[1]: (300, 300, 'inches'),
+    }
+
+def test_identify_resolutions_empty():
+    assert identify_resolutions([]) == {}
+
 if __name__ == '__main__':
     main(__file__)
@@ -4,6 +4,7 @@ from datetime import datetime
 from os.path import join
 from os import environ
 from contextlib import contextmanager
+import json
 import re
 import shutil
 from lxml import etree as ET
@@ -19,7 +20,10 @@ from ocrd_utils import (
     MIMETYPE_PAGE
 )
 from ocrd_models import (
-    OcrdMets
+    OcrdMets,
+    LazyOcrdMets,
+    FileSelector,
+    PageSelector,
 )
 
 import pytest
@@ -416,5 +420,242 @@ def test_update_physical_page_attributes(sbb_directory_ocrd_mets):
     assert b'ORDERLABEL' in m.to_xml()
 
 
+@pytest.mark.parametrize('cache_flag', CACHING_ENABLED)
+def test_physical_page_for_file_consistency(cache_flag):
+    mets = OcrdMets.empty_mets(cache_flag=cache_flag)
+    for n in range(1, 4):
+        for grp in ['IMG', 'PAGE']:
+            mets.add_file(grp, ID=f'{grp}_{n}', mimetype='foo/bar', pageId=f'PHYS_{n}')
+    f = next(mets.find_files(ID='IMG_1'))
+    assert f.pageId == 'PHYS_1'
+    assert mets.get_physical_pages(for_fileIds=['PAGE_3', 'IMG_1', 'none']) == ['PHYS_3', 'PHYS_1', None]
+    mets.set_physical_page_for_file('PHYS_2', f)
+    assert f.pageId == 'PHYS_2'
+    assert mets.remove_physical_page_fptr('IMG_1') == ['PHYS_2']
+    assert f.pageId is None
+    mets.remove_one_file('IMG_2')
+    assert mets.get_physical_pages(for_fileIds=['IMG_2', 'PAGE_2']) == [None, 'PHYS_2']
+    mets.remove_physical_page('PHYS_3')
+    assert next(mets.find_files(ID='PAGE_3')).pageId is None
+    mets.add_file('IMG', ID='IMG_3', mimetype='foo/bar', force=True)
+    mets.add_file('IMG', ID='IMG_4', mimetype='foo/bar', pageId='PHYS_1')
+    assert next(mets.find_files(ID='IMG_4')).pageId == 'PHYS_1'
+    if cache_flag:
+        assert {fileId: list(fptrs) for fileId, fptrs in mets._fptr_by_file_cache.items()} == {
+            'IMG_4': ['PHYS_1'], 'PAGE_1': ['PHYS_1'], 'PAGE_2': ['PHYS_2']}
+
+
+def test_lazy_mets(tmp_path):
+    mets = OcrdMets.empty_mets()
+    for n in range(1, 4):
+        for grp in ['IMG', 'BIN', 'PAGE']:
+            mets.add_file(grp, ID=f'{grp}_{n}', mimetype='foo/bar', pageId=f'PHYS_{n}', url=f'{grp}/{n}.foo')
+    mets_path = str(tmp_path / 'mets.xml')
+    with open(mets_path, 'wb') as f:
+        f.write(mets.to_xml())
+    lazy = LazyOcrdMets(filename=mets_path)
+    assert lazy.file_groups == ['IMG', 'BIN', 'PAGE']
+    assert lazy.physical_pages == ['PHYS_1', 'PHYS_2', 'PHYS_3']
+    assert lazy._unloaded_file_groups == {'IMG', 'BIN', 'PAGE'}
+    assert [(f.ID, f.pageId) for f in lazy.find_files(fileGrp='BIN', pageId='PHYS_2..PHYS_3')] == [('BIN_2', 'PHYS_2'), ('BIN_3', 'PHYS_3')]
+    assert lazy._unloaded_file_groups == {'IMG', 'PAGE'}
+    assert [f.ID for f in lazy.find_files(fileGrp='//I.*', url='IMG/1.foo')] == ['IMG_1']
+    assert lazy._unloaded_file_groups == {'PAGE'}
+    lazy.add_file('BIN', ID='BIN_4', mimetype='foo/bar', pageId='PHYS_4')
+    assert lazy._unloaded_file_groups == {'PAGE'}
+    lazy.remove_file(ID='BIN_4')
+    assert lazy.to_xml(xmllint=True) == mets.to_xml(xmllint=True)
+    assert not lazy._unloaded_file_groups
+    assert len(lazy.find_all_files()) == 9
+
+
+def test_lazy_mets_partial_load(tmp_path):
+    mets = OcrdMets.empty_mets()
+    for n in range(1, 4):
+        for grp in ['IMG', 'BIN']:
+            mets.add_file(grp, ID=f'{grp}_{n}', mimetype='foo/bar', pageId=f'PHYS_{n}', url=f'{n}.foo')
+    mets_path = str(tmp_path / 'mets.xml')
+    with open(mets_path, 'wb') as f:
+        f.write(mets.to_xml())
+    lazy = LazyOcrdMets(filename=mets_path)
+    list(lazy.find_files(fileGrp='IMG'))
+    # what queries see while loading BIN (without loading themselves)
+    seen = []
+    cache_flocat = lazy._cache_flocat
+    def cache_flocat_querying(el_file):
+        seen.append(([f.ID for f in OcrdMets.find_files(lazy, fileGrp='//.*')],
+                     [f.ID for f in OcrdMets.find_files(lazy, url='1.foo')]))
+        cache_flocat(el_file)
+    lazy._cache_flocat = cache_flocat_querying
+    list(lazy.find_files(fileGrp='BIN'))
+    # the fileGrp appears complete at once
+    assert seen[0][0] == ['IMG_1', 'IMG_2', 'IMG_3', 'BIN_1', 'BIN_2', 'BIN_3']
+    assert seen[0][1] == ['IMG_1']
+    assert seen[-1][1] == ['IMG_1', 'BIN_1']
+
+
+def test_file_index():
+    def build(**kwargs):
+        mets = OcrdMets.empty_mets(**kwargs)
+        for n in range(1, 4):
+            for grp in ['IMG', 'BIN', 'PAGE']:
+                mimetype = MIMETYPE_PAGE if grp == 'PAGE' else 'image/tiff'
+                mets.add_file(grp, ID=f'{grp}_{n}', mimetype=mimetype, pageId=f'PHYS_{n}',
+                              url=f'http://example.org/{grp}/{n}', local_filename=f'{grp}/{n}' if n < 3 else None)
+        return mets
+    mets = build()
+    indexed = build(cache_flag=True, index_flag=True)
+    assert indexed._file_index is not None
+    assert len(indexed._file_index) == 9
+    def assert_same_results(**kwargs):
+        assert [f.ID for f in indexed.find_files(**kwargs)] == [f.ID for f in mets.find_files(**kwargs)], kwargs
+    for kwargs in [{}, dict(fileGrp='BIN'), dict(fileGrp='//(BIN|PAGE)'), dict(ID='IMG_2'), dict(ID='//.*_2'),
+                   dict(pageId='PHYS_2..PHYS_3', mimetype='//image/.*'), dict(mimetype=MIMETYPE_PAGE),
+                   dict(url='http://example.org/IMG/3'), dict(local_filename='//BIN/.*'), dict(local_only=True),
+                   dict(include_fileGrp=['IMG', 'PAGE'], exclude_fileGrp=['PAGE']), dict(fileGrp='NONE')]:
+        assert_same_results(**kwargs)
+    for m in [mets, indexed]:
+        f = next(m.find_files(ID='BIN_3'))
+        f.local_filename = 'BIN/3'
+        f.mimetype = 'image/png'
+        m.remove_file(ID='IMG_1')
+        m.rename_file_group('PAGE', 'OCR')
+        m.add_file('OCR', ID='OCR_4', mimetype=MIMETYPE_PAGE, pageId='PHYS_1')
+    for kwargs in [{}, dict(fileGrp='OCR'), dict(fileGrp='PAGE'), dict(local_filename='BIN/3'),
+                   dict(mimetype='image/png'), dict(pageId='PHYS_1')]:
+        assert_same_results(**kwargs)
+    # tombstones of removed rows are dropped eventually
+    indexed._file_index.COMPACT_MIN_DEAD = 4
+    for m in [mets, indexed]:
+        for n in range(5, 30):
+            m.add_file('OCR', ID=f'OCR_{n}', mimetype=MIMETYPE_PAGE, pageId='PHYS_1', url=f'http://example.org/OCR/{n}')
+            m.remove_file(ID=f'OCR_{n - 1}')
+        m.add_file('OCR', ID='OCR_4', mimetype='image/png', pageId='PHYS_2', url='http://example.org/OCR/29', force=True)
+    assert len(indexed._file_index) == 10
+    assert len(indexed._file_index.elements) <= 2 * 10
+    for kwargs in [{}, dict(fileGrp='OCR'), dict(url='//.*OCR/.*'), dict(url='http://example.org/OCR/29'),
+                   dict(mimetype='image/png'), dict(pageId='PHYS_1'), dict(ID='//OCR_.*')]:
+        assert_same_results(**kwargs)
+
+
+@pytest.mark.parametrize('cache_flag', CACHING_ENABLED)
+def test_add_remove_files(cache_flag):
+    mets = OcrdMets.empty_mets(cache_flag=cache_flag)
+    mets.add_file('IMG', ID='IMG_1', mimetype='image/tiff', pageId='PHYS_1')
+    files = [dict(fileGrp=grp, ID=f'{grp}_{n}', mimetype='image/tiff', pageId=f'PHYS_{n}', local_filename=f'{grp}/{n}.tif')
+             for grp in ['IMG', 'BIN'] for n in range(1, 4)]
+    # all or nothing
+    with pytest.raises(FileExistsError, match='neither force nor ignore'):
+        mets.add_files(files)
+    with pytest.raises(FileExistsError, match='Duplicate'):
+        mets.add_files(files[1:] + files[-1:])
+    with pytest.raises(ValueError, match='Invalid syntax'):
+        mets.add_files(files[1:] + [dict(fileGrp='BIN', ID='BIN 4')])
+    assert [f.ID for f in mets.find_files()] == ['IMG_1']
+    added = mets.add_files(files, force=True)
+    assert [f.ID for f in added] == [f['ID'] for f in files]
+    assert [f.ID for f in mets.find_files(fileGrp='BIN', pageId='PHYS_2')] == ['BIN_2']
+    assert mets.physical_pages == ['PHYS_1', 'PHYS_2', 'PHYS_3']
+    assert next(mets.find_files(ID='IMG_3')).local_filename == 'IMG/3.tif'
+    with pytest.raises(FileNotFoundError, match='NONE'):
+        mets.remove_files(['IMG_2', 'NONE'])
+    assert len(mets.find_all_files()) == 6
+    removed = mets.remove_files(['IMG_2', 'NONE', next(mets.find_files(ID='BIN_2'))], force=True)
+    assert [f.ID for f in removed] == ['IMG_2', 'BIN_2']
+    assert [f.ID for f in mets.find_files()] == ['IMG_1', 'IMG_3', 'BIN_1', 'BIN_3']
+    assert mets.physical_pages == ['PHYS_1', 'PHYS_3']
+    assert mets.get_physical_pages(for_fileIds=['BIN_3']) == ['PHYS_3']
+
+
+@pytest.mark.parametrize('cache_flag', CACHING_ENABLED)
+def test_journal(cache_flag):
+    mets = OcrdMets.empty_mets(now='2024-01-01', cache_flag=cache_flag)
+    mets.add_file('IMG', ID='IMG_1', mimetype='image/tiff', pageId='PHYS_1', local_filename='IMG/1.tif')
+    base = mets.to_xml()
+    assert mets.pop_journal() is None
+    mets.start_journal()
+    mets.add_files(dict(fileGrp='BIN', ID=f'BIN_{n}', mimetype='image/png', pageId=f'PHYS_{n}') for n in range(1, 4))
+    f = mets.add_file('OCR', ID='OCR_1', mimetype=MIMETYPE_PAGE, pageId='PHYS_1', url='http://example.org/1.xml')
+    f.local_filename = 'OCR/1.xml'
+    f.ID = 'OCR_1_renamed'
+    mets.remove_one_file('IMG_1')
+    mets.remove_files([next(mets.find_files(ID='BIN_2'))])
+    mets.update_physical_page_attributes('PHYS_3', ORDER='3')
+    mets.add_agent(name='foo', _type='OTHER', othertype='SOFTWARE', role='OTHER', notes=[({'option': 'bar'}, 'baz')])
+    mets.unique_identifier = 'foo'
+    entries = json.loads(json.dumps(mets.pop_journal()))
+    assert [entry[0] for entry in entries] == [
+        'add_files', 'add_file', '_update_file', '_update_file', 'remove_physical_page_fptr',
+        'set_physical_page_for_file', 'remove_one_file', 'remove_files', 'update_physical_page_attributes',
+        'add_agent', 'unique_identifier']
+    assert mets.pop_journal() == []
+    replayed = OcrdMets(content=base, cache_flag=cache_flag)
+    replayed.replay_journal(entries)
+    assert replayed.to_xml(xmllint=True) == mets.to_xml(xmllint=True)
+    assert [f.ID for f in replayed.find_files(local_filename='OCR/1.xml')] == ['OCR_1_renamed']
+    # changes cannot be reproduced after a failure
+    with pytest.raises(FileNotFoundError):
+        mets.remove_one_file('IMG_1')
+    assert mets.pop_journal() is None
+
+
+def test_flocat_cache():
+    def build(**kwargs):
+        mets = OcrdMets.empty_mets(**kwargs)
+        for n in range(1, 4):
+            for grp in ['IMG', 'BIN']:
+                mets.add_file(grp, ID=f'{grp}_{n}', mimetype='image/tiff', pageId=f'PHYS_{n}',
+                              url=f'http://example.org/{n}.tif', local_filename=f'{grp}/{n}.tif')
+        return mets
+    mets = build()
+    cached = build(cache_flag=True)
+    assert set(cached._flocat_cache['url']) == {f'http://example.org/{n}.tif' for n in range(1, 4)}
+    def assert_same_results(**kwargs):
+        assert [f.ID for f in cached.find_files(**kwargs)] == [f.ID for f in mets.find_files(**kwargs)], kwargs
+    queries = [dict(url='http://example.org/2.tif'), dict(local_filename='BIN/2.tif'),
+               dict(url='http://example.org/2.tif', local_filename='IMG/2.tif'),
+               dict(url='http://example.org/2.tif', fileGrp='//B.*'), dict(local_filename='NONE')]
+    for kwargs in queries:
+        assert_same_results(**kwargs)
+    for m in [mets, cached]:
+        f = next(m.find_files(ID='BIN_2'))
+        f.url = 'http://example.org/BIN/2.tif'
+        f.local_filename = None
+        f.ID = 'BIN_2_renamed'
+        m.remove_file(ID='IMG_3')
+        m.add_file('IMG', ID='IMG_4', mimetype='image/tiff', pageId='PHYS_4', local_filename='BIN/2.tif')
+    for kwargs in queries + [dict(url='http://example.org/BIN/2.tif'), dict(url='http://example.org/3.tif'),
+                             dict(ID='BIN_2_renamed')]:
+        assert_same_results(**kwargs)
+    assert 'http://example.org/BIN/2.tif' in cached._flocat_cache['url']
+    cached.remove_file(ID='BIN_2_renamed')
+    assert 'http://example.org/BIN/2.tif' not in cached._flocat_cache['url']
+
+
+def test_page_and_file_selectors():
+    def build(**kwargs):
+        mets = OcrdMets.empty_mets(**kwargs)
+        for n in range(1, 13):
+            for grp in ['IMG', 'BIN', 'SEG']:
+                mets.add_file(grp, ID=f'{grp}_{n}', mimetype='image/png' if grp == 'SEG' else 'image/tiff',
+                              pageId=f'PHYS_{n:02d}')
+        return mets
+    selector = PageSelector.compile('PHYS_02..PHYS_04,//PHYS_1[01]')
+    assert PageSelector.compile('PHYS_02..PHYS_04,//PHYS_1[01]') is selector
+    assert selector.expand()[:3] == ['PHYS_02', 'PHYS_03', 'PHYS_04']
+    mets, cached = build(), build(cache_flag=True)
+    for m in [mets, cached]:
+        # compiled selectors are not modified when evaluated
+        for _ in range(2):
+            assert m.get_physical_pages(for_pageIds=selector) == ['PHYS_02', 'PHYS_03', 'PHYS_04', 'PHYS_10', 'PHYS_11']
+    queries = [dict(pageId='PHYS_02..PHYS_09', fileGrp='BIN'), dict(pageId='PHYS_03'),
+               dict(pageId='//PHYS_0[12]', fileGrp='//(IMG|SEG)', mimetype='image/png')]
+    for kwargs in queries:
+        found = [f.ID for f in mets.find_files(**kwargs)]
+        assert found
+        assert [f.ID for f in cached.find_files(**kwargs)] == found, kwargs
+        assert [f.ID for f in cached.find_files(selector=FileSelector.compile(**kwargs))] == found, kwargs
+    assert FileSelector.compile(ID='//IMG_.*').ID.fullmatch('IMG_1')
+
 if __name__ == '__main__':
     main(__file__)
@@ -8,6 +8,7 @@ from pytest import main, fixture, mark
 from ocrd import Resolver
 from ocrd_utils import MIME_TO_EXT, getLogger
 from ocrd_models import OcrdMets
+from ocrd_models.utils import xmllint_format
 
 import pprint
 
@@ -22,8 +23,8 @@ LINES_PER_REGION = 2
 FILES_PER_PAGE = len(GRPS_IMG) * LINES_PER_REGION + len(GRPS_REG) * REGIONS_PER_PAGE
 
 # Caching is disabled by default
-def _build_mets(number_of_pages, force=False, cache_flag=False):
-    mets = OcrdMets.empty_mets(cache_flag=cache_flag)
+def _build_mets(number_of_pages, force=False, cache_flag=False, index_flag=False):
+    mets = OcrdMets.empty_mets(cache_flag=cache_flag, index_flag=index_flag)
     mets._number_of_pages = number_of_pages
 
     for n in ['%04d' % (n + 1) for n in range(number_of_pages)]:
@@ -72,6 +73,15 @@ def benchmark_find_files_physical_page(number_of_pages, mets):
     # Worst case - does not exist
     assert_len(0, mets, dict(pageId='PHYS_0001-NOTEXISTS'))
 
+def benchmark_find_files_page_range(number_of_pages, mets):
+    # Page range in a single fileGrp
+    assert_len((number_of_pages // 2 * REGIONS_PER_PAGE), mets, dict(fileGrp='SEG-REG', pageId='PHYS_0001..PHYS_%04d' % (number_of_pages // 2)))
+    # Single page in all fileGrps
+    assert_len(FILES_PER_PAGE, mets, dict(pageId='PHYS_%04d' % number_of_pages))
+    # Regex over pages in a single fileGrp
+    # (image and PAGE per page)
+    assert_len(4, mets, dict(fileGrp='FULL', pageId='//PHYS_000[12]'))
+
 # Get all files, i.e., pass an empty search parameter -> dict()
 def benchmark_find_files_all(number_of_pages, mets):
     assert_len((number_of_pages * FILES_PER_PAGE), mets, dict())
@@ -219,6 +229,105 @@ del mets_c_10
 del mets_c_20
 del mets_c_50
 
+# ----- METS files (indexed) global variables ----- #
+mets_i_5 = None
+mets_i_10 = None
+mets_i_20 = None
+mets_i_50 = None
+
+# ----- Build mets files (indexed) with 5-10-20-50-200 pages ----- #
+@mark.benchmark(group="build")
+def test_b5_i(benchmark):
+    @benchmark
+    def result():
+        global mets_i_5
+        mets_i_5 = _build_mets(5, force=True, cache_flag=True, index_flag=True)
+
+@mark.benchmark(group="build")
+def test_b10_i(benchmark):
+    @benchmark
+    def result():
+        global mets_i_10
+        mets_i_10 = _build_mets(10, force=True, cache_flag=True, index_flag=True)
+
+@mark.benchmark(group="build")
+def test_b20_i(benchmark):
+    @benchmark
+    def result():
+        global mets_i_20
+        mets_i_20 = _build_mets(20, force=True, cache_flag=True, index_flag=True)
+
+@mark.benchmark(group="build")
+def test_b50_i(benchmark):
+    @benchmark
+    def result():
+        global mets_i_50
+        mets_i_50 = _build_mets(50, force=True, cache_flag=True, index_flag=True)
+
+
+# ----- Search for files (indexed) with 5-10-20-50-200 pages ----- #
+@mark.benchmark(group="search")
+def test_s5_i(benchmark):
+    @benchmark
+    def ret():
+        global mets_i_5
+        benchmark_find_files(5, mets_i_5)
+
+@mark.benchmark(group="search")
+def test_s10_i(benchmark):
+    @benchmark
+    def ret(): 
+        global mets_i_10
+        benchmark_find_files(10, mets_i_10)
+
+@mark.benchmark(group="search")
+def test_s20_i(benchmark):
+    @benchmark
+    def ret(): 
+        global mets_i_20
+        benchmark_find_files(20, mets_i_20)
+
+@mark.benchmark(group="search")
+def test_s50_i(benchmark):
+    @benchmark
+    def ret(): 
+        global mets_i_50
+        benchmark_find_files(50, mets_i_50)
+     
+del mets_i_5
+del mets_i_10
+del mets_i_20
+del mets_i_50
+
+# ----- Serialize mets files with 50 pages ----- #
+@mark.benchmark(group="serialize")
+def test_x50_reparse(benchmark):
+    mets = _build_mets(50, cache_flag=True)
+    benchmark(lambda: xmllint_format(mets.to_xml()))
+
+@mark.benchmark(group="serialize")
+def test_x50(benchmark):
+    mets = _build_mets(50, cache_flag=True)
+    expected = xmllint_format(mets.to_xml())
+    # single pass is byte-identical to re-parsing
+    assert benchmark(mets.to_xml, xmllint=True) == expected
+
+# ----- Search for files by page range with 50 pages ----- #
+@mark.benchmark(group="search_pages")
+def test_p50(benchmark):
+    mets = _build_mets(50)
+    benchmark(benchmark_find_files_page_range, 50, mets)
+
+@mark.benchmark(group="search_pages")
+def test_p50_c(benchmark):
+    mets = _build_mets(50, cache_flag=True)
+    benchmark(benchmark_find_files_page_range, 50, mets)
+
+@mark.benchmark(group="search_pages")
+def test_p50_i(benchmark):
+    mets = _build_mets(50, cache_flag=True, index_flag=True)
+    benchmark(benchmark_find_files_page_range, 50, mets)
+
 def manual_t():
     mets = _build_mets(2, cache_flag=False)
     mets_cached = _build_mets(2, cache_flag=True)    
@@ -5,9 +5,11 @@ import pytest
 from tests.base import main, assets, create_ocrd_file_with_defaults
 
 from ocrd_modelfactory import page_from_image
+from ocrd_models.ocrd_page_lite import OcrdPageLite, LiteAlternativeImage
 from ocrd_models.ocrd_page_generateds import TextTypeSimpleType
 from ocrd_models.ocrd_page import (
     AlternativeImageType,
+    CoordsType,
     PcGtsType,
     PageType,
     TextRegionType,
@@ -424,6 +426,50 @@ def test_get_AllAlternativeImages():
         assert isinstance(page.get_AllAlternativeImages()[0], AlternativeImageType)
 
 
+def test_page_lite(tmp_path):
+    pcgts = parseString(simple_page.encode('utf8'), silence=True)
+    pcgts.set_pcGtsId('PAGE_0017')
+    page = pcgts.get_Page()
+    page.add_AlternativeImage(AlternativeImageType(filename='BIN/PAGE_0017.png', comments=',binarized'))
+    region = page.get_TextRegion()[0]
+    region.add_AlternativeImage(AlternativeImageType(filename='BIN/PAGE_0017_r_1_1.png'))
+    region.get_TextLine()[0].add_AlternativeImage(AlternativeImageType(filename='BIN/PAGE_0017_tl_1.png'))
+    fpath = tmp_path / 'page.xml'
+    fpath.write_text(to_xml(pcgts), encoding='utf-8')
+
+    page_lite = OcrdPageLite(fpath)
+    assert page_lite.pcGtsId == 'PAGE_0017'
+    assert page_lite.imageFilename == page.imageFilename
+    assert (page_lite.imageWidth, page_lite.imageHeight) == (1457, 2083)
+    assert [x.filename for x in page_lite.get_AllAlternativeImages()] == \
+        [x.filename for x in page.get_AllAlternativeImages()]
+    assert page_lite.get_AllAlternativeImages(region=False, line=False) == [
+        LiteAlternativeImage('BIN/PAGE_0017.png', ',binarized', 'Page', None)]
+    assert [(x.parent_tag, x.parent_id) for x in page_lite.get_AllAlternativeImages(page=False)] == [
+        ('TextRegion', 'r_1_1'), ('TextLine', 'tl_1')]
+
+    assert not page_lite.replace_filenames({'nonexistent.png': 'foo.png'})
+    assert page_lite.replace_filenames({page.imageFilename: 'IMG/PAGE_0017.tif',
+                                        'BIN/PAGE_0017_tl_1.png': 'BIN2/PAGE_0017_tl_1.png'})
+    assert page_lite.imageFilename == 'IMG/PAGE_0017.tif'
+    page = parse(str(fpath), silence=True).get_Page()
+    assert page.imageFilename == 'IMG/PAGE_0017.tif'
+    assert [x.filename for x in page.get_AllAlternativeImages()] == [
+        'BIN/PAGE_0017.png', 'BIN/PAGE_0017_r_1_1.png', 'BIN2/PAGE_0017_tl_1.png']
+    assert page.get_TextRegion()[0].get_TextLine()[0].get_Word()[0].get_TextEquiv()[0].Unicode == 'Berliniſche'
+
+
+def test_coords_get_polygon():
+    coords = CoordsType(points='100,100 200,100 200,200 100,200')
+    polygon = coords.get_polygon()
+    assert polygon.tolist() == [[100, 100], [200, 100], [200, 200], [100, 200]]
+    assert not polygon.flags.writeable
+    assert coords.get_polygon() is polygon
+    assert coords == CoordsType(points='100,100 200,100 200,200 100,200')
+    coords.set_points('0,0 10,0 10,10')
+    assert coords.get_polygon().tolist() == [[0, 0], [10, 0], [10, 10]]
+
+
 def test_serialize_no_empty_readingorder():
     """
     https://github.com/OCR-D/core/issues/602
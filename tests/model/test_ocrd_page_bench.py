@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+
+import tracemalloc
+
+from pytest import main, fixture, mark
+
+from ocrd_utils import points_from_polygon, polygons_from_ragged, ragged_from_points
+from ocrd_models.constants import NAMESPACES
+from ocrd_models.ocrd_page import parse, parseString
+from ocrd_models.ocrd_page_lite import OcrdPageLite
+
+REGIONS_PER_PAGE = 20
+LINES_PER_REGION = 10
+WORDS_PER_LINE = 8
+GLYPHS_PER_WORD = 6
+
+def _coords(x, y, w, h):
+    return '<pc:Coords points="%d,%d %d,%d %d,%d %d,%d"/>' % (x, y, x + w, y, x + w, y + h, x, y + h)
+
+def _build_page(glyphs=False):
+    """
+    Serialize a line-dense (or with ``glyphs``, glyph-dense) PAGE-XML document
+    with AlternativeImages on page and line level
+    """
+    parts = ['<?xml version="1.0" encoding="UTF-8"?>\n<pc:PcGts xmlns:pc="%s" pcGtsId="PAGE_0001">' % NAMESPACES['page'],
+             '<pc:Metadata><pc:Creator>OCR-D</pc:Creator>'
+             '<pc:Created>2024-01-01T00:00:00</pc:Created><pc:LastChange>2024-01-01T00:00:00</pc:LastChange></pc:Metadata>',
+             '<pc:Page imageFilename="OCR-D-IMG/PAGE_0001.tif" imageWidth="4000" imageHeight="6000">',
+             '<pc:AlternativeImage filename="OCR-D-BIN/PAGE_0001.png" comments=",binarized"/>']
+    for r in range(REGIONS_PER_PAGE):
+        parts.append('<pc:TextRegion id="r%d">' % r)
+        parts.append(_coords(100, 100 + r * 280, 3800, 280))
+        for l in range(LINES_PER_REGION):
+            y = 100 + r * 280 + l * 11
+            parts.append('<pc:TextLine id="r%d_l%d">' % (r, l))
+            parts.append('<pc:AlternativeImage filename="OCR-D-DEWARP/PAGE_0001_r%d_l%d.png" comments=",dewarped"/>' % (r, l))
+            parts.append(_coords(100, y, 3800, 11))
+            for w in range(WORDS_PER_LINE):
+                x = 100 + w * 470
+                parts.append('<pc:Word id="r%d_l%d_w%d">' % (r, l, w))
+                parts.append(_coords(x, y, 460, 11))
+                if glyphs:
+                    for g in range(GLYPHS_PER_WORD):
+                        parts.append('<pc:Glyph id="r%d_l%d_w%d_g%d">' % (r, l, w, g))
+                        parts.append(_coords(x + g * 76, y, 76, 11))
+                        parts.append('<pc:TextEquiv conf="0.9"><pc:Unicode>a</pc:Unicode></pc:TextEquiv></pc:Glyph>')
+                parts.append('<pc:TextEquiv conf="0.9"><pc:Unicode>%s</pc:Unicode></pc:TextEquiv></pc:Word>' % ('a' * GLYPHS_PER_WORD))
+            parts.append('<pc:TextEquiv><pc:Unicode>line</pc:Unicode></pc:TextEquiv></pc:TextLine>')
+        parts.append('</pc:TextRegion>')
+    parts.append('</pc:Page></pc:PcGts>')
+    return '\n'.join(parts)
+
+@fixture(scope='module')
+def glyph_coords():
+    pcgts = parseString(_build_page(glyphs=True).encode('utf-8'), silence=True)
+    yield [glyph.get_Coords()
+           for line in pcgts.get_Page().get_AllTextLines()
+           for word in line.get_Word()
+           for glyph in word.get_Glyph()]
+
+@fixture(scope='module', params=['lines', 'glyphs'])
+def page_file(request, tmp_path_factory):
+    fpath = tmp_path_factory.mktemp('page') / ('%s.xml' % request.param)
+    fpath.write_text(_build_page(glyphs=request.param == 'glyphs'), encoding='utf-8')
+    yield str(fpath)
+
+def _full_header(fpath):
+    page = parse(fpath, silence=True).get_Page()
+    return page.imageFilename, page.imageWidth, page.imageHeight
+
+def _lite_header(fpath):
+    page = OcrdPageLite(fpath)
+    return page.imageFilename, page.imageWidth, page.imageHeight
+
+def _full_images(fpath):
+    return [x.filename for x in parse(fpath, silence=True).get_Page().get_AllAlternativeImages()]
+
+def _lite_images(fpath):
+    return [x.filename for x in OcrdPageLite(fpath).get_AllAlternativeImages()]
+
+@mark.benchmark(group="page_header")
+def test_page_header_full(benchmark, page_file):
+    assert benchmark(_full_header, page_file) == ('OCR-D-IMG/PAGE_0001.tif', 4000, 6000)
+
+@mark.benchmark(group="page_header")
+def test_page_header_lite(benchmark, page_file):
+    assert benchmark(_lite_header, page_file) == ('OCR-D-IMG/PAGE_0001.tif', 4000, 6000)
+
+@mark.benchmark(group="page_images")
+def test_page_images_full(benchmark, page_file):
+    assert len(benchmark(_full_images, page_file)) == 1 + REGIONS_PER_PAGE * LINES_PER_REGION
+
+@mark.benchmark(group="page_images")
+def test_page_images_lite(benchmark, page_file):
+    assert len(benchmark(_lite_images, page_file)) == 1 + REGIONS_PER_PAGE * LINES_PER_REGION
+
+def _split_polygon(points):
+    # as polygon_from_points without as_array
+    polygon = []
+    for pair in points.split(" "):
+        x_y = pair.split(",")
+        polygon.append([float(x_y[0]), float(x_y[1])])
+    return polygon
+
+PARSERS = {
+    'split': lambda coords: _split_polygon(coords.points),
+    'cached': lambda coords: coords.get_polygon(),
+}
+
+@mark.parametrize('parser', PARSERS)
+@mark.benchmark(group="points_parse")
+def test_points_parse(benchmark, glyph_coords, parser):
+    parse_ = PARSERS[parser]
+    polygons = benchmark(lambda: [parse_(coords) for coords in glyph_coords])
+    assert len(polygons) == REGIONS_PER_PAGE * LINES_PER_REGION * WORDS_PER_LINE * GLYPHS_PER_WORD
+
+@mark.benchmark(group="points_parse")
+def test_points_parse_ragged(benchmark, glyph_coords):
+    # bulk parsing without cache
+    points, offsets = benchmark(lambda: ragged_from_points([coords.points for coords in glyph_coords]))
+    assert len(offsets) == REGIONS_PER_PAGE * LINES_PER_REGION * WORDS_PER_LINE * GLYPHS_PER_WORD + 1
+
+@mark.parametrize('method', ['join', 'codec'])
+@mark.benchmark(group="points_format")
+def test_points_format(benchmark, glyph_coords, method):
+    polygons = [coords.get_polygon() for coords in glyph_coords]
+    if method == 'join':
+        format_ = lambda polygon: " ".join("%i,%i" % (x, y) for x, y in polygon)
+    else:
+        format_ = points_from_polygon
+    assert benchmark(lambda: [format_(polygon) for polygon in polygons]) == [coords.points for coords in glyph_coords]
+
+def test_points_identical(glyph_coords):
+    points, offsets = ragged_from_points([coords.points for coords in glyph_coords])
+    for coords, polygon in zip(glyph_coords, polygons_from_ragged(points, offsets)):
+        assert coords.get_polygon().tolist() == _split_polygon(coords.points)
+        assert polygon.tolist() == _split_polygon(coords.points)
+
+def _peak_memory(func, *args):
+    tracemalloc.start()
+    try:
+        func(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def test_page_memory(page_file):
+    # Python heap only (libxml2 allocations are not traced)
+    full = _peak_memory(_full_images, page_file)
+    lite = _peak_memory(_lite_images, page_file)
+    print('peak memory full: %d KiB, lite: %d KiB' % (full // 1024, lite // 1024))
+    assert lite * 10 < full
+    assert _lite_images(page_file) == _full_images(page_file)
+
+if __name__ == '__main__':
+    main([__file__])
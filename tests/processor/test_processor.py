@@ -1,9 +1,11 @@
 import json
+import os
 
 from tempfile import TemporaryDirectory
 from os.path import join
+from pathlib import Path
 from tests.base import CapturingTestCase as TestCase, assets, main # pylint: disable=import-error, no-name-in-module
-from tests.data import DummyProcessor, DummyProcessorWithRequiredParameters, DummyProcessorWithOutput, IncompleteProcessor
+from tests.data import DummyProcessor, DummyProcessorWithRequiredParameters, DummyProcessorWithOutput, DummyPageProcessor, IncompleteProcessor
 
 from ocrd_utils import MIMETYPE_PAGE, pushd_popd, initLogging, disableLogging
 from ocrd.resolver import Resolver
@@ -211,5 +213,81 @@ class TestProcessor(TestCase):
         r = self.capture_out_err()
         assert 'ERROR ocrd.processor.base - found no page phys_0001 in file group GRP1' in r.err
 
+@pytest.mark.parametrize("jobs,pool", [(1, None), (3, 'thread'), (3, 'process')])
+def test_run_page_contract(tmpdir, monkeypatch, jobs, pool):
+    if pool:
+        monkeypatch.setenv('OCRD_PARALLEL_PAGES_POOL', pool)
+    ws = Resolver().workspace_from_nothing(directory=tmpdir)
+    for i in range(1, 6):
+        ws.add_file('GRP1', mimetype=MIMETYPE_PAGE, file_id=f'foobar{i}', page_id=f'phys_000{i}')
+    processor = DummyPageProcessor(None)
+    assert processor.implements_page_contract
+    assert not DummyProcessorWithOutput(None).implements_page_contract
+    run_processor(DummyPageProcessor, workspace=ws, jobs=jobs,
+                  input_file_grp="GRP1",
+                  output_file_grp="OCR-D-OUT")
+    output_files = ws.mets.find_all_files(fileGrp="OCR-D-OUT")
+    # METS changes are applied in page order regardless of jobs
+    assert [f.pageId for f in output_files] == [f'phys_000{i}' for i in range(1, 6)]
+    contents = set(Path(tmpdir, f.local_filename).read_text() for f in output_files)
+    if pool == 'process':
+        assert 'CONTENT %d' % os.getpid() not in contents
+    else:
+        assert contents == {'CONTENT %d' % os.getpid()}
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_run_page_contract_errors(tmpdir, monkeypatch, jobs):
+    ws = Resolver().workspace_from_nothing(directory=tmpdir)
+    for i in range(1, 4):
+        ws.add_file('GRP1', mimetype=MIMETYPE_PAGE, file_id=f'foobar{i}', page_id=f'phys_000{i}')
+    run_processor(DummyPageProcessor, workspace=ws, jobs=jobs,
+                  parameter={'baz': 'phys_0002'},
+                  input_file_grp="GRP1",
+                  output_file_grp="OCR-D-OUT")
+    assert [f.pageId for f in ws.mets.find_all_files(fileGrp="OCR-D-OUT")] == ['phys_0001', 'phys_0003']
+    ws.add_file('GRP2', mimetype=MIMETYPE_PAGE, file_id='foobar4', page_id='phys_0002')
+    with pytest.raises(Exception, match="Failed to process all 1 pages"):
+        run_processor(DummyPageProcessor, workspace=ws, jobs=jobs,
+                      parameter={'baz': 'phys_0002'},
+                      input_file_grp="GRP2",
+                      output_file_grp="OCR-D-OUT3")
+    monkeypatch.setenv('OCRD_MISSING_OUTPUT', 'ABORT')
+    with pytest.raises(Exception, match="cannot process phys_0002"):
+        run_processor(DummyPageProcessor, workspace=ws, jobs=jobs,
+                      parameter={'baz': 'phys_0002'},
+                      input_file_grp="GRP1",
+                      output_file_grp="OCR-D-OUT2")
+
+def test_run_page_contract_exif_sidecar(tmpdir, monkeypatch):
+    from PIL import Image
+    monkeypatch.setenv('OCRD_EXIF_SIDECAR', 'true')
+    monkeypatch.setenv('OCRD_PARALLEL_PAGES_POOL', 'process')
+    ws = Resolver().workspace_from_nothing(directory=tmpdir)
+    for i in range(1, 4):
+        Image.new('L', (10 * i, 10)).save(Path(tmpdir, f'img{i}.png'))
+        ws.add_file('IMG', mimetype='image/png', file_id=f'img{i}', page_id=f'phys_000{i}', local_filename=f'img{i}.png')
+    class ExifPageProcessor(DummyPageProcessor):
+        def process_page_file(self, input_file):
+            self.workspace.resolve_image_exif(input_file.local_filename)
+    run_processor(ExifPageProcessor, workspace=ws, jobs=3,
+                  input_file_grp="IMG",
+                  output_file_grp="OCR-D-OUT")
+    # entries probed by all worker processes, written once
+    with open(Path(tmpdir, '.ocrd-exif.json'), encoding='utf-8') as f:
+        sidecar = json.load(f)
+    assert {name: entry['exif']['width'] for name, entry in sidecar.items()} == {
+        'img1.png': 10, 'img2.png': 20, 'img3.png': 30}
+
+def test_run_page_contract_existing_output(tmpdir):
+    ws = Resolver().workspace_from_nothing(directory=tmpdir)
+    for i in range(1, 4):
+        ws.add_file('GRP1', mimetype=MIMETYPE_PAGE, file_id=f'foobar{i}', page_id=f'phys_000{i}')
+    ws.add_file('OCR-D-OUT', mimetype=MIMETYPE_PAGE, file_id='OCR-D-OUT_phys_0002', page_id='phys_0002')
+    run_processor(DummyPageProcessor, workspace=ws, jobs=2,
+                  input_file_grp="GRP1",
+                  output_file_grp="OCR-D-OUT")
+    assert len(ws.mets.find_all_files(fileGrp="OCR-D-OUT")) == 3
+    assert next(ws.mets.find_files(ID='OCR-D-OUT_phys_0002')).local_filename is None
+
 if __name__ == "__main__":
     main(__file__)
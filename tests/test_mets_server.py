@@ -1,4 +1,5 @@
 import re
+import asyncio
 from typing import Iterable, Tuple
 from pytest import fixture, raises
 import pytest
@@ -16,9 +17,10 @@ from pathlib import Path
 import stat
 from uuid import uuid4
 
-from requests.exceptions import ConnectionError
+from requests.exceptions import ConnectionError, HTTPError
 
 from ocrd import Resolver, OcrdMetsServer, Workspace
+from ocrd.mets_server import ClientSideOcrdMets, _ReadWriteLock, file_from_row
 from ocrd_utils import pushd_popd, MIMETYPE_PAGE
 
 WORKSPACE_DIR = '/tmp/ocrd-mets-server'
@@ -113,6 +115,33 @@ def test_mets_server_add_file(start_mets_server):
 
     assert len(workspace_file.mets.find_all_files(fileGrp='FOO')) == NO_FILES
 
+def test_mets_server_add_remove_files(start_mets_server):
+    NO_FILES = 500
+
+    mets_server_url, workspace_server = start_mets_server
+
+    # add NO_FILES files in a single request
+    added = workspace_server.add_files([dict(
+        local_filename=f'local_filename{i}',
+        mimetype=MIMETYPE_PAGE,
+        page_id=f'page{i}',
+        file_grp='FOO',
+        file_id=f'FOO_page{i}_foo{i}',
+    ) for i in range(NO_FILES)])
+    assert len(added) == NO_FILES
+    assert len(workspace_server.mets.find_all_files(fileGrp='FOO')) == NO_FILES
+
+    # all or nothing
+    with raises(Exception, match='400'):
+        workspace_server.mets.add_files([dict(fileGrp='FOO', ID='FOO_page0_foo0', mimetype=MIMETYPE_PAGE, pageId='page0')])
+    with raises(Exception, match='404'):
+        workspace_server.mets.remove_files(['FOO_page0_foo0', 'NOTEXIST'])
+    assert len(workspace_server.mets.find_all_files(fileGrp='FOO')) == NO_FILES
+
+    removed = workspace_server.remove_files([f'FOO_page{i}_foo{i}' for i in range(0, NO_FILES, 2)], keep_file=True)
+    assert [f.pageId for f in removed[:2]] == ['page0', 'page2']
+    assert len(workspace_server.mets.find_all_files(fileGrp='FOO')) == NO_FILES // 2
+
 def test_mets_server_add_agents(start_mets_server):
     NO_AGENTS = 30
 
@@ -186,6 +215,161 @@ def test_mets_server_socket_stop(start_mets_server):
         # make sure the socket file was deleted on shutdown
         assert not Path(mets_server_url).exists()
 
+def test_mets_client_session():
+    for url in TRANSPORTS:
+        mets = ClientSideOcrdMets(url)
+        session = mets.session
+        # one pooled session per client ...
+        assert mets.session is session
+        # ... but not shared with forked processes
+        parent, child = Pipe()
+        p = Process(target=lambda: child.send(id(mets.session) != id(session) and mets.session is mets.session))
+        p.start()
+        assert parent.recv()
+        p.join()
+
+def test_mets_client_generation_unsupported(monkeypatch):
+    monkeypatch.setenv('OCRD_METS_SERVER_CACHE_TTL', '0')
+    requests = []
+    class Session:
+        def request(self, method, url, **kwargs):
+            requests.append(url)
+            return type('Response', (), {'status_code': 404})()
+    mets = ClientSideOcrdMets(TRANSPORTS[1])
+    monkeypatch.setattr(ClientSideOcrdMets, 'session', Session())
+    assert mets._current_generation() is None
+    # an older METS server is not asked again
+    mets._cache_clear()
+    assert mets._current_generation() is None
+    assert requests == [TRANSPORTS[1] + '/generation']
+
+def test_mets_server_flush(tmp_path, monkeypatch):
+    monkeypatch.setenv('OCRD_METS_SERVER_FLUSH_CHANGES', '3')
+    monkeypatch.setenv('OCRD_METS_SERVER_FLUSH_IDLE', '0.1')
+    workspace = Resolver().workspace_from_nothing(str(tmp_path))
+    mets_server = OcrdMetsServer(workspace, str(tmp_path / 'mets.sock'))
+    saved = []
+    prepare_save_mets = workspace.prepare_save_mets
+    def prepare_save_mets_counting():
+        saved.append(len(workspace.mets.find_all_files()))
+        return prepare_save_mets()
+    monkeypatch.setattr(workspace, 'prepare_save_mets', prepare_save_mets_counting)
+    async def add_file(n):
+        async with mets_server._mutating():
+            workspace.add_file('FOO', file_id=f'FOO_{n}', mimetype='text/plain', page_id=None)
+    async def run():
+        for n in range(3):
+            await add_file(n)
+        # after number of changes
+        await asyncio.sleep(0.05)
+        assert saved == [3]
+        await add_file(3)
+        assert saved == [3]
+        # after idle time
+        await asyncio.sleep(0.2)
+        assert saved == [3, 4]
+        # nothing changed since
+        await mets_server.flush()
+        assert saved == [3, 4]
+    asyncio.run(run())
+    assert len(Workspace(Resolver(), str(tmp_path)).mets.find_all_files()) == 4
+
+def test_mets_server_flush_unlocked(tmp_path, monkeypatch):
+    monkeypatch.setenv('OCRD_METS_SERVER_FLUSH_CHANGES', '100')
+    monkeypatch.setenv('OCRD_METS_SERVER_FLUSH_IDLE', '10')
+    workspace = Resolver().workspace_from_nothing(str(tmp_path))
+    mets_server = OcrdMetsServer(workspace, str(tmp_path / 'mets.sock'))
+    events = []
+    prepare_save_mets = workspace.prepare_save_mets
+    def prepare_save_mets_slowly():
+        save = prepare_save_mets()
+        def save_slowly():
+            sleep(0.1)
+            save()
+            events.append('saved')
+        return save_slowly
+    monkeypatch.setattr(workspace, 'prepare_save_mets', prepare_save_mets_slowly)
+    async def add_file(n):
+        async with mets_server._mutating():
+            workspace.add_file('FOO', file_id=f'FOO_{n}', mimetype='text/plain', page_id=None)
+    async def run():
+        await add_file(0)
+        flush = asyncio.ensure_future(mets_server.flush())
+        await asyncio.sleep(0.05)
+        # changes are not held back while the file is written
+        await add_file(1)
+        events.append('added')
+        await flush
+        assert mets_server._changes == 1
+        mets_server._flush_timer.cancel()
+    asyncio.run(run())
+    assert events == ['added', 'saved']
+    assert len(Workspace(Resolver(), str(tmp_path)).mets.find_all_files()) == 1
+
+def test_mets_server_read_write_lock():
+    events = []
+    async def read(name, delay):
+        async with lock.reading():
+            events.append(f'{name}+')
+            await asyncio.sleep(delay)
+            events.append(f'{name}-')
+    async def write(name):
+        async with lock.writing():
+            events.append(f'{name}+')
+            await asyncio.sleep(0.01)
+            events.append(f'{name}-')
+    async def run():
+        nonlocal lock
+        lock = _ReadWriteLock()
+        # readers share the lock, the writer waits for them and takes precedence over later readers
+        await asyncio.gather(read('r1', 0.05), read('r2', 0.02), write('w'), read('r3', 0))
+    lock = None
+    asyncio.run(run())
+    assert events[:2] == ['r1+', 'r2+']
+    assert events.index('w+') > events.index('r1-')
+    assert events.index('r3+') > events.index('w-')
+
+def test_mets_server_file_row():
+    assert file_from_row(['FOO', 'FOO_1', None, 'text/plain', None, 'FOO/FOO_1.txt']) == dict(
+        file_grp='FOO', file_id='FOO_1', page_id=None, mimetype='text/plain', url=None, local_filename='FOO/FOO_1.txt')
+    with raises(ValueError, match='invalid value for mimetype'):
+        file_from_row(['FOO', 'FOO_1', None, None, None, None])
+    with raises(ValueError, match='expected file as array'):
+        file_from_row(['FOO', 'FOO_1'])
+
+def test_mets_server_msgpack(start_mets_server):
+    mets_server_url, workspace_server = start_mets_server
+    # msgpack and JSON give the same results
+    mets = workspace_server.mets
+    assert mets._msgpack
+    found_msgpack = [(f.ID, f.fileGrp, f.pageId, f.mimetype, f.url, f.local_filename) for f in mets.find_files(pageId='PHYS_0005')]
+    mets._msgpack = False
+    found_json = [(f.ID, f.fileGrp, f.pageId, f.mimetype, f.url, f.local_filename) for f in mets.find_files(pageId='PHYS_0005')]
+    assert found_msgpack == found_json
+    assert found_msgpack
+    # invalid files are rejected, not mistaken for a server without msgpack support
+    mets._msgpack = True
+    with raises(HTTPError, match='400'):
+        mets.add_file('FOO', file_id='not an ID', mimetype='text/plain', page_id=None)
+    assert mets._msgpack
+
+def test_mets_server_client_cache(start_mets_server, monkeypatch):
+    # notice changes by other clients immediately
+    monkeypatch.setenv('OCRD_METS_SERVER_CACHE_TTL', '0')
+    mets_server_url, workspace_server = start_mets_server
+    reader = ClientSideOcrdMets(mets_server_url)
+    writer = ClientSideOcrdMets(mets_server_url)
+    file_groups = reader.file_groups
+    found = reader.find_all_files(fileGrp='OCR-D-IMG')
+    assert len(reader._cache) == 2
+    # cached until the METS changes
+    assert reader.file_groups == file_groups
+    assert [f.ID for f in reader.find_all_files(fileGrp='OCR-D-IMG')] == [f.ID for f in found]
+    writer.add_file('OCR-D-IMG', file_id='FOO_CACHE', page_id='PHYS_0001', mimetype='image/tiff', local_filename='foo.tif')
+    assert len(reader.find_all_files(fileGrp='OCR-D-IMG')) == len(found) + 1
+    writer.add_file('FOO', file_id='FOO_CACHE2', page_id='PHYS_0001', mimetype='image/tiff', local_filename='foo.tif')
+    assert reader.file_groups == file_groups + ['FOO']
+
 def test_find_all_files(start_mets_server : Tuple[str, Workspace]):
     _, workspace_server = start_mets_server
     mets = workspace_server.mets
@@ -227,6 +411,18 @@ def test_find_all_files(start_mets_server : Tuple[str, Workspace]):
     # with pytest.raises(ValueError, match=re.compile(f'match(es)? none')):
     #     mets.find_all_files(pageId='//PHYS000.*')
 
+def test_find_files_stream(start_mets_server : Tuple[str, Workspace]):
+    _, workspace_server = start_mets_server
+    mets = workspace_server.mets
+    # streamed results are the same as from the non-streaming endpoint
+    for kwargs in [{}, dict(file_grp='OCR-D-IMG'), dict(page_id='PHYS_0001'), dict(file_id='//FILE_0005_.*')]:
+        classic = mets.session.request('GET', f'{mets.url}/file', params=kwargs).json()['files']
+        assert [f.ID for f in mets.find_files(**kwargs)] == [f['file_id'] for f in classic]
+    # stop early
+    assert next(mets.find_files(fileGrp='OCR-D-IMG')).ID == 'FILE_0001_IMAGE'
+    with raises(Exception, match='400'):
+        mets.find_all_files(ID='//[')
+
 def test_reload(start_mets_server : Tuple[str, Workspace]):
     _, workspace_server = start_mets_server
     workspace_server_copy = Workspace(Resolver(), workspace_server.directory)
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+
+from multiprocessing import Process
+from os import remove
+from os.path import exists
+from time import sleep
+
+from pytest import fixture, mark
+
+from ocrd import Resolver, OcrdMetsServer, Workspace
+from ocrd.mets_server import ClientSideOcrdMets
+
+NUMBER_OF_FILES = 200
+
+def _start_mets_server(directory, url):
+    OcrdMetsServer(Workspace(Resolver(), directory), url).startup()
+
+@fixture(scope='module', name='mets_server')
+def fixture_mets_server(tmp_path_factory):
+    directory = str(tmp_path_factory.mktemp('ws'))
+    url = str(tmp_path_factory.getbasetemp() / 'mets-bench.sock')
+    if exists(url):
+        remove(url)
+    workspace = Resolver().workspace_from_nothing(directory)
+    for n in range(NUMBER_OF_FILES):
+        workspace.add_file('OCR-D-IMG', file_id=f'IMG_{n:04d}', page_id=f'PHYS_{n:04d}',
+                           mimetype='image/tiff', local_filename=f'OCR-D-IMG/IMG_{n:04d}.tif')
+    workspace.save_mets()
+    p = Process(target=_start_mets_server, args=(directory, url))
+    p.start()
+    sleep(1)  # sleep to start up server
+    yield url
+    p.terminate()
+
+def _client(url, protocol, monkeypatch):
+    # cached: msgpack with results cached until the METS changes
+    if protocol != 'cached':
+        monkeypatch.setenv('OCRD_METS_SERVER_CACHE_SIZE', '0')
+    mets = ClientSideOcrdMets(url)
+    mets._msgpack = protocol != 'json'
+    return mets
+
+# ----- Per-call latency of queries and changes via JSON or msgpack (or cached) ----- #
+@mark.benchmark(group="mets_server_find_files")
+@mark.parametrize('protocol', ['json', 'msgpack', 'cached'])
+def test_find_files_by_page(benchmark, mets_server, protocol, monkeypatch):
+    mets = _client(mets_server, protocol, monkeypatch)
+    files = benchmark(mets.find_all_files, fileGrp='OCR-D-IMG', pageId='PHYS_0100')
+    assert [f.ID for f in files] == ['IMG_0100']
+
+@mark.benchmark(group="mets_server_find_files_all")
+@mark.parametrize('protocol', ['json', 'msgpack', 'cached'])
+def test_find_files_all(benchmark, mets_server, protocol, monkeypatch):
+    mets = _client(mets_server, protocol, monkeypatch)
+    assert len(benchmark(mets.find_all_files, fileGrp='OCR-D-IMG')) == NUMBER_OF_FILES
+
+@mark.benchmark(group="mets_server_add_file")
+@mark.parametrize('protocol', ['json', 'msgpack'])
+def test_add_file(benchmark, mets_server, protocol, monkeypatch):
+    mets = _client(mets_server, protocol, monkeypatch)
+    ids = iter(range(100000))
+    def add_file():
+        n = next(ids)
+        mets.add_file(f'OCR-D-{protocol.upper()}', file_id=f'{protocol}_{n:05d}', page_id='PHYS_0001',
+                      mimetype='application/vnd.prima.page+xml', local_filename=f'{protocol}/{n:05d}.xml')
+    benchmark(add_file)
+    assert len(mets.find_all_files(fileGrp=f'OCR-D-{protocol.upper()}', ID=f'{protocol}_00000')) == 1
@@ -1,3 +1,8 @@
+from os import utime
+from tempfile import TemporaryDirectory
+
+from PIL import Image
+
 from tests.base import TestCase, main, assets, create_ocrd_file, create_ocrd_file_with_defaults
 
 from ocrd_utils import MIMETYPE_PAGE
@@ -18,6 +23,23 @@ class TestModelFactory(TestCase):
         with self.assertRaisesRegex(Exception, "Must pass 'image_filename' to 'exif_from_filename'"):
             exif_from_filename(None)
 
+    def test_exif_from_filename_cache(self):
+        exif_from_filename.cache_clear()
+        with TemporaryDirectory() as tempdir:
+            path = tempdir + '/img.png'
+            Image.new('L', (20, 10)).save(path)
+            exif1 = exif_from_filename(path)
+            exif2 = exif_from_filename(path)
+            self.assertEqual(exif1.to_dict(), exif2.to_dict())
+            self.assertIsNot(exif1, exif2)
+            info = exif_from_filename.cache_info()
+            self.assertEqual((info.hits, info.misses), (1, 1))
+            Image.new('L', (30, 10)).save(path)
+            utime(path, ns=(0, 0))
+            self.assertEqual(exif_from_filename(path).width, 30)
+            info = exif_from_filename.cache_info()
+            self.assertEqual((info.hits, info.misses), (1, 2))
+
     def test_page_from_file(self):
         f = create_ocrd_file_with_defaults(mimetype='image/tiff', local_filename=SAMPLE_IMG, ID='file1')
         self.assertEqual(f.mimetype, 'image/tiff')
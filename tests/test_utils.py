@@ -2,6 +2,7 @@ from os import getcwd
 from tempfile import TemporaryDirectory, gettempdir
 from pathlib import Path
 
+import numpy as np
 from PIL import Image
 
 from tests.base import TestCase, main, assets, create_ocrd_file
@@ -36,8 +37,12 @@ from ocrd_utils import (
     points_from_x0y0x1y1,
     points_from_xywh,
     points_from_polygon,
+    points_from_ragged,
 
     polygon_from_points,
+    polygons_from_ragged,
+    ragged_from_points,
+    ragged_from_polygons,
     polygon_from_x0y0x1y1,
 
     xywh_from_points,
@@ -87,6 +92,43 @@ def test_xywh_from_points_unordered():
 def test_polygon_from_points():
     assert polygon_from_points('100,100 200,100 200,200 100,200') == [[100, 100], [200, 100], [200, 200], [100, 200]]
 
+def test_polygon_from_points_as_array():
+    polygon = polygon_from_points('100,100 200,100 200,200 100,200', as_array=True)
+    assert polygon.tolist() == [[100, 100], [200, 100], [200, 200], [100, 200]]
+    assert polygon_from_points('100,100 200,100 200,200 100,200', as_array=True) is polygon
+    with raises(ValueError):
+        polygon[0, 0] = 0
+
+def test_points_from_polygon_iterator():
+    assert points_from_polygon(zip([100, 200, 200], [100, 100, 200])) == '100,100 200,100 200,200'
+    assert points_from_polygon([x, 100] for x in [100, 200]) == '100,100 200,100'
+
+def test_points_from_polygon_array():
+    assert points_from_polygon(np.array([[100, 100], [200, 100.9], [200, 200]])) == '100,100 200,100 200,200'
+
+def test_polygon_from_points_invalid():
+    for points in ['', '100,100 200', '100,100 200,1x0', '1,2,3 4', '1 2,3,4', '1,2 ,3', '1,2 3,', ',']:
+        with raises(ValueError):
+            polygon_from_points(points, as_array=True)
+
+def test_ragged_from_points():
+    points, offsets = ragged_from_points(['100,100 200,100 200,200 100,200', '0,0 10,0 5,5'])
+    assert points.shape == (7, 2)
+    assert offsets.tolist() == [0, 4, 7]
+    assert [polygon.tolist() for polygon in polygons_from_ragged(points, offsets)] == [
+        polygon_from_points('100,100 200,100 200,200 100,200'),
+        polygon_from_points('0,0 10,0 5,5')]
+    assert points_from_ragged(points, offsets) == ['100,100 200,100 200,200 100,200', '0,0 10,0 5,5']
+    points, offsets = ragged_from_points([])
+    assert points.shape == (0, 2)
+    assert points_from_ragged(points, offsets) == []
+
+def test_ragged_from_polygons():
+    polygons = [[[100, 100], [200, 100], [200, 200]], [[0, 0], [10, 0], [5, 5], [0, 5]]]
+    points, offsets = ragged_from_polygons(polygons)
+    assert offsets.tolist() == [0, 3, 7]
+    assert points_from_ragged(points, offsets) == [points_from_polygon(polygon) for polygon in polygons]
+
 def test_concat_padded():
     assert concat_padded('x', 1) == 'x_0001'
     assert concat_padded('x', 1, 2, 3) == 'x_0001_0002_0003'
@@ -101,6 +143,26 @@ def test_xmllint():
     pretty_xml = xmllint_format(xml_str).decode('utf-8')
     assert pretty_xml == '<?xml version="1.0" encoding="UTF-8"?>\n' + xml_str
 
+def test_xmllint_single_pass():
+    from ocrd_models import OcrdXmlDocument
+    for xml_str in ['<a>\n  <b> </b>\n  <c>x<d/> <e/> </c>\n  <!-- c -->  <f>\n<g/></f>\n</a>',
+                    '<a>\n  <f xml:space="preserve">\n <g/> </f><h xml:space="preserve"><i xml:space="default"> <j/> </i></h>\n</a>']:
+        doc = OcrdXmlDocument(content=xml_str)
+        assert doc.to_xml(xmllint=True) == xmllint_format(xml_str)
+        # parsing keeps the original whitespace
+        assert doc.to_xml().decode('utf-8').endswith(xml_str + '\n')
+        # whitespace added after parsing
+        root = doc._tree.getroot()
+        root.text = '\n  '
+        root[0].tail = '\n'
+        root[1].text = '\n'
+        expected = xmllint_format(doc.to_xml())
+        assert doc.to_xml(xmllint=True) == expected
+        # the document itself is left alone
+        assert root.text == '\n  '
+        assert root[0].tail == '\n'
+        assert root[1].text == '\n'
+
 def test_membername():
     class Klazz:
         def __init__(self):
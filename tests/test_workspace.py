@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
-from os import chdir, curdir, walk, stat, chmod, umask
+from os import chdir, curdir, walk, stat, chmod, umask, utime
+import json
 import shutil
 import logging
 from stat import filemode
@@ -27,7 +28,7 @@ from ocrd_models import (
 from ocrd_models.ocrd_page import parseString
 from ocrd_models.ocrd_page import TextRegionType, CoordsType, AlternativeImageType
 from ocrd_utils import polygon_mask, xywh_from_polygon, bbox_from_polygon, points_from_polygon
-from ocrd_modelfactory import page_from_file
+from ocrd_modelfactory import page_from_file, page_from_image
 from ocrd.resolver import Resolver
 from ocrd.workspace import Workspace
 from ocrd.workspace_backup import WorkspaceBackupManager
@@ -297,6 +298,102 @@ def test_remove_file_remote(plain_workspace):
     assert not plain_workspace.remove_file('page1_img')
 
 
+def test_add_remove_files(plain_workspace):
+    plain_workspace.add_files([
+        dict(file_grp='OCR-D-IMG', file_id=f'IMG_{n}', mimetype='image/tiff', page_id=f'PHYS_{n}',
+             local_filename=f'OCR-D-IMG/IMG_{n}.tif', content=f'img{n}')
+        for n in range(1, 4)] + [
+        dict(file_grp='OCR-D-IMG', file_id='IMG_remote', mimetype='image/tiff', page_id=None, url='http://remote')])
+    assert Path(plain_workspace.directory, 'OCR-D-IMG', 'IMG_2.tif').read_text() == 'img2'
+    assert len(plain_workspace.mets.find_all_files(fileGrp='OCR-D-IMG')) == 4
+
+    with pytest.raises(FileNotFoundError):
+        plain_workspace.remove_files(['IMG_1', 'IMG_none'])
+    assert Path(plain_workspace.directory, 'OCR-D-IMG', 'IMG_1.tif').exists()
+    removed = plain_workspace.remove_files(['IMG_1', 'IMG_2', 'IMG_remote', 'IMG_none'], force=True)
+    assert [f.ID for f in removed] == ['IMG_1', 'IMG_2', 'IMG_remote']
+    assert not Path(plain_workspace.directory, 'OCR-D-IMG', 'IMG_2.tif').exists()
+    assert [f.ID for f in plain_workspace.mets.find_files()] == ['IMG_3']
+
+
+def test_save_mets_journal(tmp_path, monkeypatch):
+    monkeypatch.setenv('OCRD_METS_JOURNAL', 'true')
+    monkeypatch.setenv('OCRD_METS_JOURNAL_MAX', '5')
+    resolver = Resolver()
+    resolver.workspace_from_nothing(tmp_path).save_mets()
+    mets_path = str(tmp_path / 'mets.xml')
+    journal_path = tmp_path / 'mets.xml.journal'
+    mets_before = Path(mets_path).read_bytes()
+    workspace = resolver.workspace_from_url(mets_path)
+    for n in range(1, 3):
+        workspace.add_file('OCR-D-IMG', file_id=f'IMG_{n}', mimetype='image/tiff', page_id=f'PHYS_{n}',
+                           local_filename=f'OCR-D-IMG/IMG_{n}.tif')
+    workspace.save_mets()
+    next(workspace.mets.find_files(ID='IMG_2')).url = 'http://example.org/2.tif'
+    workspace.save_mets()
+    # only the changes were written
+    assert Path(mets_path).read_bytes() == mets_before
+    assert len(journal_path.read_text().splitlines()) == 1 + 3
+    # incomplete entry from an interrupted write
+    with open(journal_path, 'a') as f:
+        f.write('["remove_one_file", ["IMG')
+    expected = workspace.mets.to_xml(xmllint=True)
+    assert resolver.workspace_from_url(mets_path).mets.to_xml(xmllint=True) == expected
+    # also in a copy of the workspace
+    clone = resolver.workspace_from_url(mets_path, dst_dir=str(tmp_path / 'clone'))
+    assert clone.mets.to_xml(xmllint=True) == expected
+    # compacted beyond OCRD_METS_JOURNAL_MAX
+    workspace.remove_file('IMG_1', keep_file=True)
+    workspace.mets.add_agent(name='foo')
+    workspace.mets.add_agent(name='bar')
+    workspace.save_mets()
+    assert not journal_path.exists()
+    assert Path(mets_path).read_bytes() == workspace.mets.to_xml(xmllint=True)
+    # journal written for another version of the METS is ignored
+    journal_path.write_text('{"mets": "outdated"}\n["remove_one_file", ["IMG_2"], {}]\n')
+    workspace = resolver.workspace_from_url(mets_path)
+    assert [f.ID for f in workspace.mets.find_files()] == ['IMG_2']
+    workspace.save_mets()
+    assert not journal_path.exists()
+    # journal with an unreadable header is ignored as well
+    journal_path.write_text('not json\n["remove_one_file", ["IMG_2"], {}]\n')
+    workspace = resolver.workspace_from_url(mets_path)
+    assert [f.ID for f in workspace.mets.find_files()] == ['IMG_2']
+    workspace.save_mets()
+    assert not journal_path.exists()
+    # replay stops at the first invalid entry, which is discarded with the rest
+    workspace.add_file('OCR-D-IMG', file_id='IMG_3', mimetype='image/tiff', page_id='PHYS_3',
+                       local_filename='OCR-D-IMG/IMG_3.tif')
+    workspace.save_mets()
+    with open(journal_path, 'a') as f:
+        f.write('{"foo": "bar"}\n["remove_one_file", ["IMG_2"], {}]\n')
+    workspace = resolver.workspace_from_url(mets_path)
+    assert [f.ID for f in workspace.mets.find_files()] == ['IMG_2', 'IMG_3']
+    assert len(journal_path.read_text().splitlines()) == 1 + 1
+
+
+def test_save_mets_journal_backup(tmp_path, monkeypatch):
+    monkeypatch.setenv('OCRD_METS_JOURNAL', 'true')
+    monkeypatch.setenv('OCRD_METS_JOURNAL_MAX', '2')
+    resolver = Resolver()
+    resolver.workspace_from_nothing(tmp_path).save_mets()
+    workspace = Workspace(resolver, str(tmp_path), automatic_backup=True)
+    backup = workspace.automatic_backup
+    assert len(backup.list()) == 1
+    # appending to the journal does not back up the complete METS
+    workspace.add_file('OCR-D-IMG', file_id='IMG_1', mimetype='image/tiff', page_id='PHYS_1',
+                       local_filename='OCR-D-IMG/IMG_1.tif')
+    workspace.save_mets()
+    assert (tmp_path / 'mets.xml.journal').exists()
+    assert len(backup.list()) == 1
+    # compacting does
+    workspace.mets.add_agent(name='foo')
+    workspace.mets.add_agent(name='bar')
+    workspace.save_mets()
+    assert not (tmp_path / 'mets.xml.journal').exists()
+    assert len(backup.list()) == 2
+
+
 def test_rename_file_group(tmp_path):
     # arrange
     copytree(assets.path_to('kant_aufklaerung_1784-page-region-line-word_glyph/data'), tmp_path)
@@ -460,6 +557,52 @@ def test_resolve_image_exif(workspace_kant_aufklaerung):
     assert exif.width == 1457
 
 
+def test_resolve_image_exif_sidecar(plain_workspace, monkeypatch):
+    monkeypatch.setenv('OCRD_EXIF_SIDECAR', 'true')
+    Path('OCR-D-IMG').mkdir()
+    Image.new('L', (20, 10)).save('OCR-D-IMG/img.png', dpi=(254, 254))
+    plain_workspace.add_file('OCR-D-IMG', file_id='img', mimetype='image/png', page_id='p1', local_filename='OCR-D-IMG/img.png')
+    exif = plain_workspace.resolve_image_exif('OCR-D-IMG/img.png')
+    assert (exif.width, exif.xResolution, exif.resolutionUnit) == (20, 100, 'cm')
+    # only written when saving
+    assert not Path('.ocrd-exif.json').exists()
+    plain_workspace.save_mets()
+    assert Path('.ocrd-exif.json').exists()
+
+    # another workspace (e.g. next processor in the workflow) reuses the sidecar
+    def fail(*args, **kwargs):
+        raise AssertionError("must not probe the image again")
+    monkeypatch.setattr('ocrd.workspace.exif_from_filename', fail)
+    ws2 = Resolver().workspace_from_url(plain_workspace.mets_target)
+    exif = ws2.resolve_image_exif('OCR-D-IMG/img.png')
+    assert (exif.width, exif.xResolution, exif.resolutionUnit) == (20, 100, 'cm')
+
+    # modifying the file invalidates the entry
+    monkeypatch.undo()
+    monkeypatch.setenv('OCRD_EXIF_SIDECAR', 'true')
+    Image.new('L', (30, 10)).save('OCR-D-IMG/img.png', dpi=(300, 300))
+    assert ws2.resolve_image_exif('OCR-D-IMG/img.png').width == 30
+
+
+def test_resolve_image_exif_sidecar_merge(plain_workspace, monkeypatch):
+    monkeypatch.setenv('OCRD_EXIF_SIDECAR', 'true')
+    Path('OCR-D-IMG').mkdir()
+    for i in range(2):
+        Image.new('L', (20 + i, 10)).save(f'OCR-D-IMG/img{i}.png')
+        plain_workspace.add_file('OCR-D-IMG', file_id=f'img{i}', mimetype='image/png', page_id=f'p{i}',
+                                 local_filename=f'OCR-D-IMG/img{i}.png')
+    plain_workspace.save_mets()
+    # two processors on the same workspace probing different images
+    ws1 = Resolver().workspace_from_url(plain_workspace.mets_target)
+    ws2 = Resolver().workspace_from_url(plain_workspace.mets_target)
+    assert ws1.resolve_image_exif('OCR-D-IMG/img0.png').width == 20
+    assert ws2.resolve_image_exif('OCR-D-IMG/img1.png').width == 21
+    ws1.save_exif_sidecar()
+    ws2.save_exif_sidecar()
+    with open('.ocrd-exif.json', encoding='utf-8') as f:
+        assert sorted(json.load(f)) == ['OCR-D-IMG/img0.png', 'OCR-D-IMG/img1.png']
+
+
 def test_resolve_image_as_pil(workspace_kant_aufklaerung):
     img = workspace_kant_aufklaerung._resolve_image_as_pil('OCR-D-IMG/INPUT_0017.tif')
     assert img.width == 1457
@@ -478,6 +621,75 @@ def _fixture_workspace_gutachten_data(tmp_path):
     chdir(prev_path)
 
 
+def test_image_from_page_cache(plain_workspace, monkeypatch):
+    Workspace.image_cache.cache_clear()
+    Path('OCR-D-IMG').mkdir()
+    Image.new('L', (200, 100), color=255).save('OCR-D-IMG/img.png')
+    img_file = plain_workspace.add_file('OCR-D-IMG', file_id='img', mimetype='image/png', page_id='p1', local_filename='OCR-D-IMG/img.png')
+    page = page_from_image(img_file).get_Page()
+    image1, coords1, _ = plain_workspace.image_from_page(page, 'p1')
+    image1.paste(0, (0, 0, 200, 100))
+    coords1['transform'][0, 2] = 42
+    image2, coords2, _ = plain_workspace.image_from_page(page, 'p1')
+    # served from memory, but unaffected by modifications of earlier results
+    assert Workspace.image_cache.cache_info().hits == 1
+    assert image2.getextrema() == (255, 255)
+    assert coords2['transform'][0, 2] == 0
+    # different selector, but same decoded image
+    plain_workspace.image_from_page(page, 'p1', feature_filter='binarized')
+    assert Workspace.image_cache.cache_info().hits == 2
+    # modifying the file invalidates
+    Image.new('L', (200, 100), color=0).save('OCR-D-IMG/img.png')
+    utime('OCR-D-IMG/img.png', ns=(0, 0))
+    image3, _, _ = plain_workspace.image_from_page(page, 'p1')
+    assert image3.getextrema() == (0, 0)
+    # budget exceeded
+    monkeypatch.setenv('OCRD_MAX_IMAGE_CACHE', str(200 * 100 * 2))
+    page.set_orientation(90)
+    plain_workspace.image_from_page(page, 'p1')
+    info = Workspace.image_cache.cache_info()
+    assert info.evictions > 0
+    assert info.currsize <= info.maxsize == 200 * 100 * 2
+
+
+def test_image_from_page_lookups(plain_workspace, monkeypatch):
+    Workspace.image_cache.cache_clear()
+    Path('OCR-D-IMG').mkdir()
+    Image.new('L', (200, 100), color=255).save('OCR-D-IMG/img.png')
+    img_file = plain_workspace.add_file('OCR-D-IMG', file_id='img', mimetype='image/png', page_id='p1', local_filename='OCR-D-IMG/img.png')
+    page = page_from_image(img_file).get_Page()
+    queries = []
+    find_files = plain_workspace.mets.find_files
+    def counting_find_files(*args, **kwargs):
+        queries.append(kwargs)
+        return find_files(*args, **kwargs)
+    monkeypatch.setattr(plain_workspace.mets, 'find_files', counting_find_files)
+    # the page image is looked up once for the cache key, EXIF and decoding
+    plain_workspace.image_from_page(page, 'p1')
+    assert queries == [{'local_filename': 'OCR-D-IMG/img.png'}]
+    # no cache, no key
+    monkeypatch.setenv('OCRD_MAX_IMAGE_CACHE', '0')
+    monkeypatch.setattr(plain_workspace, '_image_file_key', None)
+    queries.clear()
+    plain_workspace.image_from_page(page, 'p1')
+    assert queries == [{'local_filename': 'OCR-D-IMG/img.png'}]
+    # no cache, no copies
+    copies = []
+    from ocrd.workspace import _copy_image as copy_image
+    def counting_copy_image(image):
+        copies.append(image)
+        return copy_image(image)
+    monkeypatch.setattr('ocrd.workspace._copy_image', counting_copy_image)
+    plain_workspace.image_from_page(page, 'p1')
+    assert not copies
+    # too large for the cache
+    monkeypatch.delattr(plain_workspace, '_image_file_key')
+    monkeypatch.setenv('OCRD_MAX_IMAGE_CACHE', '100')
+    Workspace.image_cache.cache_clear()
+    plain_workspace.image_from_page(page, 'p1')
+    assert not copies
+
+
 def test_image_from_page_basic(workspace_gutachten_data):
     # arrange
     with open(assets.path_to('gutachten/data/TEMP1/PAGE_TEMP1.xml'), 'r') as f:
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+from PIL import Image
+from pytest import main, fixture, mark
+
+from ocrd import Resolver
+from ocrd_utils import MIMETYPE_PAGE, pushd_popd, points_from_bbox, crop_image, image_from_polygon, bbox_from_polygon
+from ocrd_models.ocrd_page import (
+    CoordsType,
+    PageType,
+    PcGtsType,
+    TextLineType,
+    TextRegionType,
+    WordType,
+    to_xml
+)
+import ocrd.workspace
+
+WIDTH, HEIGHT = 2480, 3508 # A4 at 300 DPI
+REGIONS_PER_PAGE = 4
+LINES_PER_REGION = 20
+WORDS_PER_LINE = 8
+
+def _crop_full(image, polygon, fill='background', transparency=False):
+    # the previous implementation: mask the full parent image, then crop
+    return crop_image(image_from_polygon(image, polygon, fill=fill, transparency=transparency),
+                      box=bbox_from_polygon(polygon))
+
+@fixture(scope='module')
+def page_workspace(tmp_path_factory):
+    directory = tmp_path_factory.mktemp('ws')
+    workspace = Resolver().workspace_from_nothing(directory=str(directory))
+    rng = np.random.default_rng(0)
+    (directory / 'OCR-D-IMG').mkdir()
+    Image.fromarray(rng.integers(0, 256, (HEIGHT, WIDTH), dtype=np.uint8), 'L').save(directory / 'OCR-D-IMG' / 'IMG_1.png')
+    workspace.add_file('OCR-D-IMG', file_id='IMG_1', page_id='PHYS_1', mimetype='image/png',
+                       local_filename='OCR-D-IMG/IMG_1.png')
+    page = PageType(imageFilename='OCR-D-IMG/IMG_1.png', imageWidth=WIDTH, imageHeight=HEIGHT)
+    region_height = (HEIGHT - 200) // REGIONS_PER_PAGE
+    line_height = region_height // LINES_PER_REGION
+    word_width = (WIDTH - 200) // WORDS_PER_LINE
+    for r in range(REGIONS_PER_PAGE):
+        y = 100 + r * region_height
+        region = TextRegionType(id='r%d' % r, Coords=CoordsType(points=points_from_bbox(100, y, WIDTH - 100, y + region_height - 1)))
+        for l in range(LINES_PER_REGION):
+            ly = y + l * line_height
+            line = TextLineType(id='r%d_l%d' % (r, l), Coords=CoordsType(points=points_from_bbox(100, ly, WIDTH - 100, ly + line_height - 1)))
+            for w in range(WORDS_PER_LINE):
+                wx = 100 + w * word_width
+                line.add_Word(WordType(id='r%d_l%d_w%d' % (r, l, w), Coords=CoordsType(points=points_from_bbox(wx, ly, wx + word_width - 10, ly + line_height - 1))))
+            region.add_TextLine(line)
+        page.add_TextRegion(region)
+    workspace.add_file('OCR-D-SEG', file_id='PAGE_1', page_id='PHYS_1', mimetype=MIMETYPE_PAGE,
+                       local_filename='OCR-D-SEG/PAGE_1.xml', content=to_xml(PcGtsType(Page=page)))
+    with pushd_popd(workspace.directory):
+        page_image, page_coords, _ = workspace.image_from_page(page, 'PHYS_1')
+    yield workspace, page, page_image, page_coords
+
+def _extract(workspace, page, page_image, page_coords, level):
+    images = []
+    for region in page.get_TextRegion():
+        region_image, region_coords = workspace.image_from_segment(region, page_image, page_coords)
+        if level == 'region':
+            images.append(region_image)
+            continue
+        for line in region.get_TextLine():
+            if level == 'line':
+                # lines directly from the page, as for line-level processors
+                images.append(workspace.image_from_segment(line, page_image, page_coords)[0])
+                continue
+            line_image, line_coords = workspace.image_from_segment(line, region_image, region_coords)
+            for word in line.get_Word():
+                images.append(workspace.image_from_segment(word, line_image, line_coords)[0])
+    return images
+
+@mark.parametrize('method', ['full', 'window'])
+@mark.parametrize('level', ['region', 'line', 'word'])
+@mark.benchmark(group="image_from_segment")
+def test_image_from_segment(benchmark, monkeypatch, page_workspace, level, method):
+    if method == 'full':
+        monkeypatch.setattr(ocrd.workspace, 'crop_image_to_polygon', _crop_full)
+    images = benchmark(_extract, *page_workspace, level)
+    assert len(images) == REGIONS_PER_PAGE * {
+        'region': 1,
+        'line': LINES_PER_REGION,
+        'word': LINES_PER_REGION * WORDS_PER_LINE}[level]
+
+def test_image_from_segment_identical(monkeypatch, page_workspace):
+    images = _extract(*page_workspace, 'line')
+    monkeypatch.setattr(ocrd.workspace, 'crop_image_to_polygon', _crop_full)
+    for image, expected in zip(images, _extract(*page_workspace, 'line')):
+        assert np.array_equal(np.asarray(image), np.asarray(expected))
+
+def _extract_lines(workspace, page, page_image, page_coords, max_workers):
+    lines = page.get_AllTextLines()
+    if max_workers is None:
+        return [workspace.image_from_segment(line, page_image, page_coords) for line in lines]
+    return workspace.image_from_segments(lines, page_image, page_coords, max_workers=max_workers)
+
+@mark.parametrize('max_workers', [None, 1, 4], ids=['single', 'batch', 'batch-4-threads'])
+@mark.benchmark(group="image_from_segments")
+def test_image_from_segments(benchmark, page_workspace, max_workers):
+    results = benchmark(_extract_lines, *page_workspace, max_workers)
+    assert len(results) == REGIONS_PER_PAGE * LINES_PER_REGION
+
+def test_image_from_segments_identical(page_workspace):
+    expected = _extract_lines(*page_workspace, None)
+    for max_workers in [1, 4]:
+        results = _extract_lines(*page_workspace, max_workers)
+        assert len(results) == len(expected)
+        for (image, coords), (expected_image, expected_coords) in zip(results, expected):
+            assert np.array_equal(np.asarray(image), np.asarray(expected_image))
+            assert np.array_equal(coords['transform'], expected_coords['transform'])
+            assert coords['features'] == expected_coords['features']
+
+def _extract_arrays(workspace, page, page_image, page_coords, as_array):
+    if as_array:
+        page_image = np.asarray(page_image)
+    return [np.asarray(workspace.image_from_segment(line, page_image, page_coords, as_array=as_array)[0])
+            for line in page.get_AllTextLines()]
+
+@mark.parametrize('as_array', [False, True], ids=['pil', 'numpy'])
+@mark.benchmark(group="image_from_segment_array")
+def test_image_from_segment_array(benchmark, page_workspace, as_array):
+    images = benchmark(_extract_arrays, *page_workspace, as_array)
+    assert len(images) == REGIONS_PER_PAGE * LINES_PER_REGION
+
+def test_image_from_segment_array_identical(page_workspace):
+    for image, expected in zip(_extract_arrays(*page_workspace, True),
+                               _extract_arrays(*page_workspace, False)):
+        assert np.array_equal(image, expected)
+
+if __name__ == '__main__':
+    main([__file__])
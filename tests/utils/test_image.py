@@ -1,6 +1,12 @@
-from pytest import main
+from pytest import main, mark
+import numpy as np
 from PIL import Image
-from ocrd_utils.image import rotate_image
+from ocrd_utils.image import (
+    rotate_image, crop_image, crop_image_to_polygon, image_from_polygon, bbox_from_polygon,
+    transpose_image, polygon_mask,
+    rotate_array, crop_array, crop_array_to_polygon, array_from_polygon,
+    transpose_array, polygon_mask_array
+)
 
 def test_32bit_fill():
     img = Image.new('F', (200, 100), 1)
@@ -9,5 +15,65 @@ def test_32bit_fill():
 def test_max_image_pixels():
     assert Image.MAX_IMAGE_PIXELS == 40_000 ** 2
 
+POLYGONS = [
+    # inside
+    np.array([[10, 20], [120, 15], [130, 80], [15, 90]]),
+    # touching the right and bottom edges
+    np.array([[300, 200], [399, 210], [399, 299], [310, 299]]),
+    # crossing the left/top and right/bottom edges
+    np.array([[-20, -10], [50, 5], [40, 60], [-5, 70]]),
+    np.array([[350, 250], [420, 260], [410, 330], [360, 320]]),
+    # outside
+    np.array([[500, 10], [550, 10], [550, 40], [500, 40]]),
+]
+
+def _random_image(mode):
+    rng = np.random.default_rng(0)
+    return Image.fromarray(rng.integers(0, 256, (300, 400, 4), dtype=np.uint8), 'RGBA').convert(mode)
+
+@mark.parametrize('mode', ['1', 'L', 'RGB', 'LA', 'RGBA'])
+@mark.parametrize('fill,transparency', [('background', False), ('background', True), ('none', False), ('white', True)])
+def test_crop_image_to_polygon(mode, fill, transparency):
+    if fill == 'none' and mode in ['LA', 'RGBA']:
+        # not supported by image_from_polygon either
+        return
+    img = _random_image(mode)
+    for polygon in POLYGONS:
+        expected = crop_image(image_from_polygon(img, polygon, fill=fill, transparency=transparency),
+                              box=bbox_from_polygon(polygon))
+        actual = crop_image_to_polygon(img, polygon, fill=fill, transparency=transparency)
+        assert actual.mode == expected.mode
+        assert actual.size == expected.size
+        assert np.array_equal(np.asarray(actual), np.asarray(expected)), polygon
+
+def _assert_same(array, image):
+    assert isinstance(array, np.ndarray)
+    assert Image.fromarray(array).mode == image.mode
+    assert np.array_equal(array, np.asarray(image))
+
+@mark.parametrize('mode', ['1', 'L', 'RGB', 'LA', 'RGBA'])
+def test_array_variants(mode):
+    img = _random_image(mode)
+    arr = np.asarray(img)
+    for method in [Image.FLIP_LEFT_RIGHT, Image.FLIP_TOP_BOTTOM, Image.ROTATE_90, Image.ROTATE_180,
+                   Image.ROTATE_270, Image.TRANSPOSE, Image.TRANSVERSE]:
+        _assert_same(transpose_array(arr, method), transpose_image(img, method))
+    for box in [(10, 20, 110, 80), (0, 0, 400, 300), (-10, 250, 50, 320), (390, -5, 420, 10)]:
+        _assert_same(crop_array(arr, box), crop_image(img, box))
+    # zero-copy within bounds
+    assert np.shares_memory(crop_array(arr, (10, 20, 110, 80)), arr)
+    for angle in [0.5, -3, 90]:
+        _assert_same(rotate_array(arr, angle), rotate_image(img, angle))
+    for polygon in POLYGONS:
+        assert np.array_equal(polygon_mask_array(arr, polygon), np.asarray(polygon_mask(img, polygon)) > 0)
+        for fill, transparency in [('background', False), ('background', True), ('white', True), ('none', False)]:
+            if fill == 'none' and mode in ['LA', 'RGBA']:
+                # not supported by image_from_polygon
+                continue
+            _assert_same(array_from_polygon(arr, polygon, fill=fill, transparency=transparency),
+                         image_from_polygon(img, polygon, fill=fill, transparency=transparency))
+            _assert_same(crop_array_to_polygon(arr, polygon, fill=fill, transparency=transparency),
+                         crop_image_to_polygon(img, polygon, fill=fill, transparency=transparency))
+
 if __name__ == '__main__':
     main([__file__])
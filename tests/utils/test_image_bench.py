@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+from pytest import main, fixture, mark
+
+from ocrd_models.ocrd_page import CoordsType, GlyphType
+from ocrd_utils import (
+    coordinates_for_segment,
+    coordinates_for_segments,
+    coordinates_of_segment,
+    coordinates_of_segments,
+    points_from_polygon,
+    points_from_ragged,
+    ragged_from_polygons,
+    rotate_coordinates,
+    shift_coordinates,
+)
+
+GLYPHS = 20000
+
+@fixture(scope='module')
+def glyphs():
+    rng = np.random.default_rng(0)
+    segments = []
+    for i in range(GLYPHS):
+        x, y = rng.integers(0, 4000), rng.integers(0, 6000)
+        npoints = rng.integers(4, 12)
+        polygon = np.stack([x + rng.integers(0, 40, npoints), y + rng.integers(0, 60, npoints)], axis=1)
+        segments.append(GlyphType(id='g%d' % i, Coords=CoordsType(points=points_from_polygon(polygon))))
+    transform = shift_coordinates(np.eye(3), np.array([-120, -340]))
+    transform = rotate_coordinates(transform, 1.5, np.array([1900, 2800]))
+    yield segments, {'transform': transform}
+
+def _single(segments, coords):
+    polygons = [coordinates_of_segment(segment, None, coords) for segment in segments]
+    return [points_from_polygon(coordinates_for_segment(polygon, None, coords)) for polygon in polygons]
+
+def _batch(segments, coords):
+    polygons = coordinates_of_segments(segments, None, coords)
+    return points_from_ragged(*ragged_from_polygons(coordinates_for_segments(polygons, None, coords)))
+
+@mark.parametrize('method', [_single, _batch], ids=['single', 'batch'])
+@mark.benchmark(group="coordinates")
+def test_coordinates_roundtrip(benchmark, glyphs, method):
+    assert len(benchmark(method, *glyphs)) == GLYPHS
+
+def test_coordinates_identical(glyphs):
+    segments, coords = glyphs
+    for polygon, expected in zip(coordinates_of_segments(segments, None, coords),
+                                 [coordinates_of_segment(segment, None, coords) for segment in segments]):
+        assert np.array_equal(polygon, expected)
+    assert _batch(*glyphs) == _single(*glyphs)
+
+if __name__ == '__main__':
+    main([__file__])